@@ -1,5 +1,17 @@
-from . import general
-from . import regex
-from . import _helper
-from .general import DFA, NFA, AutomatonArgs, epsilon, E_NFA
-from ._helper import *
\ No newline at end of file
+"""finite automata, DFA, NFA and ε-NFA, with a regex front-end.
+the subpackages and the names below are imported when they are first used (PEP 562), so `import automata` costs little.
+"""
+from automata._helper.lazy import attach
+
+__getattr__, __dir__, __all__ = attach(__name__, ["general", "regex"], {
+    "DFA": ".general.main",
+    "NFA": ".general.main",
+    "E_NFA": ".general.main",
+    "AutomatonArgs": ".general.main",
+    "epsilon": ".general.main",
+    "CompiledDFA": ".general.compiled",
+    "BitsetNFA": ".general.bitset",
+    "MultiDFA": ".general.multi",
+    "Tracer": ".general.trace",
+})
+del attach
@@ -1,2 +1,4 @@
-from . import helper
-from .helper import *
\ No newline at end of file
+from automata._helper.lazy import attach
+
+__getattr__, __dir__, __all__ = attach(__name__, ["helper"], {})
+del attach
@@ -1,6 +1,3 @@
-import sys
-sys.path.append("../automata")
-
 from collections.abc import Container
 import typing
 
@@ -49,9 +46,25 @@ def _get_end_of_iterator(g: typing.Iterable):
 
 
 def _bit_search(container: Container) -> typing.Generator:
-    for i in range(1 << (len(container) - 1)):
+    for i in range(1 << len(container)):
         yield _get_elements_from_bit(container, i)
 
 
 def _get_elements_from_bit(container: Container, bit: int) -> typing.Set:
     return {container[i] for i in range(len(bin(bit))) if bit & (1 << i)}
+
+
+def _iter_bits(mask: int) -> typing.Generator:
+    """yield the index of each set bit in mask, from the lowest"""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _recorded(iterable: typing.Iterable, record: typing.List) -> typing.Generator:
+    """yield each element of iterable, appending it to record first.
+    a consumer of the result can see what has been read, so an iterator is read only once"""
+    for element in iterable:
+        record.append(element)
+        yield element
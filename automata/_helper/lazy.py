@@ -0,0 +1,36 @@
+import importlib
+import sys
+
+# typing is not imported here, it costs more than the rest of `import automata`
+
+
+def attach(package: str, submodules: list[str], names: dict[str, str]) -> tuple:
+    """make __getattr__, __dir__ and __all__ of a package, which import submodules and names when they are first used (PEP 562).
+    a name is put in the package after its first use, so __getattr__ is not called for it again.
+    use it in __init__.py like below:
+    __getattr__, __dir__, __all__ = attach(__name__, ["main"], {"DFA": ".main"})
+
+    Args:
+        package (str): __name__ of the package
+        submodules (list[str]): submodules which are attributes of the package
+        names (dict[str, str]): map from name to the module defining it, relative to the package
+
+    Returns:
+        tuple: __getattr__, __dir__ and __all__ of the package
+    """
+    submodules = frozenset(submodules)
+
+    def __getattr__(name: str) -> object:
+        if name in submodules:
+            return importlib.import_module(f"{package}.{name}")
+        module = names.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module, package), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted(set(vars(sys.modules[package])) | submodules | set(names))
+
+    return __getattr__, __dir__, [*names, *sorted(submodules)]
@@ -0,0 +1,272 @@
+"""benchmarks of automata. each result is one JSON object per line, so runs can be compared. run like below:
+python -m automata.bench
+python -m automata.bench --sizes 10 1000 --ks 4 8 --length 10000 --output result.jsonl
+"""
+import argparse
+import collections
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+import typing
+from automata.general import DFA, NFA, AutomatonArgs
+from automata.regex import to_e_nfa
+
+
+def random_dfa(size: int, alphabets: typing.Sequence = "01", copies: int = 1, seed: int = 0) -> AutomatonArgs:
+    """make a AutomatonArgs of random total DFA with size * copies states.
+    state (i, j) is the j-th copy of i, and every copy of i is equivalent, so the minimal DFA has at most size states.
+
+    Args:
+        size (int): the number of distinct states
+        alphabets (typing.Sequence, optional): alphabets of the DFA. Defaults to "01".
+        copies (int, optional): the number of copies of each state. Defaults to 1.
+        seed (int, optional): seed of random. Defaults to 0.
+    """
+    rng = random.Random(seed)
+    targets = [{alphabet: rng.randrange(size) for alphabet in alphabets} for _ in range(size)]
+    transitions = {(i, j): {alphabet: (target, rng.randrange(copies)) for alphabet, target in targets[i].items()}
+                   for i in range(size) for j in range(copies)}
+    finals = {(i, j) for i in rng.sample(range(size), size // 2) for j in range(copies)}
+    return AutomatonArgs(transitions=transitions, start=(0, 0), finals=finals)
+
+
+def last_k_nfa(k: int) -> AutomatonArgs:
+    """make a AutomatonArgs of NFA accepting binary strings which have "1" in the last k characters,
+    the family in the example of general/main.py. its subset construction visits 2 ** k subsets."""
+    transitions = {"q0": {"0": {"q0"}, "1": {"q0", "q1"}}}
+    for i in range(1, k):
+        transitions[f"q{i}"] = {"0": {f"q{i + 1}"}, "1": {f"q{i + 1}"}}
+    transitions[f"q{k}"] = {"0": set(), "1": set()}
+    return AutomatonArgs(transitions=transitions, start="q0", finals={f"q{i}" for i in range(1, k + 1)})
+
+
+def last_k_pattern(k: int) -> str:
+    """regex of the same language as last_k_nfa(k), to bench E_NFA made by automata.regex"""
+    return "(0|1)*1" + "(0|1)?" * (k - 1)
+
+
+def random_text(length: int, alphabets: typing.Sequence = "01", seed: int = 0) -> str:
+    """make a random string of alphabets"""
+    rng = random.Random(seed)
+    return "".join(rng.choice(alphabets) for _ in range(length))
+
+
+def prefixed_strings(count: int, length: int, namespaces: int = 16, depth: int = 4, seed: int = 0) -> typing.List[str]:
+    """make count binary strings of length, shaped like URLs or log keys.
+    each string is a path of depth segments, chosen from a tree which has namespaces children at each level,
+    so most of a string is shared with many others, and only the last segment is random.
+
+    Args:
+        count (int): the number of strings
+        length (int): length of each string
+        namespaces (int, optional): the number of children of each segment. Defaults to 16.
+        depth (int, optional): the number of segments. Defaults to 4.
+        seed (int, optional): seed of random. Defaults to 0.
+    """
+    rng = random.Random(seed)
+    segment = max(length // depth, 1)
+    tree = dict()
+    strings = []
+    for _ in range(count):
+        node, path = tree, []
+        for _ in range(depth - 1):
+            key = rng.randrange(namespaces)
+            if key not in node:
+                node[key] = (random_text(segment, seed=rng.random()), dict())
+            name, node = node[key]
+            path.append(name)
+        path.append(random_text(length - segment * (depth - 1), seed=rng.random()))
+        strings.append("".join(path))
+    return strings
+
+
+def _seconds(function: typing.Callable, *args) -> float:
+    """internal function, wall time of one call"""
+    begin = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - begin
+
+
+def _peak_bytes(function: typing.Callable, *args) -> int:
+    """internal function, peak memory allocated by one call, measured by tracemalloc.
+    tracemalloc slows down the call, so this is measured separately from _seconds."""
+    tracemalloc.start()
+    try:
+        function(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _retained_bytes(function: typing.Callable, *args) -> int:
+    """internal function, memory still allocated after one call, which is held by its result, measured by tracemalloc"""
+    tracemalloc.start()
+    try:
+        result = function(*args)
+        return tracemalloc.get_traced_memory()[0]
+    finally:
+        del result
+        tracemalloc.stop()
+
+
+def _accepted(make: typing.Callable, text: str) -> typing.Any:
+    """internal function, make an automaton and judge text with it, to measure the automaton after use"""
+    automaton = make()
+    automaton.accept(text)
+    return automaton
+
+
+def _consume(iterator: typing.Iterable) -> None:
+    collections.deque(iterator, maxlen=0)
+
+
+def _run(name: str, automaton: typing.Any, text: str, **params) -> typing.List[typing.Dict]:
+    """internal function, accept throughput and trans latency of automaton on text"""
+    seconds = _seconds(automaton.accept, text)
+    trans_seconds = _seconds(_consume, automaton.trans(text))
+    return [{"name": f"{name}.accept", **params, "length": len(text),
+             "seconds": seconds, "symbols_per_second": len(text) / seconds if seconds else None},
+            {"name": f"{name}.trans", **params, "length": len(text),
+             "seconds": trans_seconds, "ns_per_symbol": trans_seconds * 1e9 / max(len(text), 1)}]
+
+
+def bench_dfa(sizes: typing.Iterable[int] = (10, 10 ** 3, 10 ** 5), length: int = 10 ** 6) -> typing.List[typing.Dict]:
+    """measure construction of DFA and CompiledDFA, and accept and trans of them, on random DFAs of sizes states"""
+    results = []
+    text = random_text(length)
+    for size in sizes:
+        args = random_dfa(size)
+        # from plain dicts, so that freezing the transitions is measured
+        plain = ({state: dict(transition) for state, transition in args.transitions.items()}, args.start, set(args.finals))
+        results.append({"name": "DFA.__init__", "states": size,
+                        "seconds": _seconds(DFA, *plain), "peak_bytes": _peak_bytes(DFA, *plain)})
+        dfa = DFA(args)
+        results.append({"name": "DFA.compile", "states": size,
+                        "seconds": _seconds(dfa.compile), "peak_bytes": _peak_bytes(dfa.compile)})
+        results.extend(_run("DFA", dfa, text, states=size))
+        results.extend(_run("CompiledDFA", dfa.compile(), text, states=size))
+    return results
+
+
+def bench_shrinked(sizes: typing.Iterable[int] = (10 ** 4, 10 ** 5), copies: int = 4) -> typing.List[typing.Dict]:
+    """measure DFA.shrinked() and DFA.minimized() on random DFAs, which have sizes states in total"""
+    results = []
+    for size in sizes:
+        dfa = DFA(random_dfa(size // copies, copies=copies))
+        results.append({"name": "DFA.shrinked", "states": size,
+                        "seconds": _seconds(dfa.shrinked), "peak_bytes": _peak_bytes(dfa.shrinked)})
+        begin = time.perf_counter()
+        minimized = dfa.minimized()
+        results.append({"name": "DFA.minimized", "states": size,
+                        "minimal_states": len(minimized.transitions),
+                        "seconds": time.perf_counter() - begin, "peak_bytes": _peak_bytes(dfa.minimized)})
+    return results
+
+
+def bench_nfa(ks: typing.Iterable[int] = (4, 8, 12, 16), length: int = 10 ** 5) -> typing.List[typing.Dict]:
+    """measure the "1 in the last k characters" family: makeDFAargs, and accept and trans of NFA, BitsetNFA and E_NFA"""
+    results = []
+    text = random_text(length)
+    for k in ks:
+        nfa = NFA(last_k_nfa(k))
+        begin = time.perf_counter()
+        args, _ = nfa.makeDFAargs()
+        results.append({"name": "NFA.makeDFAargs", "k": k, "dfa_states": len(args.transitions),
+                        "seconds": time.perf_counter() - begin, "peak_bytes": _peak_bytes(nfa.makeDFAargs)})
+        results.extend(_run("NFA", nfa, text, k=k))
+        results.extend(_run("BitsetNFA", nfa.bitset(), text, k=k))
+        e_nfa = to_e_nfa(last_k_pattern(k))
+        results.extend(_run("E_NFA", e_nfa, text, k=k))
+    return results
+
+
+def bench_prefixes(ks: typing.Iterable[int] = (4, 8, 12), count: int = 2000, length: int = 200) -> typing.List[typing.Dict]:
+    """measure accept_many with and without share_prefixes on prefixed_strings, for DFA, NFA and E_NFA"""
+    results = []
+    strings = prefixed_strings(count, length)
+    for k in ks:
+        nfa = NFA(last_k_nfa(k))
+        automata = {"DFA": DFA(nfa.makeDFAargs()[0]), "NFA": nfa, "E_NFA": to_e_nfa(last_k_pattern(k))}
+        for name, automaton in automata.items():
+            automaton.accept_many(strings[:1])
+            for share_prefixes in (False, True):
+                seconds = _seconds(lambda: automaton.accept_many(strings, share_prefixes=share_prefixes))
+                results.append({"name": f"{name}.accept_many", "k": k, "share_prefixes": share_prefixes,
+                                "strings": count, "length": length, "seconds": seconds})
+    return results
+
+
+def bench_memory(sizes: typing.Iterable[int] = (10, 100, 1000), count: int = 100) -> typing.List[typing.Dict]:
+    """measure memory per automaton, kept as dicts of AutomatonArgs or as Core, for DFA and the last k NFA"""
+    from automata.general.core import Core, SymbolTable
+    results = []
+    for size in sizes:
+        for name, args, deterministic in (("DFA", random_dfa(size), True), ("NFA", last_k_nfa(size), False)):
+            symbols = SymbolTable()
+            plain = ({state: {alphabet: set(target) if isinstance(target, frozenset) else target
+                              for alphabet, target in transition.items()}
+                      for state, transition in args.transitions.items()}, args.start, set(args.finals))
+            kinds = {"AutomatonArgs": lambda: [AutomatonArgs(*plain) for _ in range(count)],
+                     "Core": lambda: [Core(args, deterministic, symbols) for _ in range(count)]}
+            for kind, make in kinds.items():
+                results.append({"name": f"{name}.memory", "kind": kind, "states": size,
+                                "bytes_per_automaton": _peak_bytes(make) / count})
+        # a DFA keeps the tables made by accept, so it is measured after use too
+        args, text = random_dfa(size), random_text(10 * size)
+        used = {"AutomatonArgs": lambda: DFA({state: dict(transition) for state, transition in args.transitions.items()},
+                                             args.start, set(args.finals)),
+                "Core": lambda: DFA(Core(args, True, SymbolTable()))}
+        for kind, make in used.items():
+            results.append({"name": "DFA.memory_after_accept", "kind": kind, "states": size,
+                            "bytes": _retained_bytes(_accepted, make, text)})
+    return results
+
+
+def bench_import(statements: typing.Iterable[str] = ("import automata", "from automata import DFA", "from automata.regex import to_e_nfa",
+                                                     "from automata import DFA; DFA({0: {0: 0}}, 0, {0}, backend='auto').accept([0])"),
+                 repeat: int = 5) -> typing.List[typing.Dict]:
+    """measure cold start, the wall time of a new python process running each statement, minus the time of running nothing.
+    the best of repeat runs is taken, and the number of modules of automata loaded by the statement is counted"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    environment = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, (root, os.environ.get("PYTHONPATH"))))}
+
+    def run(statement: str) -> typing.Tuple[float, int]:
+        script = f"{statement}\nimport sys\nprint(sum(name.split('.')[0] == 'automata' for name in sys.modules))"
+        seconds, output = [], None
+        for _ in range(repeat):
+            begin = time.perf_counter()
+            output = subprocess.run([sys.executable, "-c", script], env=environment, check=True, capture_output=True, text=True).stdout
+            seconds.append(time.perf_counter() - begin)
+        return min(seconds), int(output)
+
+    base, _ = run("pass")
+    results = []
+    for statement in statements:
+        seconds, modules = run(statement)
+        results.append({"name": "import", "statement": statement, "seconds": seconds - base, "modules": modules})
+    return results
+
+
+def main(argv: typing.Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m automata.bench", description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 10 ** 3, 10 ** 5], help="states of random DFAs")
+    parser.add_argument("--ks", type=int, nargs="+", default=[4, 8, 12, 16], help="k of the last k NFAs")
+    parser.add_argument("--length", type=int, default=10 ** 5, help="length of input strings")
+    parser.add_argument("--output", type=argparse.FileType("w"), default="-", help="file of JSON lines, stdout by default")
+    options = parser.parse_args(argv)
+    for results in (bench_dfa(options.sizes, options.length),
+                    bench_shrinked([size for size in options.sizes if size >= 4]),
+                    bench_nfa(options.ks, options.length),
+                    bench_prefixes(options.ks),
+                    bench_memory(options.sizes),
+                    bench_import()):
+        for result in results:
+            print(json.dumps(result), file=options.output, flush=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,37 @@
-import sys
-sys.path.append("../automata")
+from automata._helper.lazy import attach
 
-from . import main
-from .main import *
\ No newline at end of file
+__getattr__, __dir__, __all__ = attach(__name__, [
+    "main", "compiled", "bitset", "stream", "cache", "multi", "search", "classes", "trace", "core",
+    "equivalence", "counting", "batch", "serialize", "vector", "backends",
+], {
+    "Epsilon": ".main",
+    "epsilon": ".main",
+    "StateExplosionError": ".main",
+    "AutomatonArgs": ".main",
+    "Automaton": ".main",
+    "DFA": ".main",
+    "NFA": ".main",
+    "E_NFA": ".main",
+    "CompiledDFA": ".compiled",
+    "BitsetNFA": ".bitset",
+    "Matcher": ".stream",
+    "match_file": ".stream",
+    "accept_stream": ".stream",
+    "CacheInfo": ".cache",
+    "StepCache": ".cache",
+    "MultiDFA": ".multi",
+    "product": ".multi",
+    "Searcher": ".search",
+    "ClassDFA": ".classes",
+    "Tracer": ".trace",
+    "SymbolTable": ".core",
+    "shared_symbols": ".core",
+    "Core": ".core",
+    "Comparison": ".equivalence",
+    "equivalent": ".equivalence",
+    "issubset": ".equivalence",
+    "Language": ".counting",
+    "register_backend": ".backends",
+    "available_backends": ".backends",
+})
+del attach
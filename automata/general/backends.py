@@ -0,0 +1,75 @@
+"""registry of the engines which run DFA, chosen by DFA(..., backend=name).
+an engine is made from a DFA by the factory of the backend when it is first used, and runs accept and accept_many of the DFA.
+the modules of a backend are imported only in its factory, so a backend which is not used costs nothing.
+built-in backends:
+    reference   the DFA itself, on the dicts of transitions
+    compiled    CompiledDFA, on a flat table of ints
+    numpy       CompiledDFA judging batches of strings at once by NumPy, if NumPy is installed
+"""
+import importlib.util
+import typing
+
+# name: (priority, factory, available)
+_backends = dict()
+
+
+def register_backend(name: str, factory: typing.Callable, priority: int = 0, available: typing.Callable[[], bool] | None = None) -> None:
+    """add a backend, or replace the one of the same name
+
+    Args:
+        name (str): name of the backend
+        factory (typing.Callable): function making the engine from a DFA, the engine must have accept and _accept_list like DFA
+        priority (int, optional): "auto" chooses the available backend of the highest priority. Defaults to 0.
+        available (typing.Callable[[], bool] | None, optional): check if the backend can be used, without importing it. Defaults to None, always.
+    """
+    if name == "auto":
+        raise Exception('"auto" is not a name of backend.')
+    _backends[name] = (priority, factory, available)
+
+
+def available_backends() -> typing.List[str]:
+    """names of the backends which can be used, the highest priority first"""
+    names = [name for name, (_, _, available) in _backends.items() if available is None or available()]
+    return sorted(names, key=lambda name: -_backends[name][0])
+
+
+def resolve(name: str) -> str:
+    """check name of backend, "auto" is replaced by the available backend of the highest priority
+
+    Args:
+        name (str): name of backend or "auto"
+
+    Returns:
+        str: name of backend
+    """
+    if name == "auto":
+        return available_backends()[0]
+    if name not in _backends:
+        raise Exception(f"unknown backend {name!r}, choose from {sorted(_backends)} or 'auto'.")
+    available = _backends[name][2]
+    if available is not None and not available():
+        raise Exception(f"backend {name!r} is not available.")
+    return name
+
+
+def make_engine(name: str, dfa: typing.Any) -> typing.Any:
+    """make the engine of backend name for dfa"""
+    return _backends[resolve(name)][1](dfa)
+
+
+def _reference(dfa: typing.Any) -> typing.Any:
+    return dfa
+
+
+def _compiled(dfa: typing.Any) -> typing.Any:
+    return dfa._compiled
+
+
+def _numpy(dfa: typing.Any) -> typing.Any:
+    from automata.general.vector import NumpyDFA
+    return NumpyDFA(dfa._TRANSITIONS, dfa._START, dfa._FINALS)
+
+
+register_backend("reference", _reference, priority=0)
+register_backend("compiled", _compiled, priority=1)
+register_backend("numpy", _numpy, priority=2, available=lambda: importlib.util.find_spec("numpy") is not None)
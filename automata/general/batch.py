@@ -0,0 +1,129 @@
+import itertools
+import typing
+from collections import deque
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+
+# the automaton shipped to each worker process once, by _initialize()
+_engine = None
+
+
+def _initialize(engine) -> None:
+    global _engine
+    _engine = engine
+
+
+def _accept_chunk(chunk: typing.List) -> bytearray:
+    return _engine._accept_list(chunk)
+
+
+def _accept_sorted_chunk(chunk: typing.List) -> bytearray:
+    return _accept_sorted(_engine, chunk)
+
+
+def _chunks(strings: typing.Iterable, chunksize: int) -> typing.Generator:
+    iterator = iter(strings)
+    while (chunk := list(itertools.islice(iterator, chunksize))):
+        yield chunk
+
+
+def _common_prefix(first: Sequence, second: Sequence, limit: int) -> int:
+    """internal function, the length of the common prefix of 2 strings, up to limit.
+    found by binary search over slices, so the alphabets are compared in C"""
+    limit = min(limit, len(first), len(second))
+    if first[:limit] == second[:limit]:
+        return limit
+    low, high = 0, limit - 1
+    while low < high:
+        middle = (low + high + 1) // 2
+        if first[:middle] == second[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def _accept_sorted(engine, strings: typing.List[Sequence]) -> bytearray:
+    """internal function, judge sorted strings by the lazy DFA of engine.
+    path[i] is the state after the first i alphabets of the last string, so the next string
+    starts from the end of the common prefix, and each edge of the trie of strings is walked once.
+    a path ending in the dead state is not extended, every longer string is rejected there."""
+    start, step, is_final = engine._lazy_dfa()
+    dead = engine._lazy_dead
+    results = bytearray(len(strings))
+    path = [start]
+    previous = ()
+    for i, string in enumerate(strings):
+        del path[_common_prefix(previous, string, len(path) - 1) + 1:]
+        current = path[-1]
+        if current != dead:
+            for alphabet in string[len(path) - 1:]:
+                current = step(current, alphabet)
+                path.append(current)
+                if current == dead:
+                    break
+            else:
+                results[i] = is_final(current)
+        previous = string
+    return results
+
+
+def _sorted_order(strings: typing.List[Sequence]) -> typing.List[int]:
+    """internal function, the indices of strings in sorted order.
+    strings of alphabets which can't be compared are sorted by the reprs of alphabets, which keeps prefixes together"""
+    try:
+        return sorted(range(len(strings)), key=strings.__getitem__)
+    except TypeError:
+        keys = [tuple(map(repr, string)) for string in strings]
+        return sorted(range(len(strings)), key=keys.__getitem__)
+
+
+def accept_many(engine, strings: typing.Iterable, workers: int = 1, chunksize: int = 1024, share_prefixes: bool = False) -> bytearray:
+    """judge each string, by engine._accept_list of each chunk.
+    with workers > 1, engine is sent to each worker process once, and strings are sent chunk by chunk.
+    at most 2 * workers chunks are in flight, so strings can be a long iterator.
+    with share_prefixes, all strings are read and sorted first, then a common prefix is run only once
+    for the strings next to each other, and the results are put back in the original order.
+
+    Args:
+        engine (Automaton): the automaton to run, usually compiled one
+        strings (typing.Iterable): strings to be judged
+        workers (int, optional): the number of worker processes. Defaults to 1.
+        chunksize (int, optional): the number of strings sent to a worker at once. Defaults to 1024.
+        share_prefixes (bool, optional): run the common prefixes of strings once. Defaults to False.
+
+    Returns:
+        bytearray: results[i] is 1 if i-th string is accepted, else 0
+    """
+    if share_prefixes:
+        strings = [string if isinstance(string, Sequence) else tuple(string) for string in strings]
+        order = _sorted_order(strings)
+        ordered = [strings[i] for i in order]
+        if workers <= 1:
+            sorted_results = _accept_sorted(engine, ordered)
+        else:
+            sorted_results = _run_workers(engine, ordered, workers, chunksize, _accept_sorted_chunk)
+        results = bytearray(len(strings))
+        for i, accepted in zip(order, sorted_results):
+            results[i] = accepted
+        return results
+    if workers <= 1:
+        results = bytearray()
+        for chunk in _chunks(strings, chunksize):
+            results += engine._accept_list(chunk)
+        return results
+    return _run_workers(engine, strings, workers, chunksize, _accept_chunk)
+
+
+def _run_workers(engine, strings: typing.Iterable, workers: int, chunksize: int, function: typing.Callable) -> bytearray:
+    """internal function, run function over chunks of strings in worker processes, keeping the order"""
+    results = bytearray()
+    with ProcessPoolExecutor(workers, initializer=_initialize, initargs=(engine,)) as executor:
+        pending = deque()
+        for chunk in _chunks(strings, chunksize):
+            pending.append(executor.submit(function, chunk))
+            if len(pending) >= 2 * workers:
+                results += pending.popleft().result()
+        while pending:
+            results += pending.popleft().result()
+    return results
@@ -0,0 +1,142 @@
+import functools
+import typing
+from collections.abc import Collection
+from automata.general.main import Automaton, NFA, E_NFA, _MISSING
+from automata._helper import helper
+
+
+class BitsetNFA(Automaton):
+    """NFA (or ε-NFA) running on bitmasks.
+    i-th state of the NFA is the bit 1 << i, and the set of current states is one int.
+    for each alphabet, the successors of each state are precomputed as bitmask (closed under epsilon moves for ε-NFA),
+    so one step is OR of the successors of the current states. alphabets with the same successors share one list.
+    you can get this from NFA.bitset() or E_NFA.bitset() like below:
+    a = NFA(transitions, start, finals).bitset()
+    a.accept("0101")
+    """
+
+    def __init__(self, nfa: NFA):
+        super().__init__(nfa._TRANSITIONS, nfa._START, nfa._FINALS)
+        states, index, masks = nfa._successor_masks()
+        self._epsilon_moves = isinstance(nfa, E_NFA)
+        self._states = states
+        self._index = index
+        # alphabets which move every state to the same states are one symbol class, and share one list of masks
+        shared = dict()
+        self._masks = {alphabet: shared.setdefault(tuple(successors), successors) for alphabet, successors in masks.items()}
+        self._start = nfa._start_mask(index)
+        self._finals = nfa._finals_mask(index)
+
+    @property
+    def state_index(self) -> typing.Dict[typing.Hashable, int]:
+        """map from state to its bit position"""
+        return self._index
+
+    @property
+    def classes(self) -> typing.Tuple[typing.Tuple, ...]:
+        """symbol classes, alphabets sharing the same successors"""
+        classes = dict()
+        for alphabet, successors in self._masks.items():
+            classes.setdefault(id(successors), []).append(alphabet)
+        return tuple(map(tuple, classes.values()))
+
+    def encode(self, states: typing.Iterable) -> int:
+        """make bitmask from states"""
+        mask = 0
+        for state in states:
+            mask |= 1 << self._index[state]
+        return mask
+
+    def decode(self, mask: int) -> typing.Set:
+        """make set of states from bitmask"""
+        return {self._states[i] for i in helper._iter_bits(mask)}
+
+    def step(self, mask: int, alphabet: typing.Hashable) -> int:
+        """move on from the states in mask by alphabet
+
+        Args:
+            mask (int): current states as bitmask
+            alphabet (typing.Hashable): next alphabet
+
+        Returns:
+            int: next states as bitmask
+        """
+        successors = self._masks.get(alphabet)
+        if successors is None:
+            return 0
+        next_mask = 0
+        while mask:
+            low = mask & -mask
+            next_mask |= successors[low.bit_length() - 1]
+            mask ^= low
+        return next_mask
+
+    def trans(self, string: Collection) -> typing.Generator:
+        """same as NFA.trans (or E_NFA.trans), yield set of states for each step"""
+        current = self._start
+        yield self.decode(current) if self._epsilon_moves else self._START
+        for alphabet in string:
+            current = self.step(current, alphabet)
+            yield self.decode(current)
+
+    def _targets(self, target: typing.Iterable) -> typing.Iterable:
+        return target
+
+    @functools.cached_property
+    def _sink_states(self) -> typing.FrozenSet[typing.Hashable]:
+        # finals which move to some sink by every alphabet, the greatest such set is found by removing the others
+        sinks = 0
+        for state in self._FINALS:
+            if state in self._TRANSITIONS:
+                sinks |= 1 << self._index[state]
+        changed = True
+        while changed:
+            changed = False
+            for i in helper._iter_bits(sinks):
+                if any(not successors[i] & sinks for successors in self._masks.values()):
+                    sinks ^= 1 << i
+                    changed = True
+        return frozenset(self.decode(sinks))
+
+    @functools.cached_property
+    def _searcher(self) -> "BitsetSearcher":
+        from automata.general.search import BitsetSearcher
+        return BitsetSearcher(self)
+
+    def _added_target(self, old: typing.Any, target: typing.Hashable) -> typing.FrozenSet:
+        return frozenset(() if old is _MISSING else old) | {target}
+
+    def _removed_target(self, old: typing.Any, target: typing.Hashable) -> typing.FrozenSet:
+        return frozenset(old) - {target}
+
+    def _set_row(self, *args) -> None:
+        raise Exception("BitsetNFA can't be changed, change the NFA and make bitset() again.")
+
+    def set_final(self, state: typing.Hashable, final: bool = True) -> None:
+        raise Exception("BitsetNFA can't be changed, change the NFA and make bitset() again.")
+
+    _lazy_dead = 0
+
+    def _lazy_dfa(self) -> typing.Tuple[int, typing.Callable, typing.Callable]:
+        finals = self._finals
+        return self._start, self.step, lambda mask: bool(mask & finals)
+
+    def _trace_states(self, current: typing.Any) -> typing.Collection:
+        return current if isinstance(current, set) else frozenset((current,))
+
+    def accept(self, string: Collection) -> bool:
+        masks = self._masks
+        current = self._start
+        for alphabet in string:
+            successors = masks.get(alphabet)
+            if successors is None:
+                return False
+            next_mask = 0
+            while current:
+                low = current & -current
+                next_mask |= successors[low.bit_length() - 1]
+                current ^= low
+            if not next_mask:
+                return False
+            current = next_mask
+        return bool(current & self._finals)
@@ -0,0 +1,66 @@
+import typing
+from collections import OrderedDict
+
+
+class CacheInfo(typing.NamedTuple):
+    hits: int
+    misses: int
+    maxsize: typing.Optional[int]
+    currsize: int
+
+
+class StepCache:
+    """bounded LRU cache of steps, (states, alphabet) -> next states.
+    NFA uses this to remember the subsets it has visited, which is lazy subset construction.
+    maxsize None means unbounded, and 0 means nothing is cached.
+    """
+
+    def __init__(self, maxsize: typing.Optional[int] = 4096):
+        self._entries = OrderedDict()
+        self._maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: typing.Hashable) -> typing.Any:
+        """get the cached value and mark it as recently used, or None if key is not cached"""
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: typing.Hashable, value: typing.Any) -> None:
+        """cache value, dropping the least recently used entry if the cache is full"""
+        if self._maxsize == 0:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if self._maxsize is not None and len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    def resize(self, maxsize: typing.Optional[int]) -> None:
+        """change maxsize, dropping the least recently used entries which don't fit"""
+        self._maxsize = maxsize
+        if maxsize is not None:
+            while len(self._entries) > maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, predicate: typing.Callable[[typing.Hashable], bool]) -> None:
+        """drop the entries whose key satisfies predicate, keeping the statistics"""
+        for key in [key for key in self._entries if predicate(key)]:
+            del self._entries[key]
+
+    def clear(self) -> None:
+        """drop every entry and reset the statistics"""
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+    def info(self) -> CacheInfo:
+        """statistics like functools.lru_cache().cache_info()"""
+        return CacheInfo(self.hits, self.misses, self._maxsize, len(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
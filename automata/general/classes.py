@@ -0,0 +1,130 @@
+from array import array
+from bisect import bisect_left
+import typing
+from collections.abc import Collection
+from automata.general.main import DFA
+
+
+class ClassDFA(DFA):
+    """DFA running on symbol classes and a sparse (CSR) transition table, for large alphabets.
+    alphabets which move every state to the same state are one class, so a table over classes is much smaller than over alphabets.
+    row i of the table is indices[indptr[i]:indptr[i + 1]] (sorted classes) and targets[indptr[i]:indptr[i + 1]] (next states),
+    so only the transitions which exist are stored.
+    bytes, bytearray and memoryview strings are looked up by a table of 256 classes, int first, then bytes of length 1, then str of length 1.
+    you can get this from DFA.compress() like below:
+    dfa = DFA(transitions, start, accept).compress()
+    dfa.classes  # ((alphabets of class 0), (alphabets of class 1), ...)
+    """
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        state_index = {state: i for i, state in enumerate(self._TRANSITIONS)}
+        signatures = dict()
+        for state, transition in self._TRANSITIONS.items():
+            for alphabet, target in transition.items():
+                signature = signatures.setdefault(alphabet, [])
+                if target is not None:
+                    signature.append((state_index[state], state_index.setdefault(target, len(state_index))))
+        state_index.setdefault(self._START, len(state_index))
+
+        class_index = dict()
+        class_of = dict()
+        classes = []
+        for alphabet, signature in signatures.items():
+            if not signature:
+                continue
+            signature = tuple(signature)
+            if signature not in class_index:
+                class_index[signature] = len(classes)
+                classes.append([])
+            class_of[alphabet] = class_index[signature]
+            classes[class_of[alphabet]].append(alphabet)
+
+        rows = [[] for _ in state_index]
+        for signature, c in class_index.items():
+            for state, target in signature:
+                rows[state].append((c, target))
+        indptr = array("i", [0])
+        indices = array("i")
+        targets = array("i")
+        for row in rows:
+            for c, target in row:
+                indices.append(c)
+                targets.append(target)
+            indptr.append(len(indices))
+        finals = bytearray(len(state_index))
+        for state in self._FINALS:
+            if state in state_index:
+                finals[state_index[state]] = 1
+
+        self._states = tuple(state_index)
+        self._state_index = state_index
+        self._class_of = class_of
+        self._classes = tuple(map(tuple, classes))
+        self._byte_classes = [
+            class_of.get(byte, class_of.get(bytes((byte,)), class_of.get(chr(byte))))
+            for byte in range(256)]
+        self._indptr = indptr
+        self._indices = indices
+        self._csr_targets = targets
+        self._finals = bytes(finals)
+        self._start = state_index[self._START]
+
+    @property
+    def class_of(self) -> typing.Dict[typing.Hashable, int]:
+        """map from alphabet to its class"""
+        return self._class_of
+
+    @property
+    def classes(self) -> typing.Tuple[typing.Tuple, ...]:
+        """alphabets of each class"""
+        return self._classes
+
+    @property
+    def nbytes(self) -> int:
+        """size of the transition table in bytes"""
+        return sum(table.itemsize * len(table) for table in (self._indptr, self._indices, self._csr_targets))
+
+    def compress(self) -> "ClassDFA":
+        return self
+
+    def _set_row(self, *args) -> None:
+        raise Exception("ClassDFA can't be changed, change the DFA and compress it again.")
+
+    def set_final(self, state: typing.Hashable, final: bool = True) -> None:
+        raise Exception("ClassDFA can't be changed, change the DFA and compress it again.")
+
+    def _classes_of(self, string: Collection) -> typing.Iterable:
+        if isinstance(string, (bytes, bytearray, memoryview)):
+            return map(self._byte_classes.__getitem__, memoryview(string).cast("B"))
+        return map(self._class_of.get, string)
+
+    def _next(self, current: int, c: int | None) -> int:
+        """internal function, next state of current by class c, or -1 if it is dead"""
+        if c is None:
+            return -1
+        low, high = self._indptr[current], self._indptr[current + 1]
+        i = bisect_left(self._indices, c, low, high)
+        return self._csr_targets[i] if i < high and self._indices[i] == c else -1
+
+    def trans(self, string: Collection) -> typing.Generator:
+        """same as DFA.trans, but yield None after falling into the dead state"""
+        current = self._start
+        yield self._states[current]
+        for c in self._classes_of(string):
+            if current >= 0:
+                current = self._next(current, c)
+            yield None if current < 0 else self._states[current]
+
+    def accept(self, string: Collection) -> bool:
+        indptr, indices, targets = self._indptr, self._indices, self._csr_targets
+        current = self._start
+        for c in self._classes_of(string):
+            if c is None:
+                return False
+            high = indptr[current + 1]
+            i = bisect_left(indices, c, indptr[current], high)
+            if i == high or indices[i] != c:
+                return False
+            current = targets[i]
+        return self._finals[current] == 1
@@ -0,0 +1,227 @@
+from array import array
+import functools
+import typing
+from collections.abc import Collection, Mapping
+from automata.general.main import DFA
+
+
+class CompiledDFA(DFA):
+    """DFA running on a flat integer transition table.
+    states and alphabets are mapped to dense integers, and transitions are stored in
+    array('i') of size len(states) * len(symbols), row-major by state.
+    missing transitions, None transitions and unknown alphabets go to the dead index -1.
+    you can get this from DFA.compile() like below:
+    dfa = DFA(transitions, start, accept).compile()
+    dfa.state_index  # {"q0": 0, "q1": 1, "q2": 2}
+    dfa.symbol_index  # {"0": 0, "1": 1}
+    """
+    DEAD = -1
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        state_index = {state: i for i, state in enumerate(self._TRANSITIONS)}
+        symbol_index = dict()
+        for transition in self._TRANSITIONS.values():
+            for alphabet, state in transition.items():
+                symbol_index.setdefault(alphabet, len(symbol_index))
+                if state is not None:
+                    state_index.setdefault(state, len(state_index))
+        state_index.setdefault(self._START, len(state_index))
+
+        width = len(symbol_index)
+        table = array("i", [self.DEAD]) * (len(state_index) * width)
+        for state, transition in self._TRANSITIONS.items():
+            row = state_index[state] * width
+            for alphabet, target in transition.items():
+                if target is not None:
+                    table[row + symbol_index[alphabet]] = state_index[target]
+        finals = bytearray(len(state_index))
+        for state in self._FINALS:
+            if state in state_index:
+                finals[state_index[state]] = 1
+        self._set_table(tuple(state_index), tuple(symbol_index), table, bytes(finals), state_index[self._START])
+
+    @classmethod
+    def _from_table(cls, states: typing.Tuple, symbols: typing.Tuple, table: typing.Sequence[int], finals: bytes, start: int) -> "CompiledDFA":
+        """internal function, make CompiledDFA from the table directly, like DFA.load().
+        _TRANSITIONS is a read-only view of the table, so no dict is made until it is used.
+
+        Args:
+            states (typing.Tuple): states ordered by index
+            symbols (typing.Tuple): alphabets ordered by index
+            table (typing.Sequence[int]): flat transition table, array or memoryview
+            finals (bytes): finals[i] is 1 if states[i] is final
+            start (int): index of the start state
+        """
+        dfa = cls.__new__(cls)
+        dfa._TRANSITIONS = _TableTransitions(dfa)
+        dfa._START = states[start]
+        dfa._FINALS = frozenset(state for state, final in zip(states, finals) if final)
+        dfa._set_table(states, symbols, table, finals, start)
+        return dfa
+
+    def _set_table(self, states: typing.Tuple, symbols: typing.Tuple, table: typing.Sequence[int], finals: bytes, start: int) -> None:
+        self._state_index = {state: i for i, state in enumerate(states)}
+        self._symbol_index = {alphabet: i for i, alphabet in enumerate(symbols)}
+        self._states = states
+        self._symbols = symbols
+        self._width = len(symbols)
+        self._table = table
+        self._finals = finals
+        self._start = start
+
+    def __getstate__(self) -> typing.Dict:
+        # a table loaded by DFA.load() is a memoryview of mmap, which can't be pickled
+        state = super().__getstate__()
+        if not isinstance(self._table, array):
+            state["_table"] = array("i", self._table)
+        state.pop("_buffer", None)
+        return state
+
+    @property
+    def state_index(self) -> typing.Dict[typing.Hashable, int]:
+        """map from state to its row in the table"""
+        return self._state_index
+
+    @property
+    def symbol_index(self) -> typing.Dict[typing.Hashable, int]:
+        """map from alphabet to its column in the table"""
+        return self._symbol_index
+
+    @property
+    def states(self) -> typing.Tuple[typing.Hashable, ...]:
+        """states ordered by index, inverse of state_index"""
+        return self._states
+
+    @property
+    def symbols(self) -> typing.Tuple[typing.Hashable, ...]:
+        """alphabets ordered by index, inverse of symbol_index"""
+        return self._symbols
+
+    @property
+    def table(self) -> array:
+        """flat transition table, table[state * len(symbols) + symbol] is the next state or -1"""
+        return self._table
+
+    def compile(self) -> "CompiledDFA":
+        return self
+
+    def _set_row(self, *args) -> None:
+        raise Exception("CompiledDFA can't be changed, change the DFA and compile it again.")
+
+    def set_final(self, state: typing.Hashable, final: bool = True) -> None:
+        raise Exception("CompiledDFA can't be changed, change the DFA and compile it again.")
+
+    @functools.cached_property
+    def _sinks(self) -> typing.Tuple[bytearray, bytearray]:
+        """internal table, (dead, accepting) flags of each state index.
+        dead[i] is 1 if no final is reachable from i.
+        accepting[i] is 1 if every state reachable from i is final and has transitions by every alphabet,
+        so the string is accepted whatever alphabets of this DFA come after."""
+        size, width, table = len(self._states), self._width, self._table
+        reverse = [[] for _ in range(size)]
+        for state in range(size):
+            for column in range(width):
+                target = table[state * width + column]
+                if target >= 0:
+                    reverse[target].append(state)
+        dead = bytearray(1 for _ in range(size))
+        stack = [state for state in range(size) if self._finals[state]]
+        for state in stack:
+            dead[state] = 0
+        while stack:
+            for state in reverse[stack.pop()]:
+                if dead[state]:
+                    dead[state] = 0
+                    stack.append(state)
+        # remove states which can leave the finals, until nothing changes
+        accepting = bytearray(self._finals[state] == 1 and width > 0 for state in range(size))
+        stack = [state for state in range(size) if not accepting[state]]
+        for state in range(size):
+            if accepting[state] and any(table[state * width + column] < 0 for column in range(width)):
+                accepting[state] = 0
+                stack.append(state)
+        while stack:
+            for state in reverse[stack.pop()]:
+                if accepting[state]:
+                    accepting[state] = 0
+                    stack.append(state)
+        return dead, accepting
+
+    @functools.cached_property
+    def _stops(self) -> bytes:
+        """internal table, stops[i] is 1 if accept stops at state index i, a dead state or a sink.
+        the last item is 1 too, so stops[-1] is the dead index"""
+        dead, accepting = self._sinks
+        return bytes(a | b for a, b in zip(dead, accepting)) + b"\x01"
+
+    _lazy_dead = DEAD
+
+    def _lazy_dfa(self) -> typing.Tuple[int, typing.Callable, typing.Callable]:
+        # state indices of the table, dead states and unknown alphabets are all the dead index
+        table, width, symbol_index, dead, finals = self._table, self._width, self._symbol_index, self._sinks[0], self._finals
+
+        def step(state: int, alphabet: typing.Hashable) -> int:
+            column = symbol_index.get(alphabet)
+            if state == self.DEAD or column is None:
+                return self.DEAD
+            following = table[state * width + column]
+            return self.DEAD if following == self.DEAD or dead[following] else following
+        return (self.DEAD if dead[self._start] else self._start), step, lambda state: state != self.DEAD and finals[state] == 1
+
+    def trans(self, string: Collection) -> typing.Generator:
+        """same as DFA.trans, but yield None after falling into the dead state"""
+        table, width, symbol_index, states = self._table, self._width, self._symbol_index, self._states
+        dead = self._sinks[0]
+        current = self._start
+        yield states[current]
+        for alphabet in string:
+            if current != self.DEAD:
+                column = symbol_index.get(alphabet)
+                current = self.DEAD if column is None else table[current * width + column]
+                if current != self.DEAD and dead[current]:
+                    current = self.DEAD
+            yield None if current == self.DEAD else states[current]
+
+    def accept(self, string: Collection) -> bool:
+        table, width, symbol_index, stops = self._table, self._width, self._symbol_index, self._stops
+        current = self._start
+        alphabets = iter(string)
+        if not stops[current]:
+            for alphabet in alphabets:
+                column = symbol_index.get(alphabet)
+                if column is None:
+                    return False
+                current = table[current * width + column]
+                if stops[current]:
+                    break
+            else:
+                return self._finals[current] == 1
+        if current >= 0 and self._sinks[1][current]:
+            # a sink accepts every alphabet of this DFA, so only unknown alphabets are left to check
+            return all(map(symbol_index.__contains__, alphabets))
+        return False
+
+
+class _TableTransitions(Mapping):
+    """read-only view of the table of CompiledDFA as transitions, {state: {alphabet: state}}.
+    each row is made when it is looked up, and the dead transitions are missing in it."""
+
+    def __init__(self, dfa: CompiledDFA):
+        self._dfa = dfa
+
+    def __getitem__(self, state: typing.Hashable) -> typing.Dict:
+        dfa = self._dfa
+        row = dfa.state_index[state] * dfa._width
+        transition = dict()
+        for column, alphabet in enumerate(dfa.symbols):
+            target = dfa.table[row + column]
+            if target >= 0:
+                transition[alphabet] = dfa.states[target]
+        return transition
+
+    def __iter__(self) -> typing.Iterator:
+        return iter(self._dfa.states)
+
+    def __len__(self) -> int:
+        return len(self._dfa.states)
@@ -0,0 +1,348 @@
+from array import array
+from bisect import bisect_left
+import typing
+from collections.abc import Mapping, Set
+from automata.general.main import AutomatonArgs
+
+
+class SymbolTable:
+    """alphabets interned to ints, shared by many Cores so each alphabet is stored once.
+    ids are never reused, so a table only grows."""
+    __slots__ = ("_symbols", "_index")
+
+    def __init__(self):
+        self._symbols = []
+        self._index = dict()
+
+    def intern(self, symbol: typing.Hashable) -> int:
+        """get the id of symbol, adding it if it is new"""
+        i = self._index.get(symbol)
+        if i is None:
+            i = self._index[symbol] = len(self._symbols)
+            self._symbols.append(symbol)
+        return i
+
+    def id_of(self, symbol: typing.Hashable) -> int | None:
+        """get the id of symbol, or None if it is not interned"""
+        return self._index.get(symbol)
+
+    def __getitem__(self, i: int) -> typing.Hashable:
+        return self._symbols[i]
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+
+# the table shared by every Core made without symbols
+shared_symbols = SymbolTable()
+
+
+class Core:
+    """compact immutable transitions of DFA, NFA or E_NFA.
+    states are interned to ints 0, 1, ... (labels keeps the original states) and alphabets to ids of a shared SymbolTable.
+    the transitions of state i are entries indptr[i]:indptr[i + 1], sorted by symbol id in columns.
+    only the states which have transitions in AutomatonArgs have rows, and they come first.
+    for DFA, targets[entry] is the next state or -1 for None.
+    for NFA, the next states of an entry are targets[offsets[entry]:offsets[entry + 1]].
+    so an automaton is a few flat arrays instead of dicts of dicts of sets.
+    DFA, NFA and E_NFA can be made from this, and read it through read-only views, like below:
+    core = Core(args, deterministic=True)
+    dfa = DFA(core)
+    core.to_args()  # back to AutomatonArgs
+    """
+    __slots__ = ("_deterministic", "_symbols", "_labels", "_start", "_finals", "_indptr", "_columns", "_offsets", "_targets", "_rows", "_index")
+
+    def __init__(self, args: AutomatonArgs, deterministic: bool, symbols: SymbolTable | None = None):
+        """
+        Args:
+            args (AutomatonArgs): the automaton
+            deterministic (bool): True for DFA, whose targets are states, and False for NFA and E_NFA, whose targets are sets
+            symbols (SymbolTable | None, optional): the table of alphabets. Defaults to None, shared_symbols.
+        """
+        symbols = shared_symbols if symbols is None else symbols
+        index = {state: i for i, state in enumerate(args.transitions)}
+        for transition in args.transitions.values():
+            for target in transition.values():
+                for state in ((target,) if deterministic else target):
+                    if state is not None:
+                        index.setdefault(state, len(index))
+        index.setdefault(args.start, len(index))
+        for state in args.finals:
+            index.setdefault(state, len(index))
+
+        indptr, columns, targets = array("i", [0]), array("i"), array("i")
+        offsets = None if deterministic else array("i", [0])
+        for state in args.transitions:
+            transition = args.transitions[state]
+            for column, alphabet in sorted((symbols.intern(alphabet), alphabet) for alphabet in transition):
+                columns.append(column)
+                target = transition[alphabet]
+                if deterministic:
+                    targets.append(-1 if target is None else index[target])
+                else:
+                    targets.extend(sorted(index[state] for state in target))
+                    offsets.append(len(targets))
+            indptr.append(len(columns))
+        set_ = object.__setattr__
+        set_(self, "_deterministic", deterministic)
+        set_(self, "_symbols", symbols)
+        set_(self, "_labels", tuple(index))
+        set_(self, "_start", index[args.start])
+        set_(self, "_finals", array("i", sorted(index[state] for state in args.finals)))
+        set_(self, "_indptr", indptr)
+        set_(self, "_columns", columns)
+        set_(self, "_offsets", offsets)
+        set_(self, "_targets", targets)
+        set_(self, "_rows", len(args.transitions))
+        set_(self, "_index", None)
+
+    def __setattr__(self, name: str, value: typing.Any) -> None:
+        raise AttributeError("Core is immutable.")
+
+    def __getstate__(self) -> typing.Dict:
+        # the map from labels to ids is made again on first use after unpickling
+        return {name: getattr(self, name) for name in self.__slots__ if name != "_index"}
+
+    def __setstate__(self, state: typing.Dict) -> None:
+        for name, value in state.items():
+            object.__setattr__(self, name, value)
+        object.__setattr__(self, "_index", None)
+
+    @property
+    def deterministic(self) -> bool:
+        """True if this is transitions of DFA"""
+        return self._deterministic
+
+    @property
+    def labels(self) -> typing.Tuple[typing.Hashable, ...]:
+        """original states ordered by id"""
+        return self._labels
+
+    @property
+    def symbols(self) -> SymbolTable:
+        return self._symbols
+
+    @property
+    def start(self) -> typing.Hashable:
+        return self._labels[self._start]
+
+    @property
+    def finals(self) -> "_CoreFinals":
+        """read-only set of final states"""
+        return _CoreFinals(self)
+
+    @property
+    def transitions(self) -> "_CoreTransitions":
+        """read-only view of transitions, {state: {alphabet: next state (DFA) or frozenset of next states (NFA)}}"""
+        return _CoreTransitions(self)
+
+    @property
+    def nbytes(self) -> int:
+        """size of the arrays in bytes, without labels and symbols"""
+        arrays = (self._finals, self._indptr, self._columns, self._offsets, self._targets)
+        return sum(table.itemsize * len(table) for table in arrays if table is not None)
+
+    def to_args(self) -> AutomatonArgs:
+        """make AutomatonArgs of dicts from this"""
+        return AutomatonArgs(transitions={state: dict(transition) for state, transition in self.transitions.items()},
+                             start=self.start, finals=set(self.finals))
+
+    def _id(self, state: typing.Hashable) -> int:
+        """internal function, the id of state, raise KeyError if it is not a state.
+        the map from labels to ids is made on first use, and not made at all if labels are 0, 1, ..."""
+        index = self._index
+        if index is None:
+            labels = self._labels
+            if all(type(label) is int and label == i for i, label in enumerate(labels)):
+                index = range(len(labels))
+            else:
+                index = {label: i for i, label in enumerate(labels)}
+            object.__setattr__(self, "_index", index)
+        if type(index) is range:
+            if type(state) is int and 0 <= state < len(index):
+                return state
+            raise KeyError(state)
+        try:
+            return index[state]
+        except TypeError:
+            raise KeyError(state)
+
+    def _entry(self, state: int, alphabet: typing.Hashable) -> int:
+        """internal function, the entry of alphabet in the row of state, or -1 if there is no transition"""
+        column = self._symbols.id_of(alphabet)
+        if column is None:
+            return -1
+        low, high = self._indptr[state], self._indptr[state + 1]
+        i = bisect_left(self._columns, column, low, high)
+        return i if i < high and self._columns[i] == column else -1
+
+    def _target(self, entry: int) -> typing.Any:
+        """internal function, the next state (DFA) or frozenset of next states (NFA) of entry"""
+        labels = self._labels
+        if self._deterministic:
+            target = self._targets[entry]
+            return None if target < 0 else labels[target]
+        return frozenset(labels[target] for target in self._targets[self._offsets[entry]:self._offsets[entry + 1]])
+
+
+class _CoreTransitions(Mapping):
+    """read-only view of the transitions of Core, rows are made when they are looked up"""
+    __slots__ = ("_core",)
+
+    def __init__(self, core: Core):
+        self._core = core
+
+    def __getitem__(self, state: typing.Hashable) -> "_CoreRow":
+        i = self._core._id(state)
+        if i >= self._core._rows:
+            raise KeyError(state)
+        return _CoreRow(self._core, i)
+
+    def __iter__(self) -> typing.Iterator:
+        return iter(self._core._labels[:self._core._rows])
+
+    def __len__(self) -> int:
+        return self._core._rows
+
+
+class _CoreRow(Mapping):
+    """read-only view of the transitions of one state of Core"""
+    __slots__ = ("_core", "_state")
+
+    def __init__(self, core: Core, state: int):
+        self._core = core
+        self._state = state
+
+    def __getitem__(self, alphabet: typing.Hashable) -> typing.Any:
+        entry = self._core._entry(self._state, alphabet)
+        if entry < 0:
+            raise KeyError(alphabet)
+        return self._core._target(entry)
+
+    def __iter__(self) -> typing.Iterator:
+        core = self._core
+        for entry in range(core._indptr[self._state], core._indptr[self._state + 1]):
+            yield core._symbols[core._columns[entry]]
+
+    def __len__(self) -> int:
+        return self._core._indptr[self._state + 1] - self._core._indptr[self._state]
+
+
+class _CoreFinals(Set):
+    """read-only view of the finals of Core"""
+    __slots__ = ("_core",)
+    # results of set operations like finals | {state} are frozensets
+    _from_iterable = classmethod(frozenset)
+
+    def __init__(self, core: Core):
+        self._core = core
+
+    def __contains__(self, state: typing.Hashable) -> bool:
+        try:
+            i = self._core._id(state)
+        except KeyError:
+            return False
+        finals = self._core._finals
+        j = bisect_left(finals, i)
+        return j < len(finals) and finals[j] == i
+
+    def __iter__(self) -> typing.Iterator:
+        labels = self._core._labels
+        return (labels[i] for i in self._core._finals)
+
+    def __len__(self) -> int:
+        return len(self._core._finals)
+
+
+class _CoreEngine:
+    """accept of DFA made from Core, stepping on the arrays of Core without making rows.
+    dead states and sinks are found on the arrays too, so only a few bytes per state are kept after use.
+    it judges strings like DFA.accept, raising KeyError for missing transitions"""
+    __slots__ = ("_core", "_kinds", "_columns")
+
+    # kinds of states: the run goes on, stops as rejected, stops at a sink, or stops at a state without transitions.
+    # FINAL is added to the kind of finals
+    _GO, _DEAD, _SINK, _END, _FINAL = 0, 1, 2, 8, 4
+
+    def __init__(self, dfa: typing.Any):
+        self._core = core = dfa._TRANSITIONS._core
+        indptr, targets, rows = core._indptr, core._targets, core._rows
+        size = len(core._labels)
+        finals = bytearray(size)
+        if isinstance(dfa._FINALS, _CoreFinals) and dfa._FINALS._core is core:
+            for i in core._finals:
+                finals[i] = 1
+        else:
+            # set_final has changed the finals of the Core
+            for state in dfa._FINALS:
+                try:
+                    finals[core._id(state)] = 1
+                except KeyError:
+                    pass
+        self._columns = frozenset(core._columns)
+
+        # the states which reach a final, found backward from finals
+        predecessors = [[] for _ in range(size)]
+        for state in range(rows):
+            for entry in range(indptr[state], indptr[state + 1]):
+                if targets[entry] >= 0:
+                    predecessors[targets[entry]].append(state)
+        living = bytearray(finals)
+        stack = [i for i in range(size) if finals[i]]
+        while stack:
+            for state in predecessors[stack.pop()]:
+                if not living[state]:
+                    living[state] = 1
+                    stack.append(state)
+        del predecessors
+
+        # finals which move to sinks by every alphabet, the greatest such set is found by removing the others
+        width = len(self._columns)
+        sinks = bytearray(size)
+        for state in range(rows):
+            sinks[state] = finals[state] and indptr[state + 1] - indptr[state] == width
+        changed = True
+        while changed:
+            changed = False
+            for state in range(rows):
+                if sinks[state] and not all(targets[entry] >= 0 and sinks[targets[entry]]
+                                            for entry in range(indptr[state], indptr[state + 1])):
+                    sinks[state] = 0
+                    changed = True
+
+        self._kinds = bytes((self._SINK if sinks[i] else self._DEAD if not living[i] else self._GO if i < rows else self._END)
+                            + self._FINAL * finals[i] for i in range(size))
+
+    def accept(self, string: typing.Iterable) -> bool:
+        core, kinds = self._core, self._kinds
+        indptr, columns, targets, index = core._indptr, core._columns, core._targets, core._symbols._index.get
+        stop = self._DEAD | self._SINK | self._END
+        current = core._start
+        alphabets = iter(string)
+        if not kinds[current] & stop:
+            for alphabet in alphabets:
+                column = index(alphabet)
+                high = indptr[current + 1]
+                entry = high if column is None else bisect_left(columns, column, indptr[current], high)
+                if entry == high or columns[entry] != column:
+                    raise KeyError(alphabet)
+                current = targets[entry]
+                if current < 0:
+                    return False
+                if kinds[current] & stop:
+                    break
+            else:
+                return bool(kinds[current] & self._FINAL)
+        kind = kinds[current]
+        if kind & self._END:
+            # a state without transitions fails on any more alphabet, like DFA.accept
+            for alphabet in alphabets:
+                raise KeyError(core._labels[current])
+            return bool(kind & self._FINAL)
+        if kind & self._SINK:
+            # a sink accepts every alphabet of this DFA, an unknown alphabet fails like moving on by it
+            for alphabet in alphabets:
+                if index(alphabet) not in self._columns:
+                    raise KeyError(alphabet)
+            return True
+        return False
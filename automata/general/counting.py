@@ -0,0 +1,136 @@
+import random
+import typing
+from automata.general.compiled import CompiledDFA
+
+
+class Language:
+    """count, sample and enumerate the strings accepted by a DFA, over the compiled table.
+    ways(m)[s] is the number of strings of length m accepted from state index s, made by DP from ways(m - 1)
+    and cached for every length, so sample and enumerate reuse them. counts are python ints, so they never overflow.
+    strings are tuples of alphabets, use "".join() for str alphabets.
+    you can get this from DFA.count(), DFA.sample() and DFA.enumerate() like below:
+    dfa.count(10)
+    dfa.sample(10, 5, rng=random.Random(0))
+    list(dfa.enumerate(3))
+    """
+
+    def __init__(self, dfa: CompiledDFA):
+        self._dfa = dfa
+        symbols = dfa.symbols
+        try:
+            order = sorted(range(len(symbols)), key=symbols.__getitem__)
+        except TypeError:
+            order = sorted(range(len(symbols)), key=lambda column: repr(symbols[column]))
+        # columns in lexicographic order of alphabets
+        self._columns = tuple(order)
+        self._ways = [[int(final) for final in dfa._finals[:len(dfa.states)]]]
+
+    def ways(self, length: int) -> typing.List[int]:
+        """the number of strings of length accepted from each state index, cached"""
+        dfa = self._dfa
+        table, width, ways = dfa.table, dfa._width, self._ways
+        while len(ways) <= length:
+            previous = ways[-1]
+            ways.append([sum(previous[target] for target in table[state * width:(state + 1) * width] if target >= 0)
+                         for state in range(len(previous))])
+        return ways[length]
+
+    def count(self, length: int) -> int:
+        """the number of strings of length accepted.
+        if the DP to length costs more than matrix exponentiation, the count is found by matrix power and not cached"""
+        if length < 0:
+            return 0
+        size, width = len(self._dfa.states), self._dfa._width
+        if (length - len(self._ways)) * width > size * size * length.bit_length():
+            return self._matrix_count(length)
+        return self.ways(length)[self._dfa._start]
+
+    def _matrix_count(self, length: int) -> int:
+        """internal function, count by the powers of the transition matrix, matrix[s][t] is the number of alphabets from s to t"""
+        dfa = self._dfa
+        size, width, table = len(dfa.states), dfa._width, dfa.table
+        matrix = [[0] * size for _ in range(size)]
+        for state in range(size):
+            for target in table[state * width:(state + 1) * width]:
+                if target >= 0:
+                    matrix[state][target] += 1
+        vector = list(self._ways[0])
+        while length:
+            if length & 1:
+                vector = [sum(a * b for a, b in zip(row, vector)) for row in matrix]
+            length >>= 1
+            if length:
+                columns = list(zip(*matrix))
+                matrix = [[sum(a * b for a, b in zip(row, column)) for column in columns] for row in matrix]
+        return vector[dfa._start]
+
+    def _rejected(self, length: int) -> typing.List[int]:
+        """internal function, the number of strings of length rejected from each state index and from the dead index -1"""
+        total = self._dfa._width ** length
+        return [total - ways for ways in self.ways(length)] + [total]
+
+    def sample(self, length: int, k: int = 1, rng: random.Random | None = None, accepted: bool = True) -> typing.List[typing.Tuple]:
+        """choose k strings of length uniformly at random, with replacement
+
+        Args:
+            length (int): length of strings
+            k (int, optional): the number of strings. Defaults to 1.
+            rng (random.Random | None, optional): the random generator. Defaults to None, the module random.
+            accepted (bool, optional): if False, choose from rejected strings of the alphabets of the DFA. Defaults to True.
+
+        Returns:
+            typing.List[typing.Tuple]: the strings
+        """
+        rng = random if rng is None else rng
+        dfa = self._dfa
+        table, width, symbols, dead = dfa.table, dfa._width, dfa.symbols, dfa.DEAD
+        ways = [self.ways(m) if accepted else self._rejected(m) for m in range(length + 1)]
+        if ways[length][dfa._start] == 0:
+            raise Exception(f"no string of length {length} is {'accepted' if accepted else 'rejected'}.")
+        strings = []
+        for _ in range(k):
+            state, string = dfa._start, []
+            for remaining in range(length - 1, -1, -1):
+                choice = rng.randrange(ways[remaining + 1][state])
+                for column in self._columns:
+                    target = dead if state == dead else table[state * width + column]
+                    if target == dead and accepted:
+                        continue
+                    if choice < ways[remaining][target]:
+                        break
+                    choice -= ways[remaining][target]
+                string.append(symbols[column])
+                state = target
+            strings.append(tuple(string))
+        return strings
+
+    def enumerate(self, max_length: int) -> typing.Generator:
+        """yield the accepted strings of length max_length or less, shorter first and in lexicographic order of alphabets.
+        only the branches which lead to accepted strings are visited, so each string costs O(length)"""
+        dfa = self._dfa
+        table, width, symbols = dfa.table, dfa._width, dfa.symbols
+        for length in range(max_length + 1):
+            ways = [self.ways(m) for m in range(length + 1)]
+            if not ways[length][dfa._start]:
+                continue
+            string = []
+            stack = [(dfa._start, iter(self._columns))]
+            while stack:
+                state, columns = stack[-1]
+                remaining = length - len(string)
+                if remaining == 0:
+                    yield tuple(string)
+                    stack.pop()
+                    if string:
+                        string.pop()
+                    continue
+                for column in columns:
+                    target = table[state * width + column]
+                    if target >= 0 and ways[remaining - 1][target]:
+                        string.append(symbols[column])
+                        stack.append((target, iter(self._columns)))
+                        break
+                else:
+                    stack.pop()
+                    if string:
+                        string.pop()
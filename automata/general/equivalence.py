@@ -0,0 +1,127 @@
+import typing
+from collections import deque
+from automata.general.main import Automaton, epsilon
+
+
+class Comparison(typing.NamedTuple):
+    """result of Automaton.equivalent() and Automaton.issubset(), true if the relation holds.
+    counterexample is a shortest string (tuple of alphabets) breaking it, or None if it holds."""
+    holds: bool
+    counterexample: typing.Tuple | None
+
+    def __bool__(self) -> bool:
+        return self.holds
+
+
+def _alphabets(*automata: Automaton) -> typing.List:
+    """internal function, alphabets of all automata without epsilon moves, sorted if they can be"""
+    alphabets = {alphabet for automaton in automata for alphabet in automaton.get_alphabets()
+                 if alphabet is not epsilon and alphabet != ""}
+    try:
+        return sorted(alphabets)
+    except TypeError:
+        return sorted(alphabets, key=repr)
+
+
+def _union(first: typing.Tuple, second: typing.Tuple) -> typing.Tuple:
+    """internal function, lazy DFA of the union of 2 lazy DFAs, which runs both of them together"""
+    start1, step1, final1 = first
+    start2, step2, final2 = second
+    return ((start1, start2),
+            lambda pair, alphabet: (step1(pair[0], alphabet), step2(pair[1], alphabet)),
+            lambda pair: final1(pair[0]) or final2(pair[1]))
+
+
+def _hopcroft_karp(first: typing.Tuple, second: typing.Tuple, alphabets: typing.Sequence) -> bool:
+    """internal function, check if 2 lazy DFAs accept the same strings.
+    pairs of states assumed to be equivalent are merged in union-find, so each pair is visited once at most,
+    and the states of both DFAs are made only when they are visited."""
+    start1, step1, final1 = first
+    start2, step2, final2 = second
+    parents = dict()
+
+    def find(node: typing.Tuple) -> typing.Tuple:
+        root = node
+        while (parent := parents.get(root, root)) != root:
+            root = parent
+        while node != root:
+            parents[node], node = root, parents.get(node, node)
+        return root
+
+    def merge(node1: typing.Tuple, node2: typing.Tuple) -> bool:
+        root1, root2 = find(node1), find(node2)
+        if root1 == root2:
+            return False
+        parents[root1] = root2
+        return True
+
+    queue = deque([(start1, start2)])
+    merge((0, start1), (1, start2))
+    while queue:
+        state1, state2 = queue.popleft()
+        if final1(state1) != final2(state2):
+            return False
+        for alphabet in alphabets:
+            next1, next2 = step1(state1, alphabet), step2(state2, alphabet)
+            if merge((0, next1), (1, next2)):
+                queue.append((next1, next2))
+    return True
+
+
+def _shortest(first: typing.Tuple, second: typing.Tuple, alphabets: typing.Sequence,
+              differs: typing.Callable[[bool, bool], bool]) -> typing.Tuple | None:
+    """internal function, a shortest string where differs(first accepts, second accepts), by BFS over pairs of states"""
+    start1, step1, final1 = first
+    start2, step2, final2 = second
+    start = (start1, start2)
+    parents = {start: None}
+    queue = deque([start])
+    while queue:
+        pair = queue.popleft()
+        if differs(final1(pair[0]), final2(pair[1])):
+            string = []
+            while parents[pair] is not None:
+                pair, alphabet = parents[pair]
+                string.append(alphabet)
+            return tuple(reversed(string))
+        for alphabet in alphabets:
+            following = (step1(pair[0], alphabet), step2(pair[1], alphabet))
+            if following not in parents:
+                parents[following] = (pair, alphabet)
+                queue.append(following)
+    return None
+
+
+def equivalent(first: Automaton, second: Automaton) -> Comparison:
+    """check if 2 automata accept the same strings
+
+    Args:
+        first (Automaton): DFA, NFA or E_NFA
+        second (Automaton): DFA, NFA or E_NFA
+
+    Returns:
+        Comparison: true if they are equivalent, else with a shortest string accepted by only one of them
+    """
+    alphabets = _alphabets(first, second)
+    lazy1, lazy2 = first._lazy_dfa(), second._lazy_dfa()
+    if _hopcroft_karp(lazy1, lazy2, alphabets):
+        return Comparison(True, None)
+    return Comparison(False, _shortest(lazy1, lazy2, alphabets, bool.__ne__))
+
+
+def issubset(first: Automaton, second: Automaton) -> Comparison:
+    """check if every string accepted by first is accepted by second.
+    this is first | second == second, checked by Hopcroft-Karp like equivalent()
+
+    Args:
+        first (Automaton): DFA, NFA or E_NFA
+        second (Automaton): DFA, NFA or E_NFA
+
+    Returns:
+        Comparison: true if first is a subset of second, else with a shortest string accepted by first only
+    """
+    alphabets = _alphabets(first, second)
+    lazy1, lazy2 = first._lazy_dfa(), second._lazy_dfa()
+    if _hopcroft_karp(_union(lazy1, lazy2), lazy2, alphabets):
+        return Comparison(True, None)
+    return Comparison(False, _shortest(lazy1, lazy2, alphabets, lambda accepted1, accepted2: accepted1 and not accepted2))
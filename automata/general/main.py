@@ -1,16 +1,16 @@
-import sys
-
-sys.path.append("../automata")
 from dataclasses import dataclass
 import functools
+import itertools
+import os
+import time
 import typing
 import abc
+import contextlib
+from types import MappingProxyType
 from collections import deque
-from collections.abc import Container, Collection
+from collections.abc import Container, Collection, Sequence
 from automata._helper import helper
-del sys
-
-
+from automata.general.cache import StepCache
 
 
 class Epsilon:
@@ -43,17 +43,54 @@ class Epsilon:
 epsilon = Epsilon()
 
 
-@dataclass
+class StateExplosionError(Exception):
+    """raised when a construction like NFA.makeDFAargs() exceeds its size or time cap"""
+
+
+@dataclass(frozen=True)
 class AutomatonArgs:
-    transitions: typing.Dict[typing.Any, typing.Dict]
+    """transitions, start and finals of an automaton.
+    transitions are frozen into read-only mappings (sets of states into frozensets) and finals into frozenset,
+    so tables cached by Automaton from them are always valid."""
+    transitions: typing.Mapping[typing.Any, typing.Mapping]
     start: typing.Hashable
     finals: Container
 
+    def __post_init__(self):
+        if not (isinstance(self.transitions, MappingProxyType) and
+                all(isinstance(transition, MappingProxyType) for transition in self.transitions.values())):
+            object.__setattr__(self, "transitions", MappingProxyType({
+                state: MappingProxyType({alphabet: _freeze(target) for alphabet, target in transition.items()})
+                for state, transition in self.transitions.items()}))
+        object.__setattr__(self, "finals", frozenset(self.finals))
+
+    def __reduce__(self):
+        # read-only mappings can't be pickled, so the transitions are pickled as dicts and frozen again
+        return AutomatonArgs, (_thaw(self.transitions), self.start, set(self.finals))
+
     def __repr__(self):
         return f"AutomatonArgs(transitions = {self.transitions},\nstart = {self.start},\nfinals = {self.finals})"
     __str__ = __repr__
 
 
+def _freeze(target: typing.Any) -> typing.Any:
+    """internal function, make a target of transitions immutable. {} is the empty set of NFA"""
+    if isinstance(target, (set, list, dict)):
+        return frozenset(target)
+    return target
+
+
+def _thaw(transitions: typing.Mapping) -> typing.Dict:
+    """internal function, dicts of the read-only transitions, to be pickled"""
+    return {state: dict(transition) for state, transition in transitions.items()}
+
+
+# the target of a missing transition, in mutation API
+_MISSING = object()
+# edit() updates caches for each change up to this, and drops all of them for more changes
+_MAX_INCREMENTAL_EDITS = 256
+
+
 class Automaton(abc.ABC):
 
     @typing.overload
@@ -64,26 +101,339 @@ class Automaton(abc.ABC):
     def __init__(self, args: AutomatonArgs):
         ...
 
+    @typing.overload
+    def __init__(self, core: "Core"):
+        ...
+
     def __init__(self, *args: AutomatonArgs | typing.Any):
-        if (isinstance(args[0], AutomatonArgs)):
+        if (len(args) == 1 and not isinstance(args[0], AutomatonArgs)):
+            from automata.general.core import Core
+            if not isinstance(args[0], Core):
+                raise Exception("Automaton must have 1 or 3 arguments.")
+            # the transitions are read through the views of Core, so no dict is made
+            args = self._core = args[0]
+        elif (isinstance(args[0], AutomatonArgs)):
             if (len(args) != 1):
                 raise Exception("Automaton must have 1 or 3 arguments.")
-            self._TRANSITIONS = args[0].transitions
-            self._START = args[0].start
-            self._FINALS = args[0].finals
+            args = args[0]
         else:
             if (len(args) != 3):
                 raise Exception("Automaton must have 1 or 3 arguments.")
-            self._TRANSITIONS = args[0]
-            self._START = args[1]
-            self._FINALS = args[2]
+            args = AutomatonArgs(*args)
+        self._TRANSITIONS = args.transitions
+        self._START = args.start
+        self._FINALS = args.finals
+
+    def __getstate__(self) -> typing.Dict:
+        # cached tables are made again after unpickling, and read-only transitions are pickled as dicts
+        state = self.__dict__.copy()
+        for name in self._cached_names():
+            state.pop(name, None)
+        state.pop("_rows", None)
+        if isinstance(self._TRANSITIONS, MappingProxyType):
+            state["_TRANSITIONS"] = _thaw(self._TRANSITIONS)
+        return state
+
+    def __setstate__(self, state: typing.Dict) -> None:
+        self.__dict__.update(state)
+        if isinstance(self._TRANSITIONS, dict):
+            self._TRANSITIONS = AutomatonArgs(self._TRANSITIONS, self._START, self._FINALS).transitions
+
+    def _cached_names(self) -> typing.Iterator[str]:
+        """internal function, names of the tables cached by functools.cached_property"""
+        for klass in type(self).__mro__:
+            for name, attribute in vars(klass).items():
+                if isinstance(attribute, functools.cached_property):
+                    yield name
+
+    def _invalidate(self) -> None:
+        """internal function, drop every table cached from _TRANSITIONS by functools.cached_property.
+        call it after _TRANSITIONS, _START or _FINALS is changed."""
+        for name in self._cached_names():
+            self.__dict__.pop(name, None)
+
+    def add_state(self, state: typing.Hashable) -> None:
+        """add state without transitions, do nothing if it has transitions already"""
+        if state not in self._TRANSITIONS:
+            self._set_row(state, None, (), ())
+
+    def add_transition(self, state: typing.Hashable, alphabet: typing.Hashable, target: typing.Hashable) -> None:
+        """add a transition from state by alphabet to target. for DFA, it replaces the transition by alphabet.
+        the tables cached from transitions are updated, not made again. the engines like compile() are made again when used"""
+        row = self._TRANSITIONS.get(state, {})
+        old = row.get(alphabet, _MISSING)
+        self._set_row(state, alphabet, old, self._added_target(old, target))
+
+    def remove_transition(self, state: typing.Hashable, alphabet: typing.Hashable, target: typing.Hashable = _MISSING) -> None:
+        """remove the transition from state by alphabet, or only target of it for NFA.
+        raise KeyError if there is no such transition"""
+        old = self._TRANSITIONS[state][alphabet]
+        if target is not _MISSING and target not in self._targets(old):
+            raise KeyError(target)
+        self._set_row(state, alphabet, old, _MISSING if target is _MISSING else self._removed_target(old, target))
+
+    def set_final(self, state: typing.Hashable, final: bool = True) -> None:
+        """make state final, or not final"""
+        if (state in self._FINALS) == final:
+            return
+        self._FINALS = frozenset(self._FINALS) | {state} if final else frozenset(self._FINALS) - {state}
+        self._edited(("final", state, final))
+
+    @contextlib.contextmanager
+    def edit(self) -> typing.Generator:
+        """change many transitions at once, like below:
+        with dfa.edit():
+            dfa.add_transition("q0", "2", "q1")
+            dfa.remove_transition("q1", "0")
+        the cached tables are updated once when the block ends"""
+        if self._edits is not None:
+            yield self
+            return
+        self._edits = []
+        try:
+            yield self
+        finally:
+            edits, self._edits = self._edits, None
+            if len(edits) > _MAX_INCREMENTAL_EDITS:
+                self._invalidate()
+            else:
+                for change in edits:
+                    self._update_caches(change)
+
+    _edits = None
+
+    def _added_target(self, old: typing.Any, target: typing.Hashable) -> typing.Any:
+        """internal function, the target of transitions after target is added to old"""
+        raise NotImplementedError
+
+    def _removed_target(self, old: typing.Any, target: typing.Hashable) -> typing.Any:
+        """internal function, the target of transitions after target is removed from old"""
+        raise NotImplementedError
+
+    def _set_row(self, state: typing.Hashable, alphabet: typing.Hashable, old: typing.Any, new: typing.Any) -> None:
+        """internal function, replace the target of state by alphabet with new (_MISSING removes it), and update caches.
+        _TRANSITIONS becomes a read-only view of a dict owned by this automaton, so AutomatonArgs given by users don't change.
+        each row is replaced, not changed, because rows may be shared with AutomatonArgs"""
+        rows = self.__dict__.get("_rows")
+        if rows is None:
+            rows = self._rows = dict(self._TRANSITIONS)
+            self._TRANSITIONS = MappingProxyType(rows)
+            self.__dict__.pop("_core", None)
+        new_state = state not in rows
+        row = dict(rows.get(state, {}))
+        if alphabet is not None:
+            if new is _MISSING:
+                del row[alphabet]
+            else:
+                row[alphabet] = _freeze(new)
+        rows[state] = MappingProxyType(row)
+        removed = set(self._targets(old)) if old is not _MISSING else set()
+        added = set(self._targets(new)) if new is not _MISSING else set()
+        self._edited(("row", state, alphabet, new_state, old is _MISSING, new is _MISSING, removed - added, added - removed))
+
+    def _edited(self, change: typing.Tuple) -> None:
+        """internal function, update caches for change now, or when edit() ends"""
+        if self._edits is not None:
+            self._edits.append(change)
+        else:
+            self._update_caches(change)
+
+    def _update_caches(self, change: typing.Tuple) -> None:
+        """internal function, update or drop only the cached tables which change affects.
+        change is ("final", state, final) or ("row", state, alphabet, new state, new alphabet, removed alphabet, removed targets, added targets)"""
+        cached = self.__dict__
+        dead = cached.get("_dead_states")
+        if change[0] == "final":
+            _, state, final = change
+            if dead is not None:
+                if final:
+                    self._revive(state)
+                else:
+                    del cached["_dead_states"]
+            self._forget("_sink_states", "_stop_states")
+            self._update_engines(change, dead)
+            return
+        _, state, alphabet, new_state, added_alphabet, removed_alphabet, removed, added = change
+        if new_state and "_state_set" in cached:
+            cached["_state_set"] = cached["_state_set"] | {state}
+        if "_alphabet_set" in cached:
+            if added_alphabet and alphabet is not None:
+                cached["_alphabet_set"] = cached["_alphabet_set"] | {alphabet}
+            elif removed_alphabet:
+                del cached["_alphabet_set"]
+        predecessors = cached.get("_predecessors")
+        if predecessors is not None:
+            for target in added:
+                predecessors.setdefault(target, set()).add(state)
+            if removed:
+                remaining = {successor for target in self._TRANSITIONS[state].values() for successor in self._targets(target)}
+                for target in removed - remaining:
+                    predecessors[target].discard(state)
+        if dead is not None:
+            if removed:
+                del cached["_dead_states"]
+            else:
+                # new states are dead until they reach a final, and a target without transitions is dead unless it is final
+                newly_dead = {target for target in added if target not in self._TRANSITIONS and target not in self._FINALS}
+                if new_state and state not in self._FINALS:
+                    newly_dead.add(state)
+                cached["_dead_states"] = dead | newly_dead
+                if any(target not in cached["_dead_states"] for target in added):
+                    self._revive(state)
+        self._forget("_sink_states", "_stop_states")
+        self._update_engines(change, dead)
+
+    def _revive(self, state: typing.Hashable) -> None:
+        """internal function, state can reach a final now, so remove it and the dead states reaching it from _dead_states"""
+        dead = self.__dict__["_dead_states"]
+        if state not in dead:
+            return
+        revived = {state}
+        stack = [state]
+        predecessors = self._predecessors
+        while stack:
+            for source in predecessors.get(stack.pop(), ()):
+                if source in dead and source not in revived:
+                    revived.add(source)
+                    stack.append(source)
+        self.__dict__["_dead_states"] = dead - revived
+
+    def _update_engines(self, change: typing.Tuple, dead: typing.FrozenSet | None) -> None:
+        """internal function, update the engines made from transitions, like the compiled table"""
+        self._forget("_searcher", "_batch_engine")
+
+    def _forget(self, *names: str) -> None:
+        """internal function, drop cached tables of names"""
+        for name in names:
+            self.__dict__.pop(name, None)
 
-    def get_states(self) -> typing.Set[typing.Hashable]:
+    @functools.cached_property
+    def _state_set(self) -> typing.FrozenSet[typing.Hashable]:
+        """internal table, all states which have transitions"""
+        return frozenset(self._TRANSITIONS)
+
+    @functools.cached_property
+    def _alphabet_set(self) -> typing.FrozenSet[typing.Hashable]:
+        """internal table, all alphabets used in transitions"""
+        return frozenset(alphabet for transition in self._TRANSITIONS.values() for alphabet in transition)
+
+    @functools.cached_property
+    def _predecessors(self) -> typing.Dict[typing.Hashable, typing.Set[typing.Hashable]]:
+        """internal table, reverse edges, the states which move to each state by some alphabet"""
+        predecessors = dict()
+        for state, transition in self._TRANSITIONS.items():
+            for target in transition.values():
+                for successor in self._targets(target):
+                    predecessors.setdefault(successor, set()).add(state)
+        return predecessors
+
+    def _targets(self, target: typing.Any) -> typing.Iterable:
+        """internal function, the states in a target of transitions"""
+        raise NotImplementedError
+
+    @functools.cached_property
+    def _dead_states(self) -> typing.FrozenSet[typing.Hashable]:
+        """internal table, the states which can't reach any final, found backward from finals by reverse edges"""
+        states = {self._START, *self._TRANSITIONS}
+        for transition in self._TRANSITIONS.values():
+            for target in transition.values():
+                states.update(self._targets(target))
+        living = {state for state in self._FINALS if state in states}
+        stack = list(living)
+        predecessors = self._predecessors
+        while stack:
+            for state in predecessors.get(stack.pop(), ()):
+                if state not in living:
+                    living.add(state)
+                    stack.append(state)
+        return frozenset(states - living)
+
+    @functools.cached_property
+    def _sink_states(self) -> typing.FrozenSet[typing.Hashable]:
+        """internal table, the finals from which every string of known alphabets is accepted"""
+        raise NotImplementedError
+
+    def dead_states(self) -> typing.FrozenSet[typing.Hashable]:
+        """get the states from which no string is accepted. a run entering them is stopped as rejected"""
+        return self._dead_states
+
+    def sink_states(self) -> typing.FrozenSet[typing.Hashable]:
+        """get the finals from which every string of get_alphabets() is accepted.
+        a run entering them only checks that the rest of the string has no unknown alphabet"""
+        return self._sink_states
+
+    def equivalent(self, other: "Automaton | AutomatonArgs") -> "Comparison":
+        """check if other accepts the same strings as this, by Hopcroft-Karp over the states reachable from the starts.
+        NFA and E_NFA are determinized on the fly, so no DFA is made in whole. like below:
+        result = new_dfa.equivalent(old_dfa)
+        if not result:
+            print(result.counterexample)
+
+        Args:
+            other (Automaton | AutomatonArgs): DFA, NFA or E_NFA. AutomatonArgs is read as DFA if this is DFA or its targets are states,
+                else as NFA, or E_NFA if it has epsilon moves
+
+        Returns:
+            Comparison: true if they are equivalent, else with a shortest string accepted by only one of them
+        """
+        from automata.general.equivalence import equivalent
+        return equivalent(self, self._same_kind(other))
+
+    def issubset(self, other: "Automaton | AutomatonArgs") -> "Comparison":
+        """check if every string accepted by this is accepted by other
+
+        Args:
+            other (Automaton | AutomatonArgs): DFA, NFA or E_NFA. AutomatonArgs is read as DFA if this is DFA or its targets are states,
+                else as NFA, or E_NFA if it has epsilon moves
+
+        Returns:
+            Comparison: true if this is a subset of other, else with a shortest string accepted by this only
+        """
+        from automata.general.equivalence import issubset
+        return issubset(self, self._same_kind(other))
+
+    def _same_kind(self, other: "Automaton | AutomatonArgs") -> "Automaton":
+        """internal function, make other an automaton if it is AutomatonArgs.
+        it is DFA if this is DFA or its targets are states, else NFA, or E_NFA if it has epsilon moves.
+        engines like BitsetNFA can't be made from AutomatonArgs, so type(self) is not used"""
+        if not isinstance(other, AutomatonArgs):
+            return other
+        if isinstance(self, DFA):
+            return DFA(other)
+        targets = [target for transition in other.transitions.values() for target in transition.values()]
+        if targets and not any(isinstance(target, frozenset) for target in targets):
+            return DFA(other)
+        if any(alphabet is epsilon or alphabet == "" for transition in other.transitions.values() for alphabet in transition):
+            return E_NFA(other)
+        return NFA(other)
+
+    def _lazy_dfa(self) -> typing.Tuple[typing.Hashable, typing.Callable, typing.Callable]:
+        """internal function, (start, step(state, alphabet), is_final(state)) of a DFA accepting the same strings,
+        whose states are made when step is called"""
+        raise NotImplementedError
+
+    # the state of _lazy_dfa() which never reaches a final, and moves to itself by every alphabet
+    _lazy_dead = None
+
+    def core(self, symbols: "SymbolTable | None" = None) -> "Core":
+        """make compact immutable transitions of this automaton, to keep many automata in memory.
+        the automaton made from it, like DFA(dfa.core()), reads the arrays through views
+
+        Args:
+            symbols (SymbolTable | None, optional): the table of alphabets. Defaults to None, shared by all Cores.
+
+        Returns:
+            Core: the transitions as arrays of ints
+        """
+        from automata.general.core import Core
+        return Core(AutomatonArgs(self._TRANSITIONS, self._START, self._FINALS), isinstance(self, DFA), symbols)
+
+    def get_states(self) -> typing.FrozenSet[typing.Hashable]:
         """get all states in this automaton"""
-        return set(self._TRANSITIONS.keys())
+        return self._state_set
 
-    def get_alphabets(self) -> typing.Set[typing.Hashable]:
-        return {alphabet for transition in self._TRANSITIONS.values() for alphabet in transition.keys()}
+    def get_alphabets(self) -> typing.FrozenSet[typing.Hashable]:
+        return self._alphabet_set
 
     def accept(self, string: Collection) -> bool:
         """judge if the string is accepted
@@ -101,6 +451,119 @@ class Automaton(abc.ABC):
             return helper._any_in(end, self._FINALS)
         raise Exception("The final state is not a container or a string.")
 
+    def accept_many(self, strings: typing.Iterable[Collection], workers: int = 1, chunksize: int = 1024, share_prefixes: bool = False) -> bytearray:
+        """judge each string, streaming strings in chunks.
+        with workers > 1, the automaton (compiled one for DFA and NFA) is sent to each worker process once,
+        and only the chunks of strings are sent after that.
+        with share_prefixes, the strings are sorted and the states after a common prefix are reused by the next strings,
+        which pays for many strings with long common prefixes, like URLs or keys in the same namespace. like below:
+        nfa.accept_many(urls, share_prefixes=True)
+        a string with an alphabet which has no transition is rejected, 0 in results.
+        for DFA, this differs from DFA.accept, which raises KeyError for it, because DFA runs on the compiled table here
+
+        Args:
+            strings (typing.Iterable[Collection]): strings to be judged, can be a long iterator
+            workers (int, optional): the number of worker processes. Defaults to 1.
+            chunksize (int, optional): the number of strings sent to a worker at once. Defaults to 1024.
+            share_prefixes (bool, optional): run each common prefix once, all strings are kept in memory. Defaults to False.
+
+        Returns:
+            bytearray: results[i] is 1 if i-th string is accepted, else 0
+        """
+        from automata.general.batch import accept_many
+        return accept_many(self._batch_engine, strings, workers=workers, chunksize=chunksize, share_prefixes=share_prefixes)
+
+    def finditer(self, text: Sequence, all_ends: bool = False) -> typing.Generator:
+        """yield (start, end) of the substrings of text accepted by this automaton.
+        ends are found by one forward pass and starts by one backward pass, instead of running from every position.
+
+        Args:
+            text (Sequence): the text to be searched
+            all_ends (bool, optional): if False, yield leftmost-longest matches which don't overlap, like re.finditer.
+                if True, yield a match for every end with its leftmost start. Defaults to False.
+        """
+        return self._searcher.finditer(text, all_ends=all_ends)
+
+    def search(self, text: Sequence) -> typing.Tuple[int, int] | None:
+        """get (start, end) of the leftmost-longest substring of text accepted by this automaton
+
+        Args:
+            text (Sequence): the text to be searched
+
+        Returns:
+            typing.Tuple[int, int] | None: the span of the match, or None if there is no match
+        """
+        return self._searcher.search(text)
+
+    def trace(self, tracer: "Tracer | None" = None) -> "Tracer":
+        """start recording the runs of accept and trans. untraced automata run without any check for this
+
+        Args:
+            tracer (Tracer | None, optional): the tracer to record in, can be shared by automata. Defaults to None, a new one.
+
+        Returns:
+            Tracer: the tracer recording the runs
+        """
+        from automata.general.trace import Tracer
+        if tracer is None:
+            tracer = Tracer()
+        tracer.attach(self)
+        return tracer
+
+    def untrace(self) -> None:
+        """stop recording the runs"""
+        from automata.general.trace import Tracer
+        Tracer.detach(self)
+
+    @contextlib.contextmanager
+    def tracing(self, tracer: "Tracer | None" = None) -> typing.Generator:
+        """record the runs of accept and trans in the with block, like below:
+        with dfa.tracing() as tracer:
+            dfa.accept("0101")
+        """
+        tracer = self.trace(tracer)
+        try:
+            yield tracer
+        finally:
+            self.untrace()
+
+    def _trace_states(self, current: typing.Any) -> typing.Collection:
+        """internal function, the states in an item yielded by trans, used by Tracer"""
+        return () if current is None else (current,)
+
+    def log_trans(self, string: Collection) -> typing.Generator:
+        """log the process of translation to the logger "automata" at DEBUG level, and yield same as trans.
+        to aggregate the steps, use trace() instead
+
+        Args:
+            string (Collection): the string to be translated
+        """
+        import logging
+        logger = logging.getLogger("automata")
+        # the alphabets are recorded as trans reads them, so string can be an iterator
+        read = []
+        steps = self.trans(helper._recorded(string, read))
+        current = next(steps)
+        yield current
+        for following in steps:
+            logger.debug("%s --%s--> %s", current, read.pop(), following)
+            current = following
+            yield current
+
+    @property
+    def _searcher(self) -> "Searcher":
+        """internal property, the Searcher used by finditer and search"""
+        raise NotImplementedError
+
+    @property
+    def _batch_engine(self) -> "Automaton":
+        """internal property, the automaton used by accept_many"""
+        return self
+
+    def _accept_list(self, strings: typing.List[Collection]) -> bytearray:
+        """internal function, judge a chunk of strings for accept_many, results[i] is 1 if i-th string is accepted"""
+        return bytearray(map(self.accept, strings))
+
     @abc.abstractmethod
     def trans(self, string: Collection) -> typing.Generator:
         """get the final state of the string
@@ -122,30 +585,443 @@ class DFA(Automaton):
     start = "q0"
     accept = {"q0"}
     dfa = DFA(transitions, start, accept)
+    accept and accept_many can run on another engine, like below:
+    dfa = DFA(transitions, start, accept, backend="auto")
     """
 
+    # the name of the backend running accept and accept_many, None for the default
+    _backend = None
+
+    def __init__(self, *args: AutomatonArgs | typing.Any, backend: str | None = None):
+        """same as Automaton, and
+
+        Args:
+            backend (str | None, optional): the engine running accept and accept_many, a name of backends.available_backends(),
+                or "auto" for the fastest one. the modules of it are imported when it is first used.
+                with an engine other than "reference", accept returns False for unknown alphabets instead of raising KeyError.
+                Defaults to None, accept runs on the dicts and accept_many on the compiled table.
+        """
+        super().__init__(*args)
+        if backend is not None:
+            from automata.general.backends import resolve
+            self._backend = resolve(backend)
+
+    @functools.cached_property
+    def _engine(self) -> "DFA":
+        """internal table, the engine of the backend, this DFA itself by default, or the arrays of Core for DFA(core)"""
+        if self._backend is None:
+            if "_core" not in self.__dict__:
+                return self
+            # a DFA made from Core steps on the arrays of Core, a row view for each step would be slow
+            from automata.general.core import _CoreEngine
+            return _CoreEngine(self)
+        from automata.general.backends import make_engine
+        return make_engine(self._backend, self)
+
     def trans(self, string: Collection) -> typing.Generator:
+        """yield the state after each alphabet. after entering a dead state, yield None for the rest without moving on"""
+        transitions, dead = self._TRANSITIONS, self._dead_states
         current = self._START
         yield current
         for alphabet in string:
-            current = self._TRANSITIONS[current][alphabet]
+            if current is not None:
+                current = transitions[current][alphabet]
+                if current in dead:
+                    current = None
             yield current
 
+    def _targets(self, target: typing.Hashable) -> typing.Iterable:
+        return () if target is None else (target,)
+
+    @functools.cached_property
+    def _sink_states(self) -> typing.FrozenSet[typing.Hashable]:
+        # finals which move to sinks by every alphabet, the greatest such set is found by removing the others
+        alphabets = self._alphabet_set
+        sinks = {state for state in self._FINALS if state in self._TRANSITIONS}
+        changed = True
+        while changed:
+            changed = False
+            for state in list(sinks):
+                transition = self._TRANSITIONS[state]
+                if any(transition.get(alphabet) not in sinks for alphabet in alphabets):
+                    sinks.discard(state)
+                    changed = True
+        return frozenset(sinks)
+
+    def _added_target(self, old: typing.Any, target: typing.Hashable) -> typing.Hashable:
+        return target
+
+    def _removed_target(self, old: typing.Any, target: typing.Hashable) -> typing.Any:
+        return _MISSING
+
+    def _update_engines(self, change: typing.Tuple, dead: typing.FrozenSet | None) -> None:
+        # the compiled table may be held by MultiDFA, Matcher or a running accept_stream, so it is made again when used
+        self._forget("_searcher", "_vector", "_language", "_engine", "_compiled")
+
+    def _lazy_dfa(self) -> typing.Tuple[typing.Hashable, typing.Callable, typing.Callable]:
+        # missing transitions and dead states are all None
+        transitions, dead, finals = self._TRANSITIONS, self._dead_states, self._FINALS
+
+        def step(state: typing.Hashable, alphabet: typing.Hashable) -> typing.Hashable:
+            transition = transitions.get(state)
+            following = None if transition is None else transition.get(alphabet)
+            return None if following in dead else following
+        return (None if self._START in dead else self._START), step, finals.__contains__
+
+    @functools.cached_property
+    def _stop_states(self) -> typing.FrozenSet[typing.Hashable]:
+        """internal table, the states where accept stops, dead states, sinks and None"""
+        return self._dead_states | self._sink_states | {None}
+
+    def accept(self, string: Collection) -> bool:
+        """judge if the string is accepted.
+        unlike Automaton.accept, the state of DFA is compared as is, so states don't need to be strings.
+        the run stops as soon as it enters a dead state or a sink
+
+        Args:
+            string (Collection): the string to be judged
+
+        Returns:
+            bool: is accepted
+        """
+        engine = self._engine
+        if engine is not self:
+            return engine.accept(string)
+        transitions, stop = self._TRANSITIONS, self._stop_states
+        current = self._START
+        alphabets = iter(string)
+        if current not in stop:
+            for alphabet in alphabets:
+                current = transitions[current][alphabet]
+                if current in stop:
+                    break
+            else:
+                return current in self._FINALS
+        if current in self._sink_states:
+            return self._rest_known(current, alphabets)
+        return False
+
+    def _rest_known(self, sink: typing.Hashable, alphabets: typing.Iterator) -> bool:
+        """internal function, the rest of the string from a sink is accepted if it has no unknown alphabet.
+        an unknown alphabet fails in the same way as moving on by it"""
+        for alphabet in itertools.filterfalse(self._alphabet_set.__contains__, alphabets):
+            raise KeyError(alphabet)
+        return True
+
+    @functools.cached_property
+    def _compiled(self) -> "CompiledDFA":
+        """internal table, compile() of this DFA, computed once"""
+        return self.compile()
+
+    @property
+    def _batch_engine(self) -> "DFA":
+        return self._compiled if self._backend is None else self._engine
+
+    @functools.cached_property
+    def _searcher(self) -> "Searcher":
+        from automata.general.search import Searcher
+        return Searcher(self._compiled)
+
+    @functools.cached_property
+    def _vector(self) -> "VectorDFA":
+        from automata.general.vector import VectorDFA
+        return VectorDFA(self._compiled)
+
+    def accept_array(self, rows: typing.Any, pad: int | None = None) -> typing.Any:
+        """judge many strings of the same length together, by the compiled table.
+        with NumPy, rows is an (N, L) array of ints and all N strings move on one column at a time
+
+        Args:
+            rows (typing.Any): (N, L) array of ints like uint8 or int32, or a sequence of bytes without NumPy
+            pad (int | None, optional): the int padding shorter strings, which moves every state to itself. Defaults to None.
+
+        Returns:
+            typing.Any: bool array with NumPy, else bytearray. results[i] is true if i-th string is accepted
+        """
+        return self._vector.accept(rows, pad)
+
+    @functools.cached_property
+    def _language(self) -> "Language":
+        from automata.general.counting import Language
+        return Language(self._compiled)
+
+    def count(self, length: int) -> int:
+        """get the number of accepted strings of length, by DP over the compiled table (or matrix power for long length)
+
+        Args:
+            length (int): length of strings
+
+        Returns:
+            int: the number of accepted strings
+        """
+        return self._language.count(length)
+
+    def sample(self, length: int, k: int = 1, rng: "random.Random | None" = None, accepted: bool = True) -> typing.List[typing.Tuple]:
+        """choose k accepted strings of length uniformly at random, like below:
+        dfa.sample(8, 3, rng=random.Random(0))  # [("0", "1", ...), ...]
+
+        Args:
+            length (int): length of strings
+            k (int, optional): the number of strings. Defaults to 1.
+            rng (random.Random | None, optional): the random generator. Defaults to None, the module random.
+            accepted (bool, optional): if False, choose rejected strings of get_alphabets() instead. Defaults to True.
+
+        Returns:
+            typing.List[typing.Tuple]: the strings as tuples of alphabets
+        """
+        return self._language.sample(length, k, rng=rng, accepted=accepted)
+
+    def enumerate(self, max_length: int) -> typing.Generator:
+        """yield the accepted strings of max_length or less as tuples of alphabets, shorter first and in lexicographic order
+
+        Args:
+            max_length (int): the longest length
+        """
+        return self._language.enumerate(max_length)
+
+    def matcher(self) -> "Matcher":
+        """make a resumable matcher, which can be fed the string chunk by chunk.
+        bytes, bytearray, memoryview and mmap chunks are read without copying.
+
+        Returns:
+            Matcher: matcher at the start state
+        """
+        from automata.general.stream import Matcher
+        return Matcher(self._compiled)
+
+    def accept_file(self, path: typing.Union[str, os.PathLike]) -> bool:
+        """judge if the content of a file is accepted. the file is mapped with mmap, so it is not loaded into memory at once
+
+        Args:
+            path (typing.Union[str, os.PathLike]): path of the file
+
+        Returns:
+            bool: is accepted
+        """
+        from automata.general.stream import match_file
+        return match_file(self._compiled, path).is_accepting()
+
+    async def accept_stream(self, source: typing.Union["asyncio.StreamReader", typing.AsyncIterable],
+                            yield_every: int = 65536, chunksize: int = 65536, early_exit: bool = True) -> bool:
+        """judge the string coming from asyncio.StreamReader or async iterator of chunks, like below:
+        accepted = await dfa.accept_stream(reader)
+        the event loop gets control after every yield_every alphabets, and reading stops as soon as the result is decided.
+
+        Args:
+            source (typing.Union[asyncio.StreamReader, typing.AsyncIterable]): StreamReader, or async iterator of chunks
+            yield_every (int, optional): give control back to the event loop after this many alphabets. Defaults to 65536.
+            chunksize (int, optional): the number of bytes read from StreamReader at once. Defaults to 65536.
+            early_exit (bool, optional): stop reading in an accepting sink too, not only in a dead state. Defaults to True.
+
+        Returns:
+            bool: is accepted
+        """
+        from automata.general.stream import accept_stream
+        return await accept_stream(self._compiled, source, yield_every=yield_every, chunksize=chunksize, early_exit=early_exit)
+
+    def compress(self) -> "ClassDFA":
+        """make a DFA running on symbol classes and a sparse (CSR) table, for large alphabets.
+        alphabets which move every state to the same state are one class, and only existing transitions are stored.
+
+        Returns:
+            ClassDFA: compressed DFA, with the same API as DFA
+        """
+        from automata.general.classes import ClassDFA
+        return ClassDFA(self._TRANSITIONS, self._START, self._FINALS)
+
+    def save(self, path: typing.Union[str, os.PathLike]) -> None:
+        """write the compiled table of this DFA to path in a versioned binary format, which DFA.load() reads.
+        states and alphabets are pickled, so they must be picklable.
+
+        Args:
+            path (typing.Union[str, os.PathLike]): path of the file
+        """
+        from automata.general.serialize import save
+        save(self._compiled, path)
+
+    @staticmethod
+    def load(path: typing.Union[str, os.PathLike], mmap: bool = True) -> "CompiledDFA":
+        """read a DFA written by DFA.save(). don't load untrusted files, because states and alphabets are unpickled.
+
+        Args:
+            path (typing.Union[str, os.PathLike]): path of the file
+            mmap (bool, optional): map the file and run on the table in it without copying,
+                so many processes loading the same file share one physical copy. Defaults to True.
+
+        Returns:
+            CompiledDFA: the DFA
+        """
+        from automata.general.serialize import load
+        return load(path, use_mmap=mmap)
+
+    def compile(self) -> "CompiledDFA":
+        """map states and alphabets to dense integers and make a DFA running on a flat transition table.
+        the result has the same API as DFA, and accept() runs without any generator.
+
+        Returns:
+            CompiledDFA: compiled DFA, which also exposes state_index and symbol_index
+        """
+        from automata.general.compiled import CompiledDFA
+        return CompiledDFA(self._TRANSITIONS, self._START, self._FINALS)
+
     def shrinked(self) -> AutomatonArgs:
-        "remove unreachable states and dead states from transitions"
+        """remove unreachable states and dead states from transitions.
+        dead states are the states which can't reach any final, found backward from finals by reverse edges.
+        transitions to removed states become None. the start state is always kept."""
         queue = deque()
         queue.append(self._START)
         rechable_states = {self._START}
         while len(queue):
-            for state in self._TRANSITIONS[queue.popleft()].values():
+            for state in self._TRANSITIONS.get(queue.popleft(), {}).values():
                 if state != None and state not in rechable_states:
                     queue.append(state)
                     rechable_states.add(state)
+        queue.extend(state for state in self._FINALS if state in rechable_states)
+        living_states = set(queue)
+        predecessors = self._predecessors
+        while len(queue):
+            for state in predecessors.get(queue.popleft(), ()):
+                if state in rechable_states and state not in living_states:
+                    queue.append(state)
+                    living_states.add(state)
+        living_states.add(self._START)
         return AutomatonArgs(
-            transitions={state: self._TRANSITIONS[state]
-                         for state in rechable_states},
+            transitions={state: {alphabet: target if target in living_states else None
+                                 for alphabet, target in transition.items()}
+                         for state, transition in self._TRANSITIONS.items() if state in living_states},
             start=self._START,
-            finals={state for state in self._FINALS if state in rechable_states}
+            finals={state for state in self._FINALS if state in living_states}
+        )
+
+    def union(self, other: "DFA | AutomatonArgs") -> AutomatonArgs:
+        """make a AutomatonArgs of DFA accepting the strings accepted by this DFA or other, by product construction"""
+        from automata.general.multi import product
+        return product([self, other], lambda accepting: bool(accepting))
+
+    def intersection(self, other: "DFA | AutomatonArgs") -> AutomatonArgs:
+        """make a AutomatonArgs of DFA accepting the strings accepted by both this DFA and other, by product construction"""
+        from automata.general.multi import product
+        return product([self, other], lambda accepting: len(accepting) == 2)
+
+    def difference(self, other: "DFA | AutomatonArgs") -> AutomatonArgs:
+        """make a AutomatonArgs of DFA accepting the strings accepted by this DFA but not by other, by product construction"""
+        from automata.general.multi import product
+        return product([self, other], lambda accepting: accepting == {0})
+
+    def complement(self, alphabets: typing.Iterable = ()) -> AutomatonArgs:
+        """make a AutomatonArgs of DFA accepting the strings not accepted by this DFA.
+        the complement is taken over the alphabets of this DFA and alphabets, and missing transitions go to an explicit dead state.
+
+        Args:
+            alphabets (typing.Iterable, optional): alphabets added to the alphabets of this DFA. Defaults to ().
+        """
+        from automata.general.multi import product
+        return product([self], lambda accepting: not accepting, alphabets)
+
+    def minimized(self) -> AutomatonArgs:
+        """make a AutomatonArgs of the minimal DFA accepting the same language, by Hopcroft's algorithm.
+        unreachable states are removed by shrinked() first. missing transitions and None transitions go to an implicit dead state,
+        and transitions to it are kept missing (or None) in the result. each state of the result is the first state of its class in the order of transitions.
+
+        Returns:
+            AutomatonArgs: the args of minimal DFA
+        """
+        shrinked = self.shrinked()
+        states = [state for state in self._TRANSITIONS if state in shrinked.transitions]
+        # the start and the targets without transitions are states too, and all of their transitions are missing
+        index = {state: i for i, state in enumerate(states)}
+        for state in itertools.chain((shrinked.start,), (target for transition in shrinked.transitions.values() for target in transition.values())):
+            if state is not None and state not in index:
+                index[state] = len(states)
+                states.append(state)
+        rows = {state: shrinked.transitions.get(state, {}) for state in states}
+        alphabets = list({alphabet: None for transition in shrinked.transitions.values() for alphabet in transition})
+        sink = len(states)
+        successors = [[sink] * len(alphabets) for _ in range(sink + 1)]
+        inverses = [[[] for _ in range(sink + 1)] for _ in alphabets]
+        for c, alphabet in enumerate(alphabets):
+            inverse = inverses[c]
+            for i, state in enumerate(states):
+                target = rows[state].get(alphabet)
+                t = sink if target is None else index[target]
+                successors[i][c] = t
+                inverse[t].append(i)
+            inverse[sink].append(sink)
+
+        # partition refinement: block b is elements[first[b]:last[b]], and its first marked[b] elements are marked
+        finals = [i for i, state in enumerate(states) if state in shrinked.finals]
+        others = [i for i, state in enumerate(states) if state not in shrinked.finals] + [sink]
+        elements = finals + others
+        location = [0] * (sink + 1)
+        for position, i in enumerate(elements):
+            location[i] = position
+        block_of = [0] * (sink + 1)
+        first, last, marked = [0], [len(finals)], [0]
+        if finals:
+            first.append(len(finals))
+            last.append(len(elements))
+            marked.append(0)
+            for i in others:
+                block_of[i] = 1
+        else:
+            last[0] = len(elements)
+        smaller = 0 if len(first) == 1 or len(finals) <= len(others) else 1
+        waiting = [(smaller, c) for c in range(len(alphabets))]
+        while waiting:
+            splitter, c = waiting.pop()
+            inverse = inverses[c]
+            touched = []
+            for t in elements[first[splitter]:last[splitter]]:
+                for i in inverse[t]:
+                    b = block_of[i]
+                    position = location[i]
+                    mark = first[b] + marked[b]
+                    if position < mark:
+                        continue
+                    other = elements[mark]
+                    elements[mark], elements[position] = i, other
+                    location[i], location[other] = mark, position
+                    if marked[b] == 0:
+                        touched.append(b)
+                    marked[b] += 1
+            for b in touched:
+                count, marked[b] = marked[b], 0
+                size = last[b] - first[b]
+                if count == size:
+                    continue
+                # the smaller part becomes the new block, so each state is relabeled O(log n) times
+                new = len(first)
+                if count <= size - count:
+                    first.append(first[b])
+                    last.append(first[b] + count)
+                    first[b] += count
+                else:
+                    first.append(first[b] + count)
+                    last.append(last[b])
+                    last[b] = first[b] + count
+                marked.append(0)
+                for i in elements[first[new]:last[new]]:
+                    block_of[i] = new
+                waiting.extend((new, c) for c in range(len(alphabets)))
+
+        representative = [None] * len(first)
+        for i in range(sink - 1, -1, -1):
+            representative[block_of[i]] = states[i]
+        transitions = dict()
+        for b, state in enumerate(representative):
+            # a class of states without transitions stays without transitions
+            if state is None or state not in shrinked.transitions:
+                continue
+            transition = dict()
+            for c, alphabet in enumerate(alphabets):
+                target = representative[block_of[successors[index[state]][c]]]
+                if target is not None or alphabet in rows[state]:
+                    transition[alphabet] = target
+            transitions[state] = transition
+        return AutomatonArgs(
+            transitions=transitions,
+            start=representative[block_of[index[self._START]]],
+            finals={representative[block_of[index[state]]] for state in shrinked.finals}
         )
 
 
@@ -164,46 +1040,242 @@ class NFA(Automaton):
     finals = {"q1", "q2", "q3", "q4", "q5"}
     a = NFA(transitions, start, finals)
     """
-    # for cachrise, return tuple
-    @functools.lru_cache(maxsize=None)
+
+    def __init__(self, *args: AutomatonArgs | typing.Any, step_cache_size: int | None = 4096):
+        """same as Automaton, and
+
+        Args:
+            step_cache_size (int | None, optional): maxsize of step_cache, None means unbounded. Defaults to 4096.
+        """
+        super().__init__(*args)
+        self.step_cache = StepCache(step_cache_size)
+
+    def _invalidate(self) -> None:
+        super()._invalidate()
+        self.step_cache.clear()
+
+    def _targets(self, target: typing.Iterable) -> typing.Iterable:
+        return target
+
     def trans(self, string: Collection) -> typing.Generator:
         current = self._START
         yield current
+        current = self._start_set()
         for alphabet in string:
-            current = self._moveon(alphabet, current)
+            current = self._step(current, alphabet, prune=False)
             yield current
 
-    def log_trans(self, string: Collection) -> typing.Generator:
-        """log the process of translation
+    def accept(self, string: Collection) -> bool:
+        """judge if the string is accepted.
+        dead states are dropped from the sets of states, so the run stops when the set gets empty,
+        and it stops when the set contains a sink too
+
         Args:
-            string (Collection): the string to be translated
+            string (Collection): the string to be judged
+
+        Returns:
+            bool: is accepted
         """
-        current = self._START
-        yield current
-        for alphabet in string:
-            print(current, f" --{alphabet}--> ", end="")
-            current = self._moveon(alphabet, current)
-            print(current)
-            yield current
+        current = self._start_set()
+        sinks = self._sink_states
+        alphabets = iter(string)
+        if not sinks:
+            for alphabet in alphabets:
+                current = self._step(current, alphabet)
+                if not current:
+                    return False
+            return not current.isdisjoint(self._FINALS)
+        if current.isdisjoint(sinks):
+            for alphabet in alphabets:
+                current = self._step(current, alphabet)
+                if not current:
+                    return False
+                if not current.isdisjoint(sinks):
+                    break
+            else:
+                return not current.isdisjoint(self._FINALS)
+        return self._alphabet_set.issuperset(alphabets)
+
+    @functools.cached_property
+    def _sink_states(self) -> typing.FrozenSet[typing.Hashable]:
+        # finals which move to some sink by every alphabet, the greatest such set is found by removing the others
+        alphabets = [alphabet for alphabet in self._alphabet_set if alphabet is not epsilon and alphabet != ""]
+        sinks = {state for state in self._FINALS if state in self._TRANSITIONS}
+        following = {(state, alphabet): frozenset(self._closure(self._moveon(alphabet, (state,))))
+                     for state in sinks for alphabet in alphabets}
+        changed = True
+        while changed:
+            changed = False
+            for state in list(sinks):
+                if any(following[state, alphabet].isdisjoint(sinks) for alphabet in alphabets):
+                    sinks.discard(state)
+                    changed = True
+        return frozenset(sinks)
+
+    def _added_target(self, old: typing.Any, target: typing.Hashable) -> typing.FrozenSet:
+        return frozenset(() if old is _MISSING else old) | {target}
+
+    def _removed_target(self, old: typing.Any, target: typing.Hashable) -> typing.FrozenSet:
+        return frozenset(old) - {target}
+
+    def _update_engines(self, change: typing.Tuple, dead: typing.FrozenSet | None) -> None:
+        # cached steps from the sets without the changed state are still right, unless dead states have changed
+        super()._update_engines(change, dead)
+        if change[0] == "final":
+            if dead is not None and self.__dict__.get("_dead_states") is not dead:
+                self.step_cache.clear()
+        elif (dead is None or self.__dict__.get("_dead_states") is not dead or change[2] is epsilon or change[2] == ""):
+            self.step_cache.clear()
+        else:
+            state = change[1]
+            self.step_cache.discard(lambda key: state in key[0])
+
+    _lazy_dead = frozenset()
+
+    def _lazy_dfa(self) -> typing.Tuple[typing.Hashable, typing.Callable, typing.Callable]:
+        # subset construction on the fly, through step_cache
+        finals = self._FINALS
+        return self._start_set(), self._step, lambda current: not current.isdisjoint(finals)
+
+    def _start_set(self) -> typing.FrozenSet:
+        """internal function, the set of states before reading any alphabet"""
+        return frozenset((self._START,))
+
+    def _step(self, current: typing.FrozenSet, alphabet: typing.Hashable, prune: bool = True) -> typing.FrozenSet:
+        """internal function, move on to next states through step_cache
+
+        Args:
+            current (typing.FrozenSet): current states
+            alphabet (typing.Hashable): next alphabet
+            prune (bool, optional): if True, dead states are dropped from next states. trans keeps them. Defaults to True.
+
+        Returns:
+            typing.FrozenSet: next states
+        """
+        key = (current, alphabet, prune)
+        following = self.step_cache.get(key)
+        if following is None:
+            following = frozenset(self._closure(self._moveon(alphabet, current)))
+            if prune:
+                following -= self._dead_states
+            self.step_cache.put(key, following)
+        return following
+
+    def _closure(self, states: typing.Iterable) -> typing.Set:
+        """internal function, the states reachable by epsilon moves from states. NFA has no epsilon moves"""
+        return set(states)
+
+    def _trace_states(self, current: typing.Any) -> typing.Collection:
+        # trans yields the start state itself first, and sets of states after that
+        return current if isinstance(current, (set, frozenset)) else frozenset((current,))
+
+    def makeDFAargs(self, max_states: int | None = None, timeout: float | None = None) -> typing.Tuple[AutomatonArgs, typing.Dict[int, typing.FrozenSet]]:
+        """make a AutomatonArgs of DFA from this NFA
+        DFA is made by subset construction algorithm, visiting only subsets reachable from the start.
+        each DFA state is an int and the empty subset is kept as a dead state, so the DFA is total over get_alphabets().
+
+        Args:
+            max_states (int | None, optional): raise StateExplosionError if the DFA gets more states than this. Defaults to None.
+            timeout (float | None, optional): raise StateExplosionError if the construction takes more seconds than this. Defaults to None.
 
-    # Fix: has bug, I think this bug is because of helper._bit_search()
-    def makeDFAargs(self) -> AutomatonArgs:
-        """ Not Implemented, Don't use it
-        make a AutomatonArgs of DFA from this NFA
-        DFA is made by subset construction algorithm and contains unreachable states. To remove unreachable states, use DFA.shrinked().
         Returns:
             AutomatonArgs: the args of DFA
-            typing.Dict[typing.Hashable, typing.Set]: the map from DFA state to NFA state"""
+            typing.Dict[int, typing.FrozenSet]: the map from DFA state to NFA states"""
+        states, index, masks = self._successor_masks()
+        start = self._start_mask(index)
+        finals = self._finals_mask(index)
+        alphabets = tuple(masks)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        ids = {start: 0}
+        queue = deque([start])
         transitions = dict()
-        for i in (states := helper._bit_search(tuple(self.get_states()))):
-            transitions.setdefault(str(i),
-                                   dict(
-                (alphabet, self._moveon(alphabet, i)) for alphabet in self.get_alphabets()
-            ))
-        return AutomatonArgs(transitions=transitions,
-                             start=self._START,
-                             finals={
-                                 str(i) for i in states if helper._any_in(states, self._FINALS)})
+        while queue:
+            subset = queue.popleft()
+            transition = dict()
+            for alphabet in alphabets:
+                successors = masks[alphabet]
+                next_subset = 0
+                for i in helper._iter_bits(subset):
+                    next_subset |= successors[i]
+                if next_subset not in ids:
+                    if max_states is not None and len(ids) >= max_states:
+                        raise StateExplosionError(
+                            f"subset construction exceeded {max_states} states.")
+                    ids[next_subset] = len(ids)
+                    queue.append(next_subset)
+                transition[alphabet] = ids[next_subset]
+            transitions[ids[subset]] = transition
+            if deadline is not None and time.monotonic() > deadline:
+                raise StateExplosionError(
+                    f"subset construction exceeded {timeout} seconds with {len(ids)} states.")
+        return (AutomatonArgs(transitions=transitions,
+                              start=0,
+                              finals={i for subset, i in ids.items() if subset & finals}),
+                {i: frozenset(states[j] for j in helper._iter_bits(subset)) for subset, i in ids.items()})
+
+    @functools.cached_property
+    def _batch_engine(self) -> "BitsetNFA":
+        return self.bitset()
+
+    @functools.cached_property
+    def _searcher(self) -> "Searcher":
+        # the sets of states are stepped on bitmasks when they are visited, so no DFA is made up front
+        from automata.general.search import BitsetSearcher
+        return BitsetSearcher(self._batch_engine)
+
+    def bitset(self) -> "BitsetNFA":
+        """make an alternative execution engine of this NFA, which keeps the set of current states as one int.
+        successors of each state are precomputed as bitmask for each alphabet, so one step is a few OR operations.
+
+        Returns:
+            BitsetNFA: engine with the same trans() and accept() as this NFA
+        """
+        from automata.general.bitset import BitsetNFA
+        return BitsetNFA(self)
+
+    def _successor_masks(self) -> typing.Tuple[typing.Tuple, typing.Dict[typing.Hashable, int], typing.Dict[typing.Hashable, typing.List[int]]]:
+        """internal function, index states and make bitmask of successors for each alphabet
+
+        Returns:
+            typing.Tuple: all states ordered by index
+            typing.Dict[typing.Hashable, int]: the map from state to its bit
+            typing.Dict[typing.Hashable, typing.List[int]]: masks[alphabet][i] is the successors of states[i]
+        """
+        index = {state: i for i, state in enumerate(self._TRANSITIONS)}
+        index.setdefault(self._START, len(index))
+        for transition in self._TRANSITIONS.values():
+            for targets in transition.values():
+                if targets is None:
+                    raise Exception(
+                        "If you want to show phi, please use {} instead.")
+                for state in targets:
+                    index.setdefault(state, len(index))
+        masks = {alphabet: [0] * len(index) for alphabet in self.get_alphabets()}
+        for state, transition in self._TRANSITIONS.items():
+            for alphabet, targets in transition.items():
+                for target in targets:
+                    masks[alphabet][index[state]] |= 1 << index[target]
+        return tuple(index), index, masks
+
+    def _start_mask(self, index: typing.Dict[typing.Hashable, int]) -> int:
+        """internal function, bitmask of the start states
+
+        Args:
+            index (typing.Dict[typing.Hashable, int]): the map from state to its bit, made by _successor_masks()
+        """
+        return 1 << index[self._START]
+
+    def _finals_mask(self, index: typing.Dict[typing.Hashable, int]) -> int:
+        """internal function, bitmask of the final states
+
+        Args:
+            index (typing.Dict[typing.Hashable, int]): the map from state to its bit, made by _successor_masks()
+        """
+        mask = 0
+        for state in self._FINALS:
+            if state in index:
+                mask |= 1 << index[state]
+        return mask
 
     def _moveon_wrapper(self, alphabet: typing.Hashable, current: Container | typing.Any, *, check_container: bool = True) -> typing.Tuple:
         """This is just a wrapper, do not use it directly.
@@ -216,24 +1288,7 @@ class NFA(Automaton):
         Returns:
             typing.Tuple: next state
         """
-        ans = set()
-        if (current == None):
-            return tuple(ans)
-        # just check once if current is a container
-        if (check_container and isinstance(current, Container) and not isinstance(current, (str, bytes, bytearray))):
-            for state in current:
-                ans |= self._moveon(alphabet, state, check_container=False)
-            return tuple(ans)
-        try:
-            if (self._TRANSITIONS[current][alphabet] == {}):
-                return tuple(ans)
-            if (self._TRANSITIONS[current][alphabet] == None):
-                raise Exception(
-                    "If you want to show phi, please use {} instead.")
-        except KeyError:
-            return tuple(ans)
-        ans |= set(self._TRANSITIONS[current][alphabet])
-        return tuple(ans)
+        return tuple(self._moveon(alphabet, current, check_container=check_container))
 
     def _moveon(self, alphabet: typing.Hashable, current: Container | typing.Any, *, check_container: bool = True) -> typing.Set:
         """internal function, move on to next state and return set of state
@@ -245,7 +1300,23 @@ class NFA(Automaton):
 
         Returns:
             typing.Set: next state"""
-        return set(self._moveon_wrapper(alphabet, (current) if isinstance(current, str) else tuple(current), check_container=check_container))
+        following = set()
+        if current is None:
+            return following
+        if not (check_container and isinstance(current, Container) and not isinstance(current, (str, bytes, bytearray))):
+            current = (current,)
+        for state in current:
+            transition = self._TRANSITIONS.get(state)
+            if transition is None:
+                continue
+            targets = transition.get(alphabet)
+            if targets is None:
+                if alphabet in transition:
+                    raise Exception(
+                        "If you want to show phi, please use {} instead.")
+                continue
+            following.update(targets)
+        return following
 
 
 class E_NFA(NFA):
@@ -263,41 +1334,127 @@ class E_NFA(NFA):
     a = E_NFA(transitions, start, finals)"""
 
     def trans(self, string: Collection) -> typing.Generator:
-        current = self._moveon("", self._START) | self._moveon(
-            epsilon, self._START) | {self._START}
+        current = self._start_set()
         yield current
         for alphabet in string:
-            current = self._moveon(alphabet, current)
-            current |= self._moveon(epsilon, current)
+            current = self._step(current, alphabet, prune=False)
             yield current
 
-    def log_trans(self, string: Collection) -> typing.Generator:
-        current = self._moveon(epsilon, self._START) | {self._START}
-        yield current
-        for alphabet in string:
-            print(current, f" --{alphabet}, {epsilon}--> ", end="")
-            current = self._moveon(alphabet, current)
-            current |= self._moveon(epsilon, current)
-            print(current)
-            yield current
+    def _start_set(self) -> typing.FrozenSet:
+        return self._epsilon_closures[self._START]
+
+    def _update_caches(self, change: typing.Tuple) -> None:
+        # an added epsilon move extends the closures including its state.
+        # removed targets may leave the automaton or shrink closures, so the closures are dropped then
+        closures = self.__dict__.get("_epsilon_closures")
+        if closures is not None and change[0] == "row":
+            _, state, alphabet, _, _, _, removed, added = change
+            if removed:
+                del self.__dict__["_epsilon_closures"]
+            else:
+                for target in added | {state}:
+                    closures.setdefault(target, frozenset((target,)))
+                if (alphabet is epsilon or alphabet == "") and added:
+                    reachable = frozenset().union(*(closures[target] for target in added))
+                    for source, closure in closures.items():
+                        if state in closure:
+                            closures[source] = closure | reachable
+        super()._update_caches(change)
+
+    @functools.cached_property
+    def _epsilon_closures(self) -> typing.Dict[typing.Hashable, typing.FrozenSet]:
+        """internal table, the states reachable by epsilon moves from each state, including itself.
+        computed once on first use, and dropped by _invalidate()"""
+        states = set(self._TRANSITIONS) | {self._START}
+        for transition in self._TRANSITIONS.values():
+            for targets in transition.values():
+                states.update(targets)
+        closures = dict()
+        for state in states:
+            closure = {state}
+            stack = [state]
+            while stack:
+                transition = self._TRANSITIONS.get(stack.pop(), {})
+                for alphabet in (epsilon, ""):
+                    for target in transition.get(alphabet, ()):
+                        if target not in closure:
+                            closure.add(target)
+                            stack.append(target)
+            closures[state] = frozenset(closure)
+        return closures
+
+    def _closure(self, states: typing.Iterable) -> typing.Set:
+        """internal function, the states reachable by epsilon moves from states
+
+        Args:
+            states (typing.Iterable): states to start from
+
+        Returns:
+            typing.Set: epsilon closure of states, including themselves
+        """
+        closures = self._epsilon_closures
+        ans = set()
+        for state in states:
+            ans |= closures[state]
+        return ans
+
+    def _successor_masks(self) -> typing.Tuple[typing.Tuple, typing.Dict[typing.Hashable, int], typing.Dict[typing.Hashable, typing.List[int]]]:
+        """internal function, same as NFA._successor_masks, but epsilon is not an alphabet and every mask is closed under epsilon moves"""
+        states, index, masks = super()._successor_masks()
+        for alphabet in (epsilon, ""):
+            masks.pop(alphabet, None)
+        closures = self._epsilon_closure_masks(index)
+        for successors in masks.values():
+            for i, mask in enumerate(successors):
+                closed = 0
+                for j in helper._iter_bits(mask):
+                    closed |= closures[j]
+                successors[i] = closed
+        return states, index, masks
+
+    def _start_mask(self, index: typing.Dict[typing.Hashable, int]) -> int:
+        mask = 0
+        for state in self._epsilon_closures[self._START]:
+            mask |= 1 << index[state]
+        return mask
+
+    def _epsilon_closure_masks(self, index: typing.Dict[typing.Hashable, int]) -> typing.List[int]:
+        """internal function, _epsilon_closures as bitmask
+
+        Args:
+            index (typing.Dict[typing.Hashable, int]): the map from state to its bit, made by _successor_masks()
+
+        Returns:
+            typing.List[int]: closures[i] is the epsilon closure of i-th state, including itself
+        """
+        closures = [0] * len(index)
+        for state, closure in self._epsilon_closures.items():
+            for target in closure:
+                closures[index[state]] |= 1 << index[target]
+        return closures
 
     def makeNFAargs(self) -> AutomatonArgs:
-        """make a AutomatonArgs of NFA from this ε-NFA
+        """make a AutomatonArgs of NFA from this ε-NFA by epsilon removal.
+        the NFA has the same states, and q --a--> r iff q --ε*, a, ε*--> r in this ε-NFA.
+        q is final iff some final state is in the epsilon closure of q.
+
         Returns:
             AutomatonArgs: the args of NFA"""
+        closures = self._epsilon_closures
         transitions = dict()
-        for i in (states := helper._bit_search(tuple(self.get_states()))):
-            transitions.setdefault(str(i),
-                                   dict(
-                (alphabet, self._moveon(alphabet, i)) for alphabet in self.get_alphabets()
-            ))
+        for state, closure in closures.items():
+            transition = dict()
+            for middle in closure:
+                for alphabet, targets in self._TRANSITIONS.get(middle, {}).items():
+                    if alphabet is epsilon or alphabet == "":
+                        continue
+                    successors = transition.setdefault(alphabet, set())
+                    for target in targets:
+                        successors |= closures[target]
+            transitions[state] = transition
         return AutomatonArgs(transitions=transitions,
                              start=self._START,
-                             finals={
-                                 str(i) for i in states if helper._any_in(states, self._FINALS)})
-
-    def makeDFAargs(self) -> AutomatonArgs:
-        return self.makeNFAargs(super().makeDFAargs())
+                             finals={state for state, closure in closures.items() if helper._any_in(closure, self._FINALS)})
 
 
 if __name__ == '__main__':
@@ -326,7 +1483,8 @@ if __name__ == '__main__':
     start = "q0"
     finals = {"q1", "q2"}
     a = NFA(transitions, start, finals)
-    adfa = a.makeDFAargs()
+    adfa, subsets = a.makeDFAargs()
+    pprint(subsets)
     pprint(adfa.transitions)
     pprint(adfa.start)
     pprint(adfa.finals)
@@ -0,0 +1,138 @@
+import typing
+from collections import deque
+from collections.abc import Collection
+from automata.general.main import DFA, AutomatonArgs
+from automata.general.compiled import CompiledDFA
+
+
+class MultiDFA:
+    """many DFAs run in one pass over the string, by the product automaton built lazily.
+    each product state is the tuple of the states (index in CompiledDFA, -1 if dead) of every DFA,
+    and it is made when the string first reaches it. if more than max_states product states are made,
+    all of them are dropped and built again from the current one, so the memory is bounded.
+    you can use this class like below:
+    multi = MultiDFA([dfa1, dfa2, args3])
+    multi.match("0101")  # frozenset of the indices of DFAs accepting "0101"
+    """
+
+    def __init__(self, dfas: typing.Iterable[DFA | AutomatonArgs], max_states: int | None = 65536):
+        """
+        Args:
+            dfas (typing.Iterable[DFA | AutomatonArgs]): DFAs to run
+            max_states (int | None, optional): the number of product states kept at once, None means unbounded. Defaults to 65536.
+        """
+        self._dfas = tuple(dfa._compiled if isinstance(dfa, DFA) else CompiledDFA(dfa) for dfa in dfas)
+        self._max_states = max_states
+        self._start = tuple(dfa._start for dfa in self._dfas)
+        self._ids = dict()
+        self._components = []
+        self._rows = []
+        self._accepting = []
+        self.resets = 0
+
+    def __len__(self) -> int:
+        return len(self._dfas)
+
+    @property
+    def dfas(self) -> typing.Tuple[CompiledDFA, ...]:
+        """the DFAs, compiled"""
+        return self._dfas
+
+    def _intern(self, components: typing.Tuple[int, ...]) -> int:
+        """internal function, get the id of the product state, making it if it is new"""
+        i = self._ids.get(components)
+        if i is None:
+            i = len(self._components)
+            self._ids[components] = i
+            self._components.append(components)
+            self._rows.append(dict())
+            self._accepting.append(frozenset(
+                k for k, (state, dfa) in enumerate(zip(components, self._dfas)) if state >= 0 and dfa._finals[state]))
+        return i
+
+    def _transition(self, current: int, alphabet: typing.Hashable) -> int:
+        """internal function, make the transition of the product state which is not made yet"""
+        components = self._components[current]
+        following = []
+        for state, dfa in zip(components, self._dfas):
+            column = dfa.symbol_index.get(alphabet)
+            following.append(-1 if state < 0 or column is None else dfa.table[state * dfa._width + column])
+        if self._max_states is not None and len(self._components) >= self._max_states:
+            self.reset()
+            current = self._intern(components)
+        target = self._intern(tuple(following))
+        self._rows[current][alphabet] = target
+        return target
+
+    def reset(self) -> None:
+        """drop every product state made so far"""
+        self._ids.clear()
+        self._components.clear()
+        self._rows.clear()
+        self._accepting.clear()
+        self.resets += 1
+
+    def match(self, string: Collection) -> typing.FrozenSet[int]:
+        """judge the string with every DFA in one pass
+
+        Args:
+            string (Collection): the string to be judged
+
+        Returns:
+            typing.FrozenSet[int]: the indices of the DFAs accepting the string
+        """
+        rows = self._rows
+        current = self._intern(self._start)
+        for alphabet in string:
+            following = rows[current].get(alphabet)
+            if following is None:
+                following = self._transition(current, alphabet)
+            current = following
+        return self._accepting[current]
+
+    def accepts(self, string: Collection) -> typing.List[bool]:
+        """same as match, but return if each DFA accepts the string"""
+        accepting = self.match(string)
+        return [i in accepting for i in range(len(self._dfas))]
+
+
+def product(dfas: typing.Iterable[DFA | AutomatonArgs], accepting: typing.Callable[[typing.FrozenSet[int]], bool],
+            alphabets: typing.Iterable = ()) -> AutomatonArgs:
+    """make a AutomatonArgs of the product DFA, with every reachable product state.
+    each state is the tuple of the states of the DFAs, and None in it means the DFA is dead.
+    the product DFA is total over all alphabets of the DFAs and alphabets.
+
+    Args:
+        dfas (typing.Iterable[DFA | AutomatonArgs]): DFAs to combine
+        accepting (typing.Callable[[typing.FrozenSet[int]], bool]): judge if the product state is final from the indices of the DFAs accepting there
+        alphabets (typing.Iterable, optional): alphabets added to the alphabets of the DFAs. Defaults to ().
+
+    Returns:
+        AutomatonArgs: the args of product DFA
+    """
+    multi = MultiDFA(dfas, max_states=None)
+    symbols = list({alphabet: None for dfa in multi.dfas for alphabet in dfa.symbols})
+    symbols += [alphabet for alphabet in alphabets if alphabet not in symbols]
+
+    def name(i: int) -> typing.Tuple:
+        return tuple(None if state < 0 else dfa.states[state] for state, dfa in zip(multi._components[i], multi.dfas))
+
+    start = multi._intern(multi._start)
+    queue = deque([start])
+    visited = {start}
+    transitions = dict()
+    while queue:
+        current = queue.popleft()
+        transition = dict()
+        for alphabet in symbols:
+            target = multi._rows[current].get(alphabet)
+            if target is None:
+                target = multi._transition(current, alphabet)
+            if target not in visited:
+                visited.add(target)
+                queue.append(target)
+            transition[alphabet] = name(target)
+        transitions[name(current)] = transition
+    return AutomatonArgs(transitions=transitions,
+                         start=name(start),
+                         finals={name(i) for i in visited if accepting(multi._accepting[i])})
@@ -0,0 +1,282 @@
+import typing
+from collections.abc import Sequence
+from automata.general.compiled import CompiledDFA
+from automata.general.cache import StepCache
+from automata._helper import helper
+
+
+class Searcher:
+    """find the substrings of a text which are accepted by a DFA.
+    match ends are found by one forward pass of the DFA started at every position, which is the unanchored prefix automaton.
+    its states are sets of DFA states and are made lazily through StepCache.
+    match starts are found by one backward pass of the reversed DFA, started from the finals at every match end.
+    NFA and ε-NFA use BitsetSearcher instead, which needs no DFA.
+    you can get this from DFA.finditer() or NFA.finditer() like below:
+    for start, end in dfa.finditer(text):
+        print(text[start:end])
+    """
+
+    def __init__(self, dfa: CompiledDFA, cache_size: int | None = 65536):
+        self._dfa = dfa
+        width = dfa._width
+        self._reverse = [[[] for _ in dfa.states] for _ in range(width)]
+        for state in range(len(dfa.states)):
+            for column in range(width):
+                target = dfa.table[state * width + column]
+                if target >= 0:
+                    self._reverse[column][target].append(state)
+        self._finals = frozenset(i for i in range(len(dfa.states)) if dfa._finals[i])
+        self._forward_cache = StepCache(cache_size)
+        self._backward_cache = StepCache(cache_size)
+
+    def _forward(self, active: typing.FrozenSet[int], alphabet: typing.Hashable) -> typing.Tuple[typing.FrozenSet[int], bool]:
+        """internal function, move on every run by alphabet and start a new run.
+        return the next set of states and if it contains a final"""
+        key = (active, alphabet)
+        following = self._forward_cache.get(key)
+        if following is None:
+            dfa = self._dfa
+            column = dfa.symbol_index.get(alphabet)
+            states = {dfa._start}
+            if column is not None:
+                for state in active:
+                    target = dfa.table[state * dfa._width + column]
+                    if target >= 0:
+                        states.add(target)
+            states = frozenset(states)
+            following = (states, not states.isdisjoint(self._finals))
+            self._forward_cache.put(key, following)
+        return following
+
+    def _backward(self, active: typing.FrozenSet[int], alphabet: typing.Hashable, end: bool) -> typing.FrozenSet[int]:
+        """internal function, move back every reversed run by alphabet, and start new runs from finals if end"""
+        key = (active, alphabet, end)
+        following = self._backward_cache.get(key)
+        if following is None:
+            column = self._dfa.symbol_index.get(alphabet)
+            states = set(self._finals) if end else set()
+            if column is not None:
+                reverse = self._reverse[column]
+                for state in active:
+                    states.update(reverse[state])
+            following = frozenset(states)
+            self._backward_cache.put(key, following)
+        return following
+
+    def ends(self, text: typing.Iterable) -> typing.Generator:
+        """yield every position where some match ends, in one forward pass. text can be any iterable"""
+        active = frozenset((self._dfa._start,))
+        if not active.isdisjoint(self._finals):
+            yield 0
+        for position, alphabet in enumerate(text, 1):
+            active, accepting = self._forward(active, alphabet)
+            if accepting:
+                yield position
+
+    def starts(self, text: Sequence, ends: bytearray, live: typing.List | None = None) -> bytearray:
+        """find every position where some match starts, in one backward pass
+
+        Args:
+            text (Sequence): the text
+            ends (bytearray): ends[i] is 1 if some match ends at i, made from ends()
+            live (typing.List | None, optional): a list of len(text) + 1 items. if given, live[i] is set to
+                the states from which text[i:end] is accepted for some end in ends. Defaults to None.
+
+        Returns:
+            bytearray: starts[i] is 1 if some match starts at i
+        """
+        start = self._dfa._start
+        starts = bytearray(len(text) + 1)
+        active = self._finals if ends[len(text)] else frozenset()
+        if live is not None:
+            live[len(text)] = active
+        if start in active:
+            starts[len(text)] = 1
+        for position in range(len(text) - 1, -1, -1):
+            active = self._backward(active, text[position], ends[position] == 1)
+            if live is not None:
+                live[position] = active
+            if start in active:
+                starts[position] = 1
+        return starts
+
+    def _longest(self, text: Sequence, start: int, live: typing.List) -> int:
+        """internal function, the last end of the matches which start at start.
+        the run stops as soon as its state can't reach any end, so it doesn't read past the longest match"""
+        dfa = self._dfa
+        table, width, symbol_index, finals = dfa.table, dfa._width, dfa.symbol_index, dfa._finals
+        state = dfa._start
+        longest = start if finals[state] else -1
+        for position in range(start, len(text)):
+            column = symbol_index.get(text[position])
+            if column is None:
+                break
+            state = table[state * width + column]
+            if state < 0 or state not in live[position + 1]:
+                break
+            if finals[state]:
+                longest = position + 1
+        return longest
+
+    def finditer(self, text: Sequence, all_ends: bool = False) -> typing.Generator:
+        """yield (start, end) of the matches, text[start:end] is accepted by the DFA.
+
+        Args:
+            text (Sequence): the text
+            all_ends (bool, optional): if False, yield leftmost-longest matches which don't overlap, like re.finditer.
+                if True, yield a match for every end with its leftmost start. Defaults to False.
+        """
+        if all_ends:
+            yield from self._all_ends(text)
+            return
+        ends = bytearray(len(text) + 1)
+        found = False
+        for end in self.ends(text):
+            ends[end] = 1
+            found = True
+        if not found:
+            return
+        # the matches don't overlap and each run stops at its longest end, so text is read a few times in total
+        live = [None] * (len(text) + 1)
+        starts = self.starts(text, ends, live)
+        position = 0
+        while (start := starts.find(1, position)) >= 0:
+            end = self._longest(text, start, live)
+            yield start, end
+            position = end if end > start else end + 1
+
+    def _all_ends(self, text: typing.Iterable) -> typing.Generator:
+        """internal function, one forward pass of the DFA started at every position, keeping the earliest start of each state"""
+        dfa = self._dfa
+        table, width, symbol_index, finals = dfa.table, dfa._width, dfa.symbol_index, dfa._finals
+        earliest = {dfa._start: 0}
+        if finals[dfa._start]:
+            yield 0, 0
+        for position, alphabet in enumerate(text, 1):
+            column = symbol_index.get(alphabet)
+            following = dict()
+            if column is not None:
+                for state, start in earliest.items():
+                    target = table[state * width + column]
+                    if target >= 0 and start < following.get(target, position + 1):
+                        following[target] = start
+            following.setdefault(dfa._start, position)
+            earliest = following
+            starts = [start for state, start in earliest.items() if finals[state]]
+            if starts:
+                yield min(starts), position
+
+    def search(self, text: Sequence) -> typing.Tuple[int, int] | None:
+        """the leftmost-longest match, or None if there is no match"""
+        return next(self.finditer(text), None)
+
+
+class BitsetSearcher(Searcher):
+    """Searcher of NFA or ε-NFA, running on the bitmasks of BitsetNFA.
+    the runs started at every position are one set of NFA states, so the forward and backward passes
+    step bitmasks of states through StepCache, and no DFA is made by subset construction up front.
+    you can get this from NFA.finditer() or BitsetNFA.finditer() like below:
+    for start, end in nfa.finditer(text):
+        print(text[start:end])
+    """
+
+    def __init__(self, nfa: "BitsetNFA", cache_size: int | None = 65536):
+        self._nfa = nfa
+        # reverse[alphabet][i] is the states which move to i by alphabet, alphabets of the same class share one list
+        shared = dict()
+        self._reverse = dict()
+        for alphabet, successors in nfa._masks.items():
+            reverse = shared.get(id(successors))
+            if reverse is None:
+                reverse = shared[id(successors)] = [0] * len(successors)
+                for state, successor in enumerate(successors):
+                    for target in helper._iter_bits(successor):
+                        reverse[target] |= 1 << state
+            self._reverse[alphabet] = reverse
+        self._forward_cache = StepCache(cache_size)
+        self._backward_cache = StepCache(cache_size)
+
+    def _forward(self, active: int, alphabet: typing.Hashable) -> typing.Tuple[int, bool]:
+        key = (active, alphabet)
+        following = self._forward_cache.get(key)
+        if following is None:
+            nfa = self._nfa
+            states = nfa.step(active, alphabet) | nfa._start
+            following = (states, bool(states & nfa._finals))
+            self._forward_cache.put(key, following)
+        return following
+
+    def _backward(self, active: int, alphabet: typing.Hashable, end: bool) -> int:
+        key = (active, alphabet, end)
+        following = self._backward_cache.get(key)
+        if following is None:
+            following = self._nfa._finals if end else 0
+            reverse = self._reverse.get(alphabet)
+            if reverse is not None:
+                for state in helper._iter_bits(active):
+                    following |= reverse[state]
+            self._backward_cache.put(key, following)
+        return following
+
+    def ends(self, text: typing.Iterable) -> typing.Generator:
+        active = self._nfa._start
+        if active & self._nfa._finals:
+            yield 0
+        for position, alphabet in enumerate(text, 1):
+            active, accepting = self._forward(active, alphabet)
+            if accepting:
+                yield position
+
+    def starts(self, text: Sequence, ends: bytearray, live: typing.List | None = None) -> bytearray:
+        # a match starts where the reversed runs meet the start states
+        start = self._nfa._start
+        starts = bytearray(len(text) + 1)
+        active = self._nfa._finals if ends[len(text)] else 0
+        if live is not None:
+            live[len(text)] = active
+        if active & start:
+            starts[len(text)] = 1
+        for position in range(len(text) - 1, -1, -1):
+            active = self._backward(active, text[position], ends[position] == 1)
+            if live is not None:
+                live[position] = active
+            if active & start:
+                starts[position] = 1
+        return starts
+
+    def _longest(self, text: Sequence, start: int, live: typing.List) -> int:
+        nfa = self._nfa
+        finals = nfa._finals
+        states = nfa._start
+        longest = start if states & finals else -1
+        for position in range(start, len(text)):
+            # only the states which can still reach an end are kept
+            states = nfa.step(states, text[position]) & live[position + 1]
+            if not states:
+                break
+            if states & finals:
+                longest = position + 1
+        return longest
+
+    def _all_ends(self, text: typing.Iterable) -> typing.Generator:
+        # the earliest start of the runs in each NFA state
+        nfa = self._nfa
+        masks, finals = nfa._masks, nfa._finals
+        initial = list(helper._iter_bits(nfa._start))
+        earliest = dict.fromkeys(initial, 0)
+        if nfa._start & finals:
+            yield 0, 0
+        for position, alphabet in enumerate(text, 1):
+            successors = masks.get(alphabet)
+            following = dict()
+            if successors is not None:
+                for state, start in earliest.items():
+                    for target in helper._iter_bits(successors[state]):
+                        if start < following.get(target, position + 1):
+                            following[target] = start
+            for state in initial:
+                following.setdefault(state, position)
+            earliest = following
+            starts = [start for state, start in earliest.items() if finals >> state & 1]
+            if starts:
+                yield min(starts), position
@@ -0,0 +1,83 @@
+"""binary format of CompiledDFA, all integers are little-endian:
+    header: magic b"AUTOMATA", version, flags, the number of states, the number of alphabets, start, size of names (struct "<8sIIIIiQ")
+    names: pickle of (states, alphabets), ordered by index
+    padding to 4 bytes
+    table: int32 * states * alphabets, dense and row-major, -1 is the dead state
+    finals: bitmap, bit i of byte i // 8 is 1 if i-th state is final
+"""
+import sys
+from array import array
+import mmap
+import os
+import pickle
+import struct
+import typing
+from automata.general.compiled import CompiledDFA
+
+MAGIC = b"AUTOMATA"
+VERSION = 1
+_HEADER = struct.Struct("<8sIIIIiQ")
+_LITTLE = sys.byteorder == "little"
+
+
+def _table_offset(names_size: int) -> int:
+    return (_HEADER.size + names_size + 3) // 4 * 4
+
+
+def save(dfa: CompiledDFA, path: typing.Union[str, os.PathLike]) -> None:
+    """write dfa to path in the binary format"""
+    names = pickle.dumps((dfa.states, dfa.symbols), protocol=pickle.HIGHEST_PROTOCOL)
+    table = array("i", dfa.table)
+    if not _LITTLE:
+        table.byteswap()
+    finals = bytearray((len(dfa.states) + 7) // 8)
+    for i, final in enumerate(dfa._finals):
+        if final:
+            finals[i >> 3] |= 1 << (i & 7)
+    with open(path, "wb") as file:
+        file.write(_HEADER.pack(MAGIC, VERSION, 0, len(dfa.states), len(dfa.symbols), dfa._start, len(names)))
+        file.write(names)
+        file.write(bytes(_table_offset(len(names)) - _HEADER.size - len(names)))
+        file.write(table.tobytes())
+        file.write(finals)
+
+
+def load(path: typing.Union[str, os.PathLike], use_mmap: bool = True) -> CompiledDFA:
+    """read CompiledDFA written by save(). names are unpickled, so don't load untrusted files.
+
+    Args:
+        path (typing.Union[str, os.PathLike]): path of the file
+        use_mmap (bool, optional): map the file and use the table in it without copying, so processes loading the same file share the memory. Defaults to True.
+
+    Returns:
+        CompiledDFA: the DFA, its _TRANSITIONS is a read-only view of the table
+    """
+    with open(path, "rb") as file:
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) if use_mmap else file.read()
+    view = memoryview(buffer)
+    if len(view) < _HEADER.size:
+        raise Exception(f"{path} is not a file of automata.")
+    magic, version, _, size, width, start, names_size = _HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise Exception(f"{path} is not a file of automata.")
+    if version != VERSION:
+        raise Exception(f"version {version} of {path} is not supported.")
+    offset = _table_offset(names_size)
+    end = offset + 4 * size * width
+    # the sizes in the header are checked against the file, so a broken file fails here and not in the table
+    if len(view) < end + (size + 7) // 8 or not 0 <= start < size:
+        raise ValueError(f"{path} is truncated or broken.")
+    states, symbols = pickle.loads(view[_HEADER.size:_HEADER.size + names_size])
+    if len(states) != size or len(symbols) != width:
+        raise ValueError(f"{path} is truncated or broken.")
+    if use_mmap and _LITTLE and array("i").itemsize == 4:
+        table = view[offset:end].cast("i")
+    else:
+        table = array("i", view[offset:end].tobytes())
+        if not _LITTLE:
+            table.byteswap()
+    bitmap = view[end:end + (size + 7) // 8]
+    finals = bytes((bitmap[i >> 3] >> (i & 7)) & 1 for i in range(size))
+    dfa = CompiledDFA._from_table(states, symbols, table, finals, start)
+    dfa._buffer = buffer
+    return dfa
@@ -0,0 +1,145 @@
+import asyncio
+import mmap
+import os
+import typing
+from collections.abc import Iterable, Sized
+from automata.general.compiled import CompiledDFA
+
+
+class Matcher:
+    """resumable matcher of DFA, which holds the current state between chunks.
+    you can get this from DFA.matcher() like below:
+    matcher = dfa.matcher()
+    for chunk in chunks:
+        matcher.feed(chunk)
+    matcher.is_accepting()
+
+    bytes, bytearray, memoryview and mmap chunks are read through memoryview without copying.
+    each byte is looked up as int first, then as bytes of length 1, then as str of length 1 (latin-1).
+    other chunks (str, list, ...) are iterated as alphabets.
+    """
+
+    def __init__(self, dfa: CompiledDFA):
+        self._dfa = dfa
+        symbol_index = dfa.symbol_index
+        self._byte_columns = [
+            symbol_index.get(byte, symbol_index.get(bytes((byte,)), symbol_index.get(chr(byte), -1)))
+            for byte in range(256)]
+        self.reset()
+
+    def reset(self) -> None:
+        """go back to the start state"""
+        self._current = self._dfa._start
+
+    @property
+    def state(self) -> typing.Hashable:
+        """current state, or None if the matcher has fallen into the dead state"""
+        return None if self._current < 0 else self._dfa.states[self._current]
+
+    def feed(self, chunk: typing.Union[bytes, bytearray, memoryview, mmap.mmap, Iterable]) -> None:
+        """move on by every alphabet in chunk
+
+        Args:
+            chunk (typing.Union[bytes, bytearray, memoryview, mmap.mmap, Iterable]): next part of the string
+        """
+        if self.is_dead():
+            return
+        if isinstance(chunk, (bytes, bytearray, memoryview, mmap.mmap)):
+            with memoryview(chunk) as view, view.cast("B") as octets:
+                self._run(map(self._byte_columns.__getitem__, octets))
+        else:
+            symbol_index = self._dfa.symbol_index
+            self._run(symbol_index.get(alphabet, -1) for alphabet in chunk)
+
+    def _run(self, columns: typing.Iterable[int]) -> None:
+        table, width = self._dfa.table, self._dfa._width
+        current = self._current
+        dead = self._dfa._sinks[0]
+        for column in columns:
+            if column < 0:
+                current = -1
+                break
+            current = table[current * width + column]
+            if current < 0 or dead[current]:
+                break
+        self._current = current
+
+    def is_dead(self) -> bool:
+        """the matcher has fallen into the dead state, or a state which can't reach any final, and will never accept"""
+        return self._current < 0 or self._dfa._sinks[0][self._current] == 1
+
+    def is_sink(self) -> bool:
+        """the matcher is in an accepting sink, so it accepts whatever alphabets of the DFA come after"""
+        return self._current >= 0 and self._dfa._sinks[1][self._current] == 1
+
+    def is_accepting(self) -> bool:
+        """the string fed so far is accepted"""
+        return self._current >= 0 and self._dfa._finals[self._current] == 1
+
+
+def match_file(dfa: CompiledDFA, path: typing.Union[str, os.PathLike]) -> Matcher:
+    """run a matcher over the content of a file, mapping the file with mmap instead of reading it
+
+    Args:
+        dfa (CompiledDFA): the DFA to run
+        path (typing.Union[str, os.PathLike]): path of the file
+
+    Returns:
+        Matcher: the matcher after the whole file is fed
+    """
+    matcher = Matcher(dfa)
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size:
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                matcher.feed(buffer)
+    return matcher
+
+
+async def accept_stream(dfa: CompiledDFA, source: typing.Union[asyncio.StreamReader, typing.AsyncIterable],
+                        yield_every: int = 65536, chunksize: int = 65536, early_exit: bool = True) -> bool:
+    """judge the string coming from source chunk by chunk, without blocking the event loop
+
+    Args:
+        dfa (CompiledDFA): the DFA to run
+        source (typing.Union[asyncio.StreamReader, typing.AsyncIterable]): StreamReader, or async iterator of chunks
+        yield_every (int, optional): give control back to the event loop after this many alphabets. Defaults to 65536.
+        chunksize (int, optional): the number of bytes read from StreamReader at once. Defaults to 65536.
+        early_exit (bool, optional): stop reading when the result can't change, that is the DFA is dead or in an accepting sink.
+            in an accepting sink, the rest is not read, so alphabets which the DFA doesn't know are not checked. Defaults to True.
+
+    Returns:
+        bool: is accepted
+    """
+    matcher = Matcher(dfa)
+    fed = 0
+    async for chunk in _chunks_of(source, chunksize):
+        for piece in _split(chunk, yield_every):
+            matcher.feed(piece)
+            if matcher.is_dead():
+                return False
+            if early_exit and matcher.is_sink():
+                return True
+            fed += len(piece) if isinstance(piece, Sized) else yield_every
+            if fed >= yield_every:
+                fed = 0
+                await asyncio.sleep(0)
+    return matcher.is_accepting()
+
+
+async def _chunks_of(source: typing.Union[asyncio.StreamReader, typing.AsyncIterable], chunksize: int) -> typing.AsyncGenerator:
+    """internal function, iterate chunks of StreamReader (by read()) or of async iterator"""
+    if isinstance(source, asyncio.StreamReader):
+        while (chunk := await source.read(chunksize)):
+            yield chunk
+    else:
+        async for chunk in source:
+            yield chunk
+
+
+def _split(chunk: typing.Any, size: int) -> typing.Iterable:
+    """internal function, split a long chunk into pieces of size, so the event loop is not blocked by one chunk"""
+    if isinstance(chunk, (bytes, bytearray)):
+        chunk = memoryview(chunk)
+    if isinstance(chunk, (memoryview, str, list, tuple)) and len(chunk) > size:
+        return (chunk[i:i + size] for i in range(0, len(chunk), size))
+    return (chunk,)
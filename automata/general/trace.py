@@ -0,0 +1,97 @@
+import functools
+import time
+import typing
+from collections import Counter
+from collections.abc import Collection
+from automata._helper import helper
+
+
+class Tracer:
+    """statistics of the runs of automata, for finding hot states and transitions never used.
+    while an automaton is traced, its accept and trans are replaced by the traced ones on the instance,
+    so an automaton which is not traced runs the original methods and pays nothing.
+    a traced accept is one traced pass of trans, which is judged by the states at the end.
+    you can get this from Automaton.trace() or Automaton.tracing() like below:
+    with dfa.tracing() as tracer:
+        dfa.accept("0101")
+    tracer.state_visits.most_common(3)
+    tracer.as_dict()
+    """
+
+    def __init__(self):
+        self.state_visits = Counter()
+        self.transition_hits = Counter()
+        self.active_sizes = Counter()
+        self.calls = Counter()
+        self.seconds = Counter()
+
+    def reset(self) -> None:
+        """clear all statistics"""
+        for counter in (self.state_visits, self.transition_hits, self.active_sizes, self.calls, self.seconds):
+            counter.clear()
+
+    def attach(self, automaton: typing.Any) -> None:
+        """start tracing automaton, the runs of it are recorded in this tracer"""
+        automaton.__dict__["accept"] = functools.partial(self._accept, automaton)
+        automaton.__dict__["trans"] = functools.partial(self._trans, automaton)
+        automaton.__dict__["_tracer"] = self
+
+    @staticmethod
+    def detach(automaton: typing.Any) -> None:
+        """stop tracing automaton, it runs the original methods again"""
+        for name in ("accept", "trans", "_tracer"):
+            automaton.__dict__.pop(name, None)
+
+    def _accept(self, automaton: typing.Any, string: Collection) -> bool:
+        # one traced pass of trans, and the string is accepted if the last states have a final
+        self.calls["accept"] += 1
+        begin = time.perf_counter()
+        try:
+            current = None
+            for current in self._run(automaton, string):
+                pass
+            return any(map(automaton._FINALS.__contains__, automaton._trace_states(current)))
+        finally:
+            self.seconds["accept"] += time.perf_counter() - begin
+
+    def _trans(self, automaton: typing.Any, string: Collection) -> typing.Generator:
+        self.calls["trans"] += 1
+        begin = time.perf_counter()
+        try:
+            yield from self._run(automaton, string)
+        finally:
+            self.seconds["trans"] += time.perf_counter() - begin
+
+    def _run(self, automaton: typing.Any, string: Collection) -> typing.Generator:
+        """internal function, yield from the original trans, recording every step.
+        the alphabets are recorded as trans reads them, so string is read once and can be an iterator"""
+        state_visits, transition_hits, active_sizes = self.state_visits, self.transition_hits, self.active_sizes
+        read = []
+        steps = type(automaton).trans(automaton, helper._recorded(string, read))
+        current = next(steps)
+        states = automaton._trace_states(current)
+        state_visits.update(states)
+        if isinstance(states, (set, frozenset)):
+            active_sizes[len(states)] += 1
+        yield current
+        for current in steps:
+            alphabet = read.pop()
+            transition_hits.update((state, alphabet) for state in states)
+            states = automaton._trace_states(current)
+            state_visits.update(states)
+            if isinstance(states, (set, frozenset)):
+                active_sizes[len(states)] += 1
+            yield current
+
+    def unused_transitions(self, automaton: typing.Any) -> typing.Set[typing.Tuple[typing.Hashable, typing.Hashable]]:
+        """(state, alphabet) of the transitions of automaton which were never taken"""
+        return {(state, alphabet) for state, transition in automaton._TRANSITIONS.items()
+                for alphabet in transition if (state, alphabet) not in self.transition_hits}
+
+    def as_dict(self) -> typing.Dict[str, typing.Dict]:
+        """all statistics as plain dicts, transition_hits is keyed by (state, alphabet)"""
+        return {"state_visits": dict(self.state_visits),
+                "transition_hits": dict(self.transition_hits),
+                "active_sizes": dict(self.active_sizes),
+                "calls": dict(self.calls),
+                "seconds": dict(self.seconds)}
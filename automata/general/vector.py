@@ -0,0 +1,134 @@
+import functools
+import typing
+from collections.abc import Sequence
+from automata.general.compiled import CompiledDFA
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class VectorDFA:
+    """runner of CompiledDFA over many strings at once, for fixed-width records.
+    strings are rows of an (N, L) array of ints, and all N states move on together one column at a time,
+    by fancy indexing of the table (table[states, columns]), so each column costs a few NumPy calls instead of N loops.
+    each int is looked up as int first, then as bytes of length 1 (if it is a byte), then as str of length 1.
+    shorter strings are padded with pad, which is a sentinel symbol moving every state to itself.
+    NumPy is optional, without it (or for rows which are not an array) each row is run by the table in pure Python.
+    you can get this from DFA.accept_array() like below:
+    dfa.accept_array(numpy.frombuffer(records, dtype=numpy.uint8).reshape(-1, 16))
+    """
+
+    def __init__(self, dfa: CompiledDFA):
+        self._dfa = dfa
+        symbol_index = dfa.symbol_index
+        size = 256
+        for alphabet in symbol_index:
+            if isinstance(alphabet, int):
+                size = max(size, alphabet + 1)
+            elif isinstance(alphabet, str) and len(alphabet) == 1:
+                size = max(size, ord(alphabet) + 1)
+        self._columns = [
+            symbol_index.get(value, symbol_index.get(bytes((value,)) if value < 256 else None, symbol_index.get(chr(value), -1)))
+            for value in range(size)]
+        self._arrays = None
+
+    def _numpy_tables(self) -> typing.Tuple:
+        """internal function, the tables for NumPy, made on first use.
+        the table has a dead row len(states), a column len(symbols) for unknown ints going to the dead row,
+        and a column len(symbols) + 1 for pad going to the same row"""
+        if self._arrays is None:
+            dfa = self._dfa
+            size, width = len(dfa.states), dfa._width
+            table = numpy.full((size + 1, width + 2), size, dtype=numpy.intp)
+            if width:
+                targets = numpy.asarray(dfa.table, dtype=numpy.intp).reshape(size, width)
+                table[:size, :width] = numpy.where(targets < 0, size, targets)
+            table[:, width + 1] = numpy.arange(size + 1)
+            columns = numpy.asarray(self._columns, dtype=numpy.intp)
+            columns[columns < 0] = width
+            finals = numpy.zeros(size + 1, dtype=bool)
+            finals[:size] = numpy.frombuffer(bytes(dfa._finals), dtype=numpy.uint8) == 1
+            self._arrays = (table, columns, finals)
+        return self._arrays
+
+    def accept(self, rows: typing.Any, pad: int | None = None) -> typing.Any:
+        """judge each row
+
+        Args:
+            rows (typing.Any): (N, L) array of ints, usually uint8 or int32. without NumPy, a sequence of bytes or sequences of ints.
+            pad (int | None, optional): the sentinel int which is skipped, to pad shorter rows. Defaults to None.
+
+        Returns:
+            typing.Any: bool array of length N with NumPy, else bytearray. results[i] is true if i-th row is accepted
+        """
+        if numpy is None or not isinstance(rows, numpy.ndarray):
+            return bytearray(self._accept_row(row, pad) for row in rows)
+        if rows.ndim != 2:
+            raise Exception("rows must be an array of 2 dimensions.")
+        table, columns, finals = self._numpy_tables()
+        dead, unknown, skip = table.shape[0] - 1, table.shape[1] - 2, table.shape[1] - 1
+        states = numpy.full(rows.shape[0], self._dfa._start, dtype=numpy.intp)
+        for j in range(rows.shape[1]):
+            values = rows[:, j]
+            if values.dtype == numpy.uint8:
+                column = columns[values]
+            else:
+                inside = (values >= 0) & (values < len(columns))
+                column = numpy.where(inside, columns[numpy.where(inside, values, 0)], unknown)
+            if pad is not None:
+                column[values == pad] = skip
+            states = table[states, column]
+            # stop when every row has fallen into the dead state
+            if j % 64 == 63 and (states == dead).all():
+                break
+        return finals[states]
+
+    def _accept_row(self, row: Sequence[int], pad: int | None) -> bool:
+        """internal function, judge one row by the table of CompiledDFA"""
+        dfa, columns = self._dfa, self._columns
+        table, width = dfa.table, dfa._width
+        current = dfa._start
+        for value in row:
+            if value == pad:
+                continue
+            column = columns[value] if 0 <= value < len(columns) else -1
+            if column < 0:
+                return False
+            current = table[current * width + column]
+            if current < 0:
+                return False
+        return dfa._finals[current] == 1
+
+
+class NumpyDFA(CompiledDFA):
+    """CompiledDFA which judges a chunk of strings of str or bytes at once by VectorDFA, the engine of the "numpy" backend.
+    the chunk is made into an array of fixed-width strings by NumPy, padded with "\\0" which VectorDFA skips,
+    so strings of different lengths are judged together. accept of one string is the same as CompiledDFA.
+    you can get this by DFA(..., backend="numpy") like below:
+    dfa = DFA(transitions, start, finals, backend="numpy")
+    dfa.accept_many(lines)
+    """
+    # shorter chunks are judged one by one, since NumPy costs more than the loop for them
+    MIN_CHUNK = 64
+
+    @functools.cached_property
+    def _symbol_types(self) -> typing.FrozenSet[type]:
+        """internal table, the types of alphabets"""
+        return frozenset(map(type, self.symbols))
+
+    def _accept_list(self, strings: typing.List) -> bytearray:
+        # VectorDFA looks an int up as bytes and str too, so only the alphabets of the type iterated from strings are allowed,
+        # str for str and int for bytes, to judge the same as accept
+        kind = type(strings[0]) if strings else None
+        if (numpy is None or len(strings) < self.MIN_CHUNK or kind not in (str, bytes)
+                or not self._symbol_types <= {str if kind is str else int}):
+            return super()._accept_list(strings)
+        pad = "\0" if kind is str else b"\0"
+        if any(type(string) is not kind or pad in string for string in strings):
+            return super()._accept_list(strings)
+        fixed = numpy.array(strings, dtype=numpy.str_ if kind is str else numpy.bytes_)
+        if fixed.dtype.itemsize == 0:
+            return super()._accept_list(strings)
+        rows = fixed.view(numpy.uint32 if kind is str else numpy.uint8).reshape(len(strings), -1)
+        return bytearray(self._vector.accept(rows, pad=0).tobytes())
@@ -1,5 +1,9 @@
-import sys
-sys.path.append("../automata")
+from automata._helper.lazy import attach
 
-from . import main
-from .main import *
\ No newline at end of file
+__getattr__, __dir__, __all__ = attach(__name__, ["main"], {
+    "RegexError": ".main",
+    "to_e_nfa": ".main",
+    "compile": ".main",
+    "purge": ".main",
+})
+del attach
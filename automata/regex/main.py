@@ -1,7 +1,218 @@
-import sys
-sys.path.append("../automata")
+"""regex front-end, which compiles a pattern into E_NFA by Thompson construction, and into minimal DFA.
+supported syntax:
+    ab      concatenation
+    a|b     alternation
+    a* a+ a?    repetition
+    (ab)    grouping, () is the empty string
+    [abc] [a-z] [^abc]  character class, [^...] needs alphabets
+    .       any alphabet, needs alphabets
+    \\x     the character x itself
+each alphabet of the automata is a str of length 1.
+"""
+import functools
+import typing
+from automata.general.main import DFA, E_NFA, epsilon
+from automata.general.compiled import CompiledDFA
 
-del sys
-from automata.general import *
+_MAXCACHE = 512
 
-# This module will support using regex as alphabet
\ No newline at end of file
+
+class RegexError(Exception):
+    """raised when a pattern can't be parsed"""
+
+    def __init__(self, message: str, pattern: str, position: int):
+        super().__init__(f"{message} at position {position} in {pattern!r}")
+        self.pattern = pattern
+        self.position = position
+
+
+class _Parser:
+    """recursive descent parser. each node is a tuple like below:
+    ("symbols", frozenset), ("concat", [nodes]), ("union", [nodes]), ("star", node), ("plus", node), ("optional", node)
+    ("concat", []) is the empty string.
+    """
+
+    def __init__(self, pattern: str, alphabets: typing.FrozenSet | None):
+        self.pattern = pattern
+        self.alphabets = alphabets
+        self.position = 0
+
+    def error(self, message: str) -> RegexError:
+        return RegexError(message, self.pattern, self.position)
+
+    def peek(self) -> str | None:
+        return self.pattern[self.position] if self.position < len(self.pattern) else None
+
+    def take(self) -> str:
+        if self.position >= len(self.pattern):
+            raise self.error("unexpected end of pattern")
+        self.position += 1
+        return self.pattern[self.position - 1]
+
+    def parse(self) -> typing.Tuple:
+        node = self.union()
+        if self.peek() is not None:
+            raise self.error("unbalanced parenthesis")
+        return node
+
+    def union(self) -> typing.Tuple:
+        branches = [self.concat()]
+        while self.peek() == "|":
+            self.take()
+            branches.append(self.concat())
+        return branches[0] if len(branches) == 1 else ("union", branches)
+
+    def concat(self) -> typing.Tuple:
+        nodes = []
+        while self.peek() not in (None, "|", ")"):
+            nodes.append(self.repeat())
+        return nodes[0] if len(nodes) == 1 else ("concat", nodes)
+
+    def repeat(self) -> typing.Tuple:
+        node = self.atom()
+        while self.peek() in ("*", "+", "?"):
+            node = ({"*": "star", "+": "plus", "?": "optional"}[self.take()], node)
+        return node
+
+    def atom(self) -> typing.Tuple:
+        char = self.take()
+        if char == "(":
+            node = self.union()
+            if self.peek() != ")":
+                raise self.error("missing )")
+            self.take()
+            return node
+        if char == "[":
+            return ("symbols", self.character_class())
+        if char == ".":
+            return ("symbols", self.every_alphabet())
+        if char in ("*", "+", "?"):
+            raise self.error("nothing to repeat")
+        if char == ")":
+            raise self.error("unbalanced parenthesis")
+        if char == "\\":
+            char = self.take()
+        return ("symbols", frozenset(char))
+
+    def character_class(self) -> typing.FrozenSet:
+        negate = self.peek() == "^"
+        if negate:
+            self.take()
+        chars = set()
+        first = True
+        while first or self.peek() != "]":
+            if self.peek() is None:
+                raise self.error("missing ]")
+            first = False
+            low = self.take()
+            if low == "\\":
+                low = self.take()
+            if self.peek() == "-" and self.position + 1 < len(self.pattern) and self.pattern[self.position + 1] != "]":
+                self.take()
+                high = self.take()
+                if high == "\\":
+                    high = self.take()
+                if ord(low) > ord(high):
+                    raise self.error("bad character range")
+                chars.update(chr(i) for i in range(ord(low), ord(high) + 1))
+            else:
+                chars.add(low)
+        self.take()
+        if negate:
+            return self.every_alphabet() - chars
+        return frozenset(chars)
+
+    def every_alphabet(self) -> typing.FrozenSet:
+        if self.alphabets is None:
+            raise self.error("alphabets are needed for . and [^...]")
+        return self.alphabets
+
+
+def _thompson(node: typing.Tuple, transitions: typing.Dict[int, typing.Dict]) -> typing.Tuple[int, int]:
+    """add the fragment of node to transitions, and return its start and end"""
+
+    def new_state() -> int:
+        transitions[len(transitions)] = dict()
+        return len(transitions) - 1
+
+    def link(state: int, alphabet: typing.Hashable, target: int) -> None:
+        transitions[state].setdefault(alphabet, set()).add(target)
+
+    kind = node[0]
+    if kind == "symbols":
+        start, end = new_state(), new_state()
+        for alphabet in node[1]:
+            link(start, alphabet, end)
+        return start, end
+    if kind == "concat":
+        if not node[1]:
+            state = new_state()
+            return state, state
+        start, end = _thompson(node[1][0], transitions)
+        for child in node[1][1:]:
+            child_start, child_end = _thompson(child, transitions)
+            link(end, epsilon, child_start)
+            end = child_end
+        return start, end
+    if kind == "union":
+        start = new_state()
+        ends = []
+        for child in node[1]:
+            child_start, child_end = _thompson(child, transitions)
+            link(start, epsilon, child_start)
+            ends.append(child_end)
+        end = new_state()
+        for child_end in ends:
+            link(child_end, epsilon, end)
+        return start, end
+    child_start, child_end = _thompson(node[1], transitions)
+    start, end = new_state(), new_state()
+    link(start, epsilon, child_start)
+    link(child_end, epsilon, end)
+    if kind in ("star", "plus"):
+        link(child_end, epsilon, child_start)
+    if kind in ("star", "optional"):
+        link(start, epsilon, end)
+    return start, end
+
+
+def to_e_nfa(pattern: str, alphabets: typing.Iterable[str] | None = None) -> E_NFA:
+    """make ε-NFA of pattern by Thompson construction
+
+    Args:
+        pattern (str): regex
+        alphabets (typing.Iterable[str] | None, optional): all alphabets, used by . and [^...]. Defaults to None.
+
+    Returns:
+        E_NFA: ε-NFA accepting the strings which fully match pattern
+    """
+    alphabets = None if alphabets is None else frozenset(alphabets)
+    node = _Parser(pattern, alphabets).parse()
+    transitions = dict()
+    start, end = _thompson(node, transitions)
+    return E_NFA(transitions, start, {end})
+
+
+def compile(pattern: str, alphabets: typing.Iterable[str] | None = None) -> CompiledDFA:
+    """make minimal DFA of pattern. like re.compile, compiled DFAs are cached, so compiling the same pattern again is free.
+    the cached DFA is shared, so don't change it.
+
+    Args:
+        pattern (str): regex
+        alphabets (typing.Iterable[str] | None, optional): all alphabets, used by . and [^...]. Defaults to None.
+
+    Returns:
+        CompiledDFA: DFA accepting the strings which fully match pattern
+    """
+    return _compile(pattern, None if alphabets is None else frozenset(alphabets))
+
+
+@functools.lru_cache(maxsize=_MAXCACHE)
+def _compile(pattern: str, alphabets: typing.FrozenSet | None) -> CompiledDFA:
+    args, _ = to_e_nfa(pattern, alphabets).makeDFAargs()
+    return CompiledDFA(DFA(args).minimized())
+
+
+def purge() -> None:
+    """clear the cache of compiled DFAs"""
+    _compile.cache_clear()
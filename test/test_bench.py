@@ -0,0 +1,42 @@
+import sys
+sys.path.append("../automata")
+
+import json
+import unittest
+from automata import NFA, DFA
+from automata import bench
+
+
+class TestBench(unittest.TestCase):
+    def test_workloads(self):
+        nfa = NFA(bench.last_k_nfa(5))
+        dfa = DFA(nfa.makeDFAargs()[0])
+        for target in ("", "1", "100000", "010000", "11111111", "000001"):
+            self.assertEqual(nfa.accept(target), "1" in target[-5:])
+            self.assertEqual(dfa.accept(target), "1" in target[-5:])
+        self.assertEqual(len(nfa.makeDFAargs()[0].transitions), 2 ** 5)
+        e_nfa = bench.to_e_nfa(bench.last_k_pattern(3))
+        for target in ("", "1", "100", "1000", "0010"):
+            self.assertEqual(e_nfa.accept(target), "1" in target[-3:])
+
+    def test_prefixed_strings(self):
+        strings = bench.prefixed_strings(100, 40, namespaces=2, depth=4)
+        self.assertEqual(len(strings), 100)
+        self.assertTrue(all(len(string) == 40 and set(string) <= {"0", "1"} for string in strings))
+        # at most 2 namespaces at each level, so the first 3 segments are shared by many strings
+        self.assertLessEqual(len({string[:30] for string in strings}), 8)
+        results = bench.bench_prefixes(ks=(3,), count=50, length=20)
+        self.assertEqual({(result["name"], result["share_prefixes"]) for result in results},
+                         {(name, share) for name in ("DFA.accept_many", "NFA.accept_many", "E_NFA.accept_many") for share in (False, True)})
+
+    def test_results(self):
+        results = bench.bench_dfa(sizes=(10,), length=100) + bench.bench_shrinked(sizes=(16,)) + bench.bench_nfa(ks=(3,), length=100)
+        names = {result["name"] for result in results}
+        self.assertTrue({"DFA.accept", "CompiledDFA.trans", "DFA.shrinked", "NFA.makeDFAargs", "E_NFA.accept"} <= names)
+        for result in results:
+            self.assertEqual(json.loads(json.dumps(result)), result)
+            self.assertGreaterEqual(result["seconds"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,7 +2,8 @@ import sys
 sys.path.append("../automata")
 
 import unittest
-from automata import DFA, AutomatonArgs
+from automata import DFA, NFA, AutomatonArgs
+from automata.general import vector
 from automata.regex import *
 class TestDFA(unittest.TestCase):
     # DFA accepting string: string.count("1") % 3 == 0
@@ -32,6 +33,28 @@ class TestDFA(unittest.TestCase):
         self.assertEqual(self.dfa_mod3.shrinked(), shrinked_mod3)
     shrinked_dfa_mod3=DFA(dfa_mod3.shrinked())
 
+    def test_shrinked_dead_states(self):
+        # "trap" is reachable but can't reach "end", so it is removed and the transition to it becomes None
+        dfa = DFA({"start": {"a": "end", "b": "trap"}, "trap": {"a": "trap", "b": "trap"}, "end": {}}, "start", {"end"})
+        self.assertEqual(dfa.shrinked(), AutomatonArgs({"start": {"a": "end", "b": None}, "end": {}}, "start", {"end"}))
+        shrinked = DFA(dfa.shrinked())
+        self.assertEqual(list(shrinked.trans("ba")), ["start", None, None])
+        self.assertFalse(shrinked.accept("ba"))
+        self.assertTrue(shrinked.accept("a"))
+        # the start state is kept even if it can't reach any final
+        self.assertEqual(DFA({"q": {"a": "q"}}, "q", set()).shrinked(), AutomatonArgs({"q": {"a": "q"}}, "q", set()))
+
+    def test_frozen_args(self):
+        transitions = {"q0": {"0": "q0", "1": "q1"}, "q1": {"0": "q1", "1": "q0"}}
+        dfa = DFA(transitions, "q0", {"q0"})
+        transitions["q0"]["1"] = "q0"
+        self.assertFalse(dfa.accept("1"))
+        with self.assertRaises(TypeError):
+            dfa._TRANSITIONS["q0"]["1"] = "q0"
+        self.assertIs(dfa.get_states(), dfa.get_states())
+        self.assertEqual(dfa.get_alphabets(), {"0", "1"})
+        self.assertEqual(dfa._predecessors["q1"], {"q0", "q1"})
+
     def test_get_states(self):
         self.assertEqual(self.dfa3.get_states(), {"q0", "q1", "q2"})
         self.assertEqual(self.dfa_mod3.get_states(), {
@@ -92,4 +115,462 @@ class TestDFA(unittest.TestCase):
             self.assertEqual(i[0], i[1])
         for i in zip(translation_expect, self.shrinked_dfa_mod3.trans(testcase)):
             self.assertEqual(i[0], i[1])
-        
\ No newline at end of file
+        
+    def test_compile(self):
+        compiled_dfa3 = self.dfa3.compile()
+        compiled_mod3 = self.dfa_mod3.compile()
+        self.assertEqual(compiled_dfa3.state_index, {"q0": 0, "q1": 1, "q2": 2})
+        self.assertEqual(compiled_dfa3.symbol_index, {"0": 0, "1": 1})
+        self.assertEqual(compiled_dfa3.states, ("q0", "q1", "q2"))
+        self.assertIs(compiled_dfa3.compile(), compiled_dfa3)
+        testcases = ["", "0", "1", "1001", "111", "0110101110"]
+        for case in testcases:
+            self.assertEqual(compiled_dfa3.accept(case), self.dfa3.accept(case))
+            self.assertEqual(compiled_mod3.accept(case), self.dfa_mod3.accept(case))
+            self.assertEqual(list(compiled_mod3.trans(case)), list(self.dfa_mod3.trans(case)))
+
+        # missing transitions, None transitions and unknown alphabets are rejected
+        partial = DFA({"a": {"x": "b", "y": None}, "b": {"x": "a"}}, "a", {"b"}).compile()
+        self.assertTrue(partial.accept("x"))
+        self.assertFalse(partial.accept("xx"))
+        self.assertFalse(partial.accept("y"))
+        self.assertFalse(partial.accept("xy"))
+        self.assertFalse(partial.accept("z"))
+        self.assertEqual(list(partial.trans("xyx")), ["a", "b", None, None])
+
+    def test_minimized(self):
+        self.assertEqual(self.dfa3.minimized(), self.dfa3args)
+        self.assertEqual(self.dfa_mod3.minimized(), self.shrinked_dfa_mod3.minimized())
+        self.assertEqual(set(self.dfa_mod3.minimized().transitions), {"modulo0", "modulo1", "modulo-1"})
+
+        # count("1") % 3 == 0, but each state is duplicated
+        transitions = {(i, copy): {"0": (i, 1 - copy), "1": ((i + 1) % 3, copy)} for i in range(3) for copy in range(2)}
+        minimized = DFA(DFA(transitions, (0, 0), {(0, 0), (0, 1)}).minimized())
+        self.assertEqual(minimized.get_states(), {(0, 0), (1, 0), (2, 0)})
+        for case in ["", "0", "1", "1001", "111", "0110101110"]:
+            self.assertEqual(minimized.accept(case), case.count("1") % 3 == 0)
+
+        # missing and None transitions go to the implicit dead state, and stay missing or None
+        partial = DFA({"a": {"x": "b", "y": None}, "b": {"x": "c", "y": "d"}, "c": {"x": "c"}, "d": {"x": "c", "y": "d"}},
+                      "a", {"b", "c", "d"})
+        self.assertEqual(partial.minimized(),
+                         AutomatonArgs({"a": {"x": "b", "y": None}, "b": {"x": "c", "y": "b"}, "c": {"x": "c"}}, "a", {"b", "c"}))
+        # finals and the start without transitions
+        self.assertEqual(DFA({"a": {"0": "b"}}, "a", {"b"}).minimized(), AutomatonArgs({"a": {"0": "b"}}, "a", {"b"}))
+        self.assertEqual(DFA({}, "s", {"s"}).minimized(), AutomatonArgs({}, "s", {"s"}))
+        self.assertEqual(DFA({"a": {"0": "b", "1": "c"}, "c": {}}, "a", {"b", "c"}).minimized(),
+                         AutomatonArgs({"a": {"0": "c", "1": "c"}, "c": {}}, "a", {"c"}))
+        dead = DFA({"a": {"x": "b"}, "b": {"x": "a"}}, "a", set())
+        self.assertEqual(dead.minimized(), AutomatonArgs({"a": {"x": "a"}}, "a", set()))
+
+    def test_accept_many(self):
+        testcases = ["", "0", "1", "1001", "111", "0110101110"] * 50
+        expected = bytearray(self.dfa_mod3.accept(case) for case in testcases)
+        self.assertEqual(self.dfa_mod3.accept_many(testcases), expected)
+        self.assertEqual(self.dfa_mod3.accept_many(iter(testcases), workers=2, chunksize=7), expected)
+        self.assertEqual(self.dfa_mod3.accept_many([]), bytearray())
+        self.assertEqual(self.dfa_mod3.accept_many(testcases, share_prefixes=True), expected)
+        self.assertEqual(self.dfa_mod3.accept_many(iter(testcases), workers=2, chunksize=7, share_prefixes=True), expected)
+        # dead states, unknown alphabets and alphabets which can't be sorted together
+        partial = DFA({"a": {"x": "b", 1: "c"}, "b": {"x": "a", "y": "d"}, "c": {1: "c"}, "d": {"x": "d"}}, "a", {"a", "c"})
+        testcases = ["", "xx", "xxy", "xxyx", "xz", "xxx", ("x", "x", 1), (1, 1), (1, "x"), (1,), "xxxx"]
+        expected = bytearray([1, 1, 0, 0, 0, 0, 1, 1, 0, 1, 1])
+        self.assertEqual(partial.accept_many(testcases, share_prefixes=True), expected)
+        self.assertEqual(NFA({state: {alphabet: {target} for alphabet, target in transition.items()}
+                              for state, transition in partial._TRANSITIONS.items()}, "a", {"a", "c"}).accept_many(testcases, share_prefixes=True), expected)
+        # accept_many rejects unknown alphabets, where DFA.accept raises KeyError
+        for case in ["xz", "2", "x2x"]:
+            with self.assertRaises(KeyError):
+                partial.accept(case)
+        for options in [{}, {"share_prefixes": True}, {"workers": 2, "chunksize": 2}]:
+            self.assertEqual(partial.accept_many(["xz", "2", "x2x", "xx"], **options), bytearray([0, 0, 0, 1]))
+
+    def test_accept_many_spawn(self):
+        # workers started by spawn get the automaton by pickle, like on macOS and Windows
+        import functools
+        import multiprocessing
+        import pickle
+        from concurrent.futures import ProcessPoolExecutor
+        from unittest import mock
+        from automata.general import batch
+        self.assertEqual(pickle.loads(pickle.dumps(self.dfa_mod3args)), self.dfa_mod3args)
+        testcases = ["", "0", "1", "1001", "111", "0110101110"] * 5
+        expected = bytearray(self.dfa_mod3.accept(case) for case in testcases)
+        spawn = functools.partial(ProcessPoolExecutor, mp_context=multiprocessing.get_context("spawn"))
+        with mock.patch.object(batch, "ProcessPoolExecutor", spawn):
+            self.assertEqual(self.dfa_mod3.accept_many(testcases, workers=2, chunksize=7), expected)
+            nfa = NFA({state: {alphabet: {target} for alphabet, target in transition.items()}
+                       for state, transition in self.dfa_mod3args.transitions.items()}, "modulo0", {"modulo1", "modulo-1"})
+            self.assertEqual(nfa.accept_many(testcases, workers=2, chunksize=7), expected)
+
+    def test_backends(self):
+        from automata.general import backends
+        self.assertEqual(backends.available_backends()[-2:], ["compiled", "reference"])
+        with self.assertRaises(Exception):
+            DFA(self.dfa3args, backend="unknown")
+        testcases = ["", "0", "111", "1001", "0110101110", "101010"] * 20
+        expected = bytearray(case.count("1") % 3 == 0 for case in testcases)
+        for backend in ["auto"] + backends.available_backends():
+            dfa = DFA(self.dfa3args, backend=backend)
+            self.assertEqual(dfa.accept_many(testcases), expected)
+            self.assertEqual(dfa.accept_many(testcases, chunksize=7), expected)
+            self.assertTrue(dfa.accept("10101"))
+            if backend != "reference":
+                # unknown alphabets are rejected, like CompiledDFA
+                self.assertFalse(dfa.accept("12"))
+                self.assertEqual(dfa.accept_many(["12", "111"]), bytearray([0, 1]))
+                self.assertIsNot(dfa._engine, dfa)
+            # the engine is made again after the DFA is changed
+            dfa.set_final("q1")
+            self.assertEqual(dfa.accept_many(["1", "10", "11"]), bytearray([1, 1, 0]))
+        with self.assertRaises(KeyError):
+            DFA(self.dfa3args, backend="reference").accept("12")
+
+        calls = []
+        backends.register_backend("counting", lambda dfa: calls.append(dfa) or dfa._compiled, priority=-1)
+        try:
+            dfa = DFA(self.dfa3args, backend="counting")
+            self.assertEqual(calls, [])
+            self.assertTrue(dfa.accept("111"))
+            self.assertTrue(dfa.accept("1110"))
+            self.assertEqual(calls, [dfa])
+        finally:
+            del backends._backends["counting"]
+
+    def test_matcher(self):
+        import os
+        import tempfile
+        case = "0110101110" * 7
+        matcher = self.dfa_mod3.matcher()
+        self.assertEqual(matcher.state, "modulo0")
+        self.assertFalse(matcher.is_accepting())
+        for i in range(0, len(case), 4):
+            matcher.feed(case[i:i + 4])
+            self.assertEqual(matcher.is_accepting(), self.dfa_mod3.accept(case[:i + 4]))
+        for chunk in [b"10", bytearray(b"01"), memoryview(b"1")]:
+            matcher.feed(chunk)
+            case += bytes(chunk).decode()
+            self.assertEqual(matcher.is_accepting(), self.dfa_mod3.accept(case))
+        matcher.reset()
+        self.assertEqual(matcher.state, "modulo0")
+        matcher.feed(b"12")
+        self.assertTrue(matcher.is_dead())
+        self.assertIsNone(matcher.state)
+        matcher.feed(b"0")
+        self.assertFalse(matcher.is_accepting())
+
+        # byte alphabets are used as they are
+        bytes_dfa = DFA({"even": {ord("a"): "odd"}, "odd": {ord("a"): "even"}}, "even", {"even"})
+        matcher = bytes_dfa.matcher()
+        matcher.feed(b"aaa")
+        self.assertFalse(matcher.is_accepting())
+        matcher.feed([ord("a")])
+        self.assertTrue(matcher.is_accepting())
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "input")
+            for content in [b"", b"1", b"1001" * 1000, b"11" * 1000 + b"1"]:
+                with open(path, "wb") as file:
+                    file.write(content)
+                self.assertEqual(self.dfa_mod3.accept_file(path), self.dfa_mod3.accept(content.decode()))
+
+    def test_finditer(self):
+        # DFA accepting "1" followed by "0"s, and "11"
+        dfa = DFA({"s": {"1": "one"}, "one": {"0": "zeros", "1": "eleven"}, "zeros": {"0": "zeros"}, "eleven": {}},
+                  "s", {"one", "zeros", "eleven"})
+        text = "0100211100"
+        self.assertEqual(list(dfa.finditer(text)), [(1, 4), (5, 7), (7, 10)])
+        self.assertEqual(dfa.search(text), (1, 4))
+        self.assertEqual(list(dfa.finditer(text, all_ends=True)),
+                         [(1, 2), (1, 3), (1, 4), (5, 6), (5, 7), (6, 8), (7, 9), (7, 10)])
+        self.assertIsNone(dfa.search("0002"))
+        self.assertEqual(list(dfa.finditer("")), [])
+
+        # empty matches are reported once at each position, like re.finditer
+        self.assertEqual(list(self.dfa3.finditer("01")), [(0, 1), (1, 1), (2, 2)])
+        self.assertEqual(list(self.dfa3.finditer("121")), [(0, 0), (1, 1), (2, 2), (3, 3)])
+
+    def test_save_load(self):
+        import os
+        import pickle
+        import tempfile
+        partial = DFA({"a": {"x": "b"}, "b": {"x": "a", "y": "c"}, "c": {}}, "a", {"c"})
+        tuple_states = DFA({(0, "q"): {1: (1, "q")}, (1, "q"): {1: (0, "q"), 2: (1, "q")}}, (0, "q"), {(1, "q")})
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "dfa.bin")
+            for dfa in [self.dfa3, self.dfa_mod3, partial, tuple_states]:
+                dfa.save(path)
+                for mmap in [True, False]:
+                    loaded = DFA.load(path, mmap=mmap)
+                    self.assertEqual(loaded.shrinked(), dfa.shrinked())
+                    self.assertEqual(loaded.get_states(), dfa.get_states())
+                    self.assertEqual(loaded.state_index, dfa.compile().state_index)
+                    self.assertEqual(loaded.symbol_index, dfa.compile().symbol_index)
+                    for case in ["", "0", "1001", "111", "x", "xy", "xyx", (1,), (1, 2), (1, 1)]:
+                        self.assertEqual(loaded.accept(case), dfa.compile().accept(case))
+                    # loaded DFA can be sent to worker processes
+                    self.assertEqual(pickle.loads(pickle.dumps(loaded)).accept("1001"), dfa.compile().accept("1001"))
+                    del loaded
+            # a truncated file, and a file whose start is out of the states, fail with ValueError
+            self.dfa_mod3.save(path)
+            with open(path, "rb") as file:
+                data = file.read()
+            for broken in [data[:-1], data[:len(data) // 2], data[:24] + (99).to_bytes(4, "little") + data[28:]]:
+                with open(path, "wb") as file:
+                    file.write(broken)
+                for mmap in [True, False]:
+                    with self.assertRaises(ValueError):
+                        DFA.load(path, mmap=mmap)
+            with open(path, "wb") as file:
+                file.write(b"NOTADFA" * 10)
+            with self.assertRaises(Exception):
+                DFA.load(path)
+
+    def test_compress(self):
+        # DFA over bytes accepting identifiers: [a-z_][a-z0-9_]*
+        letters = [ord(char) for char in "abcdefghijklmnopqrstuvwxyz_"]
+        digits = [ord(char) for char in "0123456789"]
+        transitions = {"start": {byte: "ident" for byte in letters},
+                       "ident": {byte: "ident" for byte in letters + digits}}
+        transitions["start"].update({byte: None for byte in digits})
+        identifier = DFA(transitions, "start", {"ident"})
+        compressed = identifier.compress()
+        self.assertEqual(len(compressed.classes), 2)
+        self.assertEqual(set(compressed.classes[0]), set(letters))
+        self.assertLess(compressed.nbytes, len(identifier.compile().table) * 4)
+        for case in [b"", b"a", b"_a0", b"0a", b"ab-c", b"abc9", bytearray(b"x1"), memoryview(b"1")]:
+            self.assertEqual(compressed.accept(case), identifier.compile().accept(case), case)
+        self.assertEqual(list(compressed.trans(b"a1-")), ["start", "ident", "ident", None])
+
+        for dfa in [self.dfa3, self.dfa_mod3]:
+            compressed = dfa.compress()
+            self.assertIs(compressed.compress(), compressed)
+            for case in ["", "0", "1001", "111", "0110101110", "2"]:
+                self.assertEqual(compressed.accept(case), dfa.compile().accept(case))
+                self.assertEqual(list(compressed.trans(case)), list(dfa.compile().trans(case)))
+            # the tables of Automaton work on the compressed DFA too
+            self.assertEqual(compressed.dead_states(), dfa.dead_states())
+            self.assertEqual(compressed.sink_states(), dfa.sink_states())
+            self.assertEqual(compressed.shrinked(), dfa.compile().shrinked())
+            self.assertEqual(DFA(compressed.minimized()).get_states(), DFA(dfa.minimized()).get_states())
+            self.assertTrue(compressed.equivalent(dfa))
+
+    def test_tracing(self):
+        dfa = DFA(self.dfa_mod3args)
+        with dfa.tracing() as tracer:
+            self.assertTrue(dfa.accept("1"))
+            self.assertEqual(list(dfa.trans("10")), ["modulo0", "modulo1", "modulo-1"])
+        self.assertNotIn("accept", vars(dfa))
+        self.assertEqual(tracer.calls, {"accept": 1, "trans": 1})
+        self.assertEqual(tracer.state_visits, {"modulo0": 2, "modulo1": 2, "modulo-1": 1})
+        self.assertEqual(tracer.transition_hits, {("modulo0", "1"): 2, ("modulo1", "0"): 1})
+        self.assertIn(("modulo-2", "0"), tracer.unused_transitions(dfa))
+        self.assertEqual(tracer.as_dict()["active_sizes"], {})
+        # after tracing, nothing is recorded
+        dfa.accept("11")
+        self.assertEqual(sum(tracer.calls.values()), 2)
+        compiled = dfa.compile()
+        compiled.trace(tracer)
+        self.assertFalse(compiled.accept("2"))
+        compiled.untrace()
+        self.assertEqual(tracer.state_visits["modulo0"], 3)
+        # iterators are read once, and a traced accept walks the string once
+        expected = list(dfa.trans("0110"))
+        self.assertEqual(list(dfa.log_trans(iter("0110"))), expected)
+        with dfa.tracing() as tracer:
+            self.assertEqual(list(dfa.trans(iter("0110"))), expected)
+            self.assertFalse(dfa.accept(iter("0110")))
+            self.assertTrue(dfa.accept(iter("0111")))
+        self.assertEqual(tracer.transition_hits[("modulo0", "0")], 5)
+        self.assertEqual(sum(tracer.transition_hits.values()), 12)
+        self.assertEqual(sum(tracer.state_visits.values()), 15)
+
+    def test_accept_array(self):
+        dfa = DFA(self.dfa_mod3args)
+        rows = [b"1001", b"0110", b"1111", b"0000", b"12\x00\x00"]
+        padded = [b"1\x00\x00\x00", b"11\x00\x00", b"\x00100"]
+        # without NumPy, or for rows which are not an array, each row is run in pure Python
+        self.assertEqual(dfa.accept_array(rows), bytearray([0, 0, 0, 0, 0]))
+        self.assertEqual(dfa.accept_array(padded, pad=0), bytearray([1, 0, 1]))
+        if vector.numpy is None:
+            self.skipTest("NumPy is not installed")
+        numpy = vector.numpy
+        array = numpy.frombuffer(b"".join(rows + padded), dtype=numpy.uint8).reshape(-1, 4)
+        self.assertEqual(dfa.accept_array(array).tolist(), [False] * 8)
+        self.assertEqual(dfa.accept_array(array, pad=0).tolist(), [False] * 5 + [True, False, True])
+        dfa3 = DFA({0: {0: 0, 1: 1}, 1: {0: 1, 1: 2}, 2: {0: 2, 1: 0}}, 0, {0})
+        strings = ["".join(numpy.random.default_rng(seed).choice(["0", "1"], size=200)) for seed in range(50)]
+        array = numpy.array([[int(c) for c in string] for string in strings], dtype=numpy.int32)
+        self.assertEqual(dfa3.accept_array(array).tolist(), [string.count("1") % 3 == 0 for string in strings])
+        array[:, -1] = -5
+        self.assertFalse(dfa3.accept_array(array).any())
+        self.assertEqual(dfa3.accept_array(array, pad=-5).tolist(), [string[:-1].count("1") % 3 == 0 for string in strings])
+
+    def test_accept_stream(self):
+        import asyncio
+
+        async def chunks(*items):
+            for item in items:
+                yield item
+
+        async def from_reader(dfa, data, **options):
+            reader = asyncio.StreamReader()
+            reader.feed_data(data)
+            reader.feed_eof()
+            return await dfa.accept_stream(reader, **options)
+
+        case = "0110101110" * 50
+        for end in (0, 1, 7, len(case)):
+            self.assertEqual(asyncio.run(from_reader(self.dfa_mod3, case[:end].encode(), chunksize=3, yield_every=5)),
+                             self.dfa_mod3.accept(case[:end]))
+        self.assertTrue(asyncio.run(self.dfa_mod3.accept_stream(chunks("1", b"0", ["0"]))))
+        self.assertFalse(asyncio.run(self.dfa_mod3.accept_stream(chunks("12", "1"))))
+
+        # after "a", every string is accepted, and after "b", no string is accepted
+        dfa = DFA({"s": {"a": "yes", "b": "no"}, "yes": {"a": "yes", "b": "yes"}, "no": {"a": "no", "b": "no"}}, "s", {"yes"})
+        read = []
+
+        async def recorded(*items):
+            for item in items:
+                read.append(item)
+                yield item
+        self.assertTrue(asyncio.run(dfa.accept_stream(recorded("ab", "ba", "c"))))
+        self.assertEqual(read, ["ab"])
+        read.clear()
+        self.assertFalse(asyncio.run(dfa.accept_stream(recorded("ab", "ba", "c"), early_exit=False)))
+        self.assertEqual(read, ["ab", "ba", "c"])
+        read.clear()
+        self.assertFalse(asyncio.run(dfa.accept_stream(recorded("b", "a"))))
+        self.assertEqual(read, ["b"])
+        matcher = dfa.matcher()
+        matcher.feed("b")
+        self.assertTrue(matcher.is_dead())
+        self.assertEqual(matcher.state, "no")
+
+    def test_dead_and_sink_states(self):
+        # after "a", every string is accepted, and after "b", no string is accepted
+        dfa = DFA({"s": {"a": "yes", "b": "no"}, "yes": {"a": "yes", "b": "yes"}, "no": {"a": "no", "b": "no"}}, "s", {"yes"})
+        self.assertEqual(dfa.dead_states(), {"no"})
+        self.assertEqual(dfa.sink_states(), {"yes"})
+        self.assertEqual(self.dfa_mod3.dead_states(), {"modulo-2"})
+        self.assertEqual(self.dfa_mod3.sink_states(), set())
+        self.assertEqual(list(dfa.trans("bab")), ["s", None, None, None])
+        self.assertEqual(list(dfa.trans("aba")), ["s", "yes", "yes", "yes"])
+        for automaton in (dfa, dfa.compile()):
+            rest = iter("bababa")
+            self.assertFalse(automaton.accept(rest))
+            # the run stopped at the first "b"
+            self.assertEqual("".join(rest), "ababa")
+            self.assertTrue(automaton.accept("abbab"))
+            self.assertTrue(automaton.accept("a" * 100))
+            self.assertFalse(automaton.accept(""))
+        self.assertFalse(dfa.compile().accept("abc"))
+        with self.assertRaises(KeyError):
+            dfa.accept("abc")
+
+    def test_core(self):
+        from automata.general import Core, SymbolTable
+        symbols = SymbolTable()
+        core = self.dfa_mod3.core(symbols)
+        self.assertEqual(core.to_args(), self.dfa_mod3args)
+        self.assertTrue(core.deterministic)
+        self.assertEqual(len(symbols), 2)
+        with self.assertRaises(AttributeError):
+            core.start = "modulo1"
+        dfa = DFA(core)
+        for case in ["", "1", "10", "111", "0110101110", "1001"]:
+            self.assertEqual(dfa.accept(case), self.dfa_mod3.accept(case))
+            self.assertEqual(list(dfa.trans(case)), list(self.dfa_mod3.trans(case)))
+        self.assertEqual(DFA(dfa.minimized()).get_states(), DFA(self.dfa_mod3.minimized()).get_states())
+        # the symbol table is shared, and None transitions and int states are kept
+        other = DFA({0: {"1": 1, "2": 0}, 1: {"1": None}}, 0, {1}).core(symbols)
+        self.assertEqual(len(symbols), 3)
+        self.assertEqual(other.to_args(), AutomatonArgs({0: {"1": 1, "2": 0}, 1: {"1": None}}, 0, {1}))
+        self.assertEqual(other.transitions[0]["2"], 0)
+        self.assertNotIn("0", other.transitions[0])
+        self.assertNotIn("x", other.finals)
+        self.assertLess(other.nbytes, 100)
+
+        # Core and DFA made from it are pickled
+        import pickle
+        self.assertEqual(pickle.loads(pickle.dumps(core)).to_args(), self.dfa_mod3args)
+        copied = pickle.loads(pickle.dumps(dfa))
+        for case in ["", "1", "0110101110", "1001"]:
+            self.assertEqual(copied.accept(case), self.dfa_mod3.accept(case))
+        with self.assertRaises(AttributeError):
+            pickle.loads(pickle.dumps(core)).start = "modulo1"
+        with self.assertRaises(KeyError):
+            dfa._TRANSITIONS[["modulo0"]]
+
+    def test_core_accept(self):
+        # DFA made from Core judges on the arrays of Core like DFA on dicts, raising KeyError in the same cases
+        from automata import bench
+        from automata.general import Core
+        cases = ["", "a", "ab", "b", "ba", "bab", "bb", "abx", "c", "ca", "cab", "aaaa", "x"]
+        for args in [AutomatonArgs({"s": {"a": "p", "b": None, "c": "e"}, "p": {"a": "p", "b": "q"}, "q": {"a": "q", "b": "q"},
+                                    "d": {"a": "d"}}, "s", {"q", "e"}),
+                     AutomatonArgs({"s": {"a": "d", "b": "f"}, "d": {"a": "d", "b": "d"}}, "s", {"f"}),
+                     AutomatonArgs({}, "s", {"s"}), self.dfa_mod3args]:
+            dfa = DFA(Core(args, True))
+            for case in cases + ["0110", "12"]:
+                try:
+                    expected = DFA(args).accept(case)
+                except KeyError:
+                    expected = KeyError
+                with self.subTest(args=args, case=case):
+                    if expected is KeyError:
+                        self.assertRaises(KeyError, dfa.accept, case)
+                    else:
+                        self.assertEqual(dfa.accept(case), expected)
+            if args.start in args.transitions:
+                dfa.set_final(args.start)
+                self.assertTrue(dfa.accept(""))
+        # after an edit, the DFA runs on its own dicts
+        dfa, plain = DFA(Core(self.dfa_mod3args, True)), DFA(self.dfa_mod3args)
+        dfa.accept("1")
+        for automaton in [dfa, plain]:
+            automaton.add_transition("modulo0", "1", "modulo-1")
+        for case in ["1", "11", "10", "111"]:
+            self.assertEqual(dfa.accept(case), plain.accept(case))
+
+        # the arrays of Core are used as they are, so memory after accept stays close to the Core itself
+        args, text = bench.random_dfa(1000), bench.random_text(10000)
+        plain = bench._retained_bytes(bench._accepted, lambda: DFA({state: dict(row) for state, row in args.transitions.items()},
+                                                                   args.start, set(args.finals)), text)
+        core = bench._retained_bytes(bench._accepted, lambda: DFA(Core(args, True)), text)
+        self.assertLess(core, plain / 4)
+        self.assertEqual(DFA(Core(args, True)).accept(text), DFA(args).accept(text))
+
+    def test_count_sample_enumerate(self):
+        import random
+        import itertools
+        dfa = self.dfa_mod3
+        for n in range(8):
+            expected = sum(dfa.accept(case) for case in itertools.product("01", repeat=n))
+            self.assertEqual(dfa.count(n), expected)
+        # long lengths are big ints, and matrix power agrees with DP
+        even = DFA({0: {"0": 0, "1": 1}, 1: {"0": 1, "1": 0}}, 0, {0})
+        self.assertEqual(even.count(1000), 2 ** 999)
+        self.assertEqual(even._language._matrix_count(5), even.count(5))
+        self.assertEqual(DFA({0: {"a": 1}}, 0, {1}).count(100000), 0)
+
+        self.assertEqual(list(dfa.enumerate(2)), [("1",), ("0", "1"), ("1", "0")])
+        self.assertEqual(list(dfa.enumerate(6)),
+                         sorted((case for n in range(7) for case in itertools.product("01", repeat=n) if dfa.accept(case)),
+                                key=lambda case: (len(case), case)))
+        self.assertEqual(list(DFA({"s": {"a": "f", "b": None}, "f": {}}, "s", {"f"}).enumerate(5)), [("a",)])
+
+        rng = random.Random(0)
+        samples = dfa.sample(6, 2000, rng=rng)
+        self.assertTrue(all(len(case) == 6 and dfa.accept(case) for case in samples))
+        # every accepted string appears about 2000 / count times
+        frequencies = {case: samples.count(case) for case in set(samples)}
+        self.assertEqual(len(frequencies), dfa.count(6))
+        self.assertLess(max(frequencies.values()), 3 * 2000 / dfa.count(6))
+        rejected = dfa.sample(6, 200, rng=rng, accepted=False)
+        self.assertTrue(all(len(case) == 6 and not dfa.accept(case) for case in rejected))
+        self.assertEqual(dfa.sample(0, 1, accepted=False), [()])
+        with self.assertRaises(Exception):
+            dfa.sample(0, 1)
+        partial = DFA({"s": {"a": "f", "b": None}, "f": {"a": "f"}}, "s", {"f"})
+        self.assertEqual(set(partial.sample(2, 50, rng=rng, accepted=False)), {("a", "b"), ("b", "a"), ("b", "b")})
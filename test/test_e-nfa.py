@@ -2,4 +2,116 @@ import sys
 sys.path.append("../automata")
 
 import unittest
-from automata import E_NFA, AutomatonArgs
+from automata import E_NFA, AutomatonArgs, epsilon
+
+
+class TestE_NFA(unittest.TestCase):
+    # this ε-NFA will accept binary string which is multiple of 2 or multiple of 3
+    transitions = {
+        "q0": {"0": {"q0"}, "1": {"q3"}, epsilon: {"q1"}},
+        "q1": {"0": {"q1"}, "1": {"q2"}},
+        "q2": {"0": {"q1"}, "1": {"q2"}},
+        "q3": {"0": {"q4"}, "1": {"q0"}},
+        "q4": {"0": {"q3"}, "1": {"q4"}}
+    }
+    start = "q0"
+    finals = {"q0", "q1"}
+    e_nfa_mod2or3 = E_NFA(transitions, start, finals)
+
+    # this ε-NFA will accept "a" * n which n is 0 or multiple of 2 or multiple of 3, with chains of epsilon moves
+    transitions = {
+        "start": {epsilon: {"mid"}},
+        "mid": {"": {"even"}, epsilon: {"three"}},
+        "even": {"a": {"odd"}},
+        "odd": {"a": {"even"}},
+        "three": {"a": {"three1"}},
+        "three1": {"a": {"three2"}},
+        "three2": {"a": {"three"}},
+    }
+    start = "start"
+    finals = {"even", "three"}
+    e_nfa_chain = E_NFA(transitions, start, finals)
+
+    def targets(self, length: int):
+        targets = [""]
+        for _ in range(length):
+            targets = [target + alphabet for target in targets for alphabet in "01"]
+            yield from targets
+
+    def test_accept(self):
+        for target in self.targets(7):
+            self.assertEqual(self.e_nfa_mod2or3.accept(target),
+                             int(target, 2) % 2 == 0 or int(target, 2) % 3 == 0)
+
+    def test_bitset(self):
+        bitset_mod2or3 = self.e_nfa_mod2or3.bitset()
+        self.assertEqual(list(bitset_mod2or3.trans("")), [{"q0", "q1"}])
+        self.assertTrue(bitset_mod2or3.accept(""))
+        for target in self.targets(7):
+            self.assertEqual(bitset_mod2or3.accept(target), self.e_nfa_mod2or3.accept(target))
+            self.assertEqual(list(bitset_mod2or3.trans(target)), list(self.e_nfa_mod2or3.trans(target)))
+
+        bitset_chain = self.e_nfa_chain.bitset()
+        self.assertEqual(list(bitset_chain.trans("a")), [{"start", "mid", "even", "three"}, {"odd", "three1"}])
+        for n in range(20):
+            self.assertEqual(bitset_chain.accept("a" * n), n % 2 == 0 or n % 3 == 0)
+
+    def test_trans(self):
+        self.assertEqual(list(self.e_nfa_chain.trans("aa")),
+                         [{"start", "mid", "even", "three"}, {"odd", "three1"}, {"even", "three2"}])
+        self.assertEqual(list(self.e_nfa_mod2or3.trans("10")), [{"q0", "q1"}, {"q2", "q3"}, {"q1", "q4"}])
+        for n in range(20):
+            self.assertEqual(self.e_nfa_chain.accept("a" * n), n % 2 == 0 or n % 3 == 0)
+
+    def test_makeNFAargs(self):
+        from automata import NFA, DFA
+        for e_nfa, alphabets, length in [(self.e_nfa_mod2or3, "01", 7), (self.e_nfa_chain, "a", 20)]:
+            args = e_nfa.makeNFAargs()
+            self.assertEqual(set(args.transitions), e_nfa.get_states())
+            self.assertFalse(any(epsilon in transition or "" in transition for transition in args.transitions.values()))
+            nfa = NFA(args).bitset()
+            dfa = DFA(e_nfa.makeDFAargs()[0])
+            targets = [""]
+            for _ in range(length):
+                for target in targets:
+                    self.assertEqual(nfa.accept(target), e_nfa.accept(target))
+                    self.assertEqual(dfa.accept(target), e_nfa.accept(target))
+                targets = [target + alphabet for target in targets for alphabet in alphabets]
+
+    def test_epsilon_closure_cache(self):
+        e_nfa = E_NFA({"p": {epsilon: {"q"}, "a": {"p"}}, "q": {"b": {"q"}}, "r": {}}, "p", {"r"})
+        self.assertFalse(e_nfa.accept("ab"))
+        self.assertEqual(e_nfa._epsilon_closures["p"], {"p", "q"})
+        e_nfa._TRANSITIONS = AutomatonArgs({"p": {epsilon: {"q"}, "a": {"p"}}, "q": {"b": {"q"}, epsilon: {"r"}}, "r": {}},
+                                           "p", {"r"}).transitions
+        e_nfa._invalidate()
+        self.assertEqual(e_nfa._epsilon_closures["p"], {"p", "q", "r"})
+        self.assertTrue(e_nfa.accept("ab"))
+
+    def test_dead_and_sink_states(self):
+        # accepts strings containing "ab"
+        e_nfa = E_NFA({"s": {"a": {"s"}, "b": {"s"}, epsilon: {"p"}}, "p": {"a": {"q"}}, "q": {"b": {"r"}},
+                       "r": {epsilon: {"f"}}, "f": {"a": {"f"}, "b": {"f"}}, "x": {"a": {"x"}}}, "s", {"f"})
+        self.assertEqual(e_nfa.dead_states(), {"x"})
+        self.assertEqual(e_nfa.sink_states(), {"f"})
+        for case in ["", "a", "ab", "ba", "bab", "abba", "bbbb", "aab"]:
+            self.assertEqual(e_nfa.accept(case), "ab" in case)
+        rest = iter("babbbb")
+        self.assertTrue(e_nfa.accept(rest))
+        self.assertEqual(list(rest), [])
+
+    def test_core(self):
+        core = self.e_nfa_mod2or3.core()
+        self.assertFalse(core.deterministic)
+        self.assertEqual(core.to_args(), AutomatonArgs(self.e_nfa_mod2or3._TRANSITIONS, "q0", self.e_nfa_mod2or3._FINALS))
+        e_nfa = E_NFA(core)
+        for case in ["", "0", "1", "11", "110", "1001", "10101"]:
+            self.assertEqual(e_nfa.accept(case), self.e_nfa_mod2or3.accept(case))
+        self.assertEqual(e_nfa.makeDFAargs()[0], self.e_nfa_mod2or3.makeDFAargs()[0])
+
+    def test_accept_many(self):
+        targets = list(self.targets(6))
+        expected = bytearray(int(target, 2) % 2 == 0 or int(target, 2) % 3 == 0 for target in targets)
+        self.assertEqual(self.e_nfa_mod2or3.accept_many(targets), expected)
+        self.assertEqual(self.e_nfa_mod2or3.accept_many(targets, workers=2, chunksize=16), expected)
+        self.assertEqual(self.e_nfa_mod2or3.accept_many(targets[::-1], share_prefixes=True), expected[::-1])
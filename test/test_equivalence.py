@@ -0,0 +1,95 @@
+import sys
+sys.path.append("../automata")
+
+import itertools
+import unittest
+from automata import DFA, NFA, E_NFA, AutomatonArgs
+from automata.bench import random_dfa, last_k_nfa
+from automata.regex import to_e_nfa
+
+
+class TestEquivalence(unittest.TestCase):
+    # DFA accepting string: string.count("1") % 2 == 0
+    dfa_even = DFA({0: {"0": 0, "1": 1}, 1: {"0": 1, "1": 0}}, 0, {0})
+    # the same language with other names and a redundant state
+    args_even = AutomatonArgs({"x": {"0": "x", "1": "y"}, "y": {"0": "y", "1": "z"}, "z": {"0": "z", "1": "y"}}, "x", {"x", "z"})
+    # DFA accepting string: string.count("1") % 4 == 0
+    dfa_4 = DFA({i: {"0": i, "1": (i + 1) % 4} for i in range(4)}, 0, {0})
+
+    def brute_force(self, first, second, length=6):
+        for n in range(length + 1):
+            for case in itertools.product("01", repeat=n):
+                if first.accept(case) != second.accept(case):
+                    return case
+        return None
+
+    def test_equivalent(self):
+        self.assertTrue(self.dfa_even.equivalent(self.args_even))
+        self.assertTrue(DFA(self.args_even).equivalent(DFA(self.dfa_even.minimized())))
+        result = self.dfa_even.equivalent(self.dfa_4)
+        self.assertFalse(result)
+        self.assertEqual(result.counterexample, ("1", "1"))
+        # partial transitions are dead
+        partial = DFA({"s": {"0": "s"}}, "s", {"s"})
+        self.assertEqual(partial.equivalent(self.dfa_even).counterexample, ("1", "1"))
+        self.assertEqual(partial.equivalent(DFA({"s": {"0": "s", "1": None}, "t": {}}, "s", {"s"})).counterexample, None)
+
+    def test_issubset(self):
+        self.assertTrue(self.dfa_4.issubset(self.dfa_even))
+        result = self.dfa_even.issubset(self.dfa_4)
+        self.assertFalse(result)
+        self.assertEqual(result.counterexample, ("1", "1"))
+        self.assertTrue(DFA({"s": {"0": "s"}}, "s", {"s"}).issubset(self.dfa_even))
+        self.assertEqual(DFA({"s": {"0": "s"}}, "s", set()).issubset(self.dfa_4).counterexample, None)
+
+    def test_nfa(self):
+        nfa = NFA(last_k_nfa(3))
+        dfa = DFA(nfa.makeDFAargs()[0])
+        e_nfa = to_e_nfa("(0|1)*1(0|1)?(0|1)?")
+        self.assertTrue(nfa.equivalent(dfa))
+        self.assertTrue(dfa.equivalent(nfa))
+        self.assertTrue(e_nfa.equivalent(nfa))
+        self.assertTrue(nfa.bitset().equivalent(e_nfa))
+        self.assertTrue(NFA(last_k_nfa(2)).issubset(nfa))
+        result = nfa.issubset(NFA(last_k_nfa(2)))
+        self.assertEqual(result.counterexample, ("1", "0", "0"))
+        self.assertEqual(to_e_nfa("(0|1)*1").equivalent(nfa).counterexample, ("1", "0"))
+
+    def test_args_of_engines(self):
+        # AutomatonArgs is read by its targets, since BitsetNFA and ClassDFA can't be made from it
+        nfa = NFA(last_k_nfa(3))
+        bitset = nfa.bitset()
+        self.assertTrue(bitset.equivalent(last_k_nfa(3)))
+        self.assertTrue(bitset.equivalent(nfa.makeDFAargs()[0]))
+        self.assertEqual(bitset.issubset(last_k_nfa(2)).counterexample, ("1", "0", "0"))
+        self.assertTrue(to_e_nfa("(0|1)*1").bitset().equivalent(AutomatonArgs({"p": {"": {"q"}}, "q": {"0": {"q"}, "1": {"q", "r"}}},
+                                                                                  "p", {"r"})))
+        self.assertTrue(nfa.equivalent(nfa.makeDFAargs()[0]))
+        compressed = self.dfa_even.compress()
+        self.assertTrue(compressed.equivalent(self.args_even))
+        self.assertEqual(compressed.equivalent(self.dfa_4.shrinked()).counterexample, ("1", "1"))
+        self.assertTrue(to_e_nfa("(0|1)*").issubset(E_NFA(to_e_nfa("0*(1|0)*").core())))
+
+    def test_random(self):
+        for seed in range(20):
+            first = DFA(random_dfa(6, seed=seed))
+            second = DFA(random_dfa(6, seed=seed + 100))
+            expected = self.brute_force(first, second)
+            result = first.equivalent(second)
+            if expected is None:
+                # no string of length 6 or less differs
+                self.assertTrue(result or len(result.counterexample) > 6)
+            else:
+                self.assertFalse(result)
+                # a shortest one, but maybe another one of the same length
+                self.assertEqual(len(result.counterexample), len(expected))
+            if not result:
+                self.assertNotEqual(first.accept(result.counterexample), second.accept(result.counterexample))
+            self.assertTrue(first.equivalent(DFA(first.minimized())))
+            intersection = DFA(first.intersection(second))
+            self.assertTrue(intersection.issubset(first))
+            self.assertTrue(first.issubset(DFA(first.union(second))))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import sys
+sys.path.append("../automata")
+
+import itertools
+import unittest
+from automata import DFA, MultiDFA, AutomatonArgs
+
+
+class TestMultiDFA(unittest.TestCase):
+    # DFA accepting string: string.count("1") % 3 == 0
+    dfa3 = DFA({"q0": {"0": "q0", "1": "q1"},
+                "q1": {"0": "q1", "1": "q2"},
+                "q2": {"0": "q2", "1": "q0"}}, "q0", {"q0"})
+    # DFA accepting string: int(string, base=2) % 3 != 0
+    dfa_mod3 = DFA({"modulo0": {"0": "modulo0", "1": "modulo1"},
+                    "modulo1": {"0": "modulo-1", "1": "modulo0"},
+                    "modulo-1": {"0": "modulo1", "1": "modulo-1"}}, "modulo0", {"modulo1", "modulo-1"})
+    # DFA accepting string: string.endswith("0"), partial
+    args_end0 = AutomatonArgs({"s": {"0": "z", "1": "s"}, "z": {"0": "z", "1": "s"}}, "s", {"z"})
+    # DFA accepting string: string == "0"
+    args_zero = AutomatonArgs({"s": {"0": "z"}, "z": {}}, "s", {"z"})
+
+    def targets(self, length: int):
+        for i in range(length + 1):
+            yield from map("".join, itertools.product("01", repeat=i))
+
+    def expected(self, target: str):
+        return [target.count("1") % 3 == 0, target != "" and int(target, 2) % 3 != 0, target.endswith("0"), target == "0"]
+
+    def test_match(self):
+        multi = MultiDFA([self.dfa3, self.dfa_mod3, self.args_end0, self.args_zero])
+        self.assertEqual(len(multi), 4)
+        for target in self.targets(8):
+            expected = self.expected(target)
+            self.assertEqual(multi.accepts(target), expected)
+            self.assertEqual(multi.match(target), {i for i, accepted in enumerate(expected) if accepted})
+        self.assertEqual(multi.match("012"), frozenset())
+        self.assertEqual(multi.resets, 0)
+
+    def test_max_states(self):
+        multi = MultiDFA([self.dfa3, self.dfa_mod3, self.args_end0, self.args_zero], max_states=3)
+        for target in self.targets(8):
+            self.assertEqual(multi.accepts(target), self.expected(target))
+            self.assertLessEqual(len(multi._components), 3)
+        self.assertGreater(multi.resets, 0)
+
+    def test_boolean_operations(self):
+        operations = [
+            (self.dfa3.union(self.dfa_mod3), lambda a, b: a or b),
+            (self.dfa3.intersection(self.dfa_mod3), lambda a, b: a and b),
+            (self.dfa3.difference(self.dfa_mod3), lambda a, b: a and not b),
+            (self.dfa_mod3.difference(self.dfa3), lambda a, b: b and not a),
+            (self.dfa3.complement(), lambda a, b: not a),
+        ]
+        for args, operation in operations:
+            dfa = DFA(args)
+            for target in self.targets(8):
+                expected = self.expected(target)
+                self.assertEqual(dfa.accept(target), operation(expected[0], expected[1]), target)
+
+        # the complement of a partial DFA has an explicit dead state, and alphabets can be added
+        complement = DFA(DFA(self.args_zero).complement(alphabets="12"))
+        self.assertEqual(complement.get_alphabets(), {"0", "1", "2"})
+        for target in ["", "0", "00", "1", "2", "02"]:
+            self.assertEqual(complement.accept(target), target != "0")
+        intersection = DFA(DFA(self.args_zero).intersection(self.args_end0))
+        self.assertEqual([target for target in self.targets(4) if intersection.accept(target)], ["0"])
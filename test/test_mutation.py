@@ -0,0 +1,167 @@
+import sys
+sys.path.append("../automata")
+
+import itertools
+import random
+import unittest
+from automata import DFA, NFA, E_NFA, AutomatonArgs, epsilon
+
+
+class TestMutation(unittest.TestCase):
+    cases = ["".join(case) for n in range(6) for case in itertools.product("012", repeat=n)]
+
+    def warm(self, automaton):
+        """make every cached table, so the mutations have to keep them right"""
+        automaton.get_states()
+        automaton.get_alphabets()
+        automaton._predecessors
+        automaton.dead_states()
+        automaton.sink_states()
+        for case in self.cases[:40]:
+            try:
+                automaton.accept(case)
+            except KeyError:
+                pass
+        if isinstance(automaton, DFA):
+            automaton._compiled.accept("")
+        if isinstance(automaton, E_NFA):
+            automaton._epsilon_closures
+
+    def assertSameAsRebuild(self, automaton):
+        rebuilt = type(automaton)(AutomatonArgs(automaton._TRANSITIONS, automaton._START, automaton._FINALS))
+        self.assertEqual(automaton.get_states(), rebuilt.get_states())
+        self.assertEqual(automaton.get_alphabets(), rebuilt.get_alphabets())
+        self.assertEqual({state: sources for state, sources in automaton._predecessors.items() if sources},
+                         {state: sources for state, sources in rebuilt._predecessors.items() if sources})
+        self.assertEqual(automaton.dead_states(), rebuilt.dead_states())
+        self.assertEqual(automaton.sink_states(), rebuilt.sink_states())
+        if isinstance(automaton, E_NFA):
+            self.assertEqual(automaton._epsilon_closures, rebuilt._epsilon_closures)
+        if isinstance(automaton, DFA):
+            self.assertEqual(automaton.shrinked(), rebuilt.shrinked())
+            compiled = automaton._compiled
+        for case in self.cases:
+            try:
+                expected = rebuilt.accept(case)
+            except KeyError:
+                expected = None
+            if expected is not None:
+                self.assertEqual(automaton.accept(case), expected, case)
+            if isinstance(automaton, DFA):
+                self.assertEqual(compiled.accept(case), bool(expected), case)
+            else:
+                self.assertEqual(list(automaton.trans(case)), list(rebuilt.trans(case)), case)
+
+    def random_changes(self, automaton, rng, targets):
+        states = ["a", "b", "c", "d", "e"]
+        for _ in range(30):
+            kind = rng.randrange(5)
+            state = rng.choice(states)
+            if kind <= 1:
+                automaton.add_transition(state, rng.choice(targets), rng.choice(states))
+            elif kind == 2:
+                transitions = [(state, alphabet) for state, row in automaton._TRANSITIONS.items() for alphabet in row]
+                if transitions:
+                    automaton.remove_transition(*rng.choice(transitions))
+            elif kind == 3:
+                automaton.set_final(state, rng.random() < 0.5)
+            else:
+                automaton.add_state(state)
+            self.assertSameAsRebuild(automaton)
+
+    def test_dfa(self):
+        args = AutomatonArgs({"a": {"0": "a", "1": "b"}, "b": {"0": "b", "1": "a"}}, "a", {"a"})
+        for seed in range(10):
+            dfa = DFA(args)
+            self.warm(dfa)
+            self.random_changes(dfa, random.Random(seed), ["0", "1", "2"])
+        # the args given by users don't change
+        self.assertEqual(args, AutomatonArgs({"a": {"0": "a", "1": "b"}, "b": {"0": "b", "1": "a"}}, "a", {"a"}))
+
+    def test_compiled_not_shared(self):
+        from automata.general import MultiDFA
+        args = AutomatonArgs({"a": {"0": "a", "1": "b"}, "b": {"0": "b", "1": "a"}}, "a", {"a"})
+        dfa = DFA(args)
+        compiled = dfa._compiled
+        multi = MultiDFA([dfa])
+        matcher = dfa.matcher()
+        self.assertEqual(multi.match("11"), {0})
+        matcher.feed("1")
+        dfa.add_transition("b", "1", "b")
+        self.assertFalse(dfa.accept("11"))
+        self.assertFalse(dfa._compiled.accept("11"))
+        self.assertIsNot(dfa._compiled, compiled)
+        self.assertEqual(MultiDFA([dfa]).match("11"), set())
+        dfa.set_final("b")
+        self.assertTrue(dfa._compiled.accept("1"))
+        # the tables given out before the edits are not changed, and agree with their own transitions
+        self.assertEqual(multi.match("11"), {0})
+        matcher.feed("1")
+        self.assertTrue(matcher.is_accepting())
+        self.assertFalse(compiled.accept("1"))
+        self.assertEqual(compiled.shrinked(), DFA(args).shrinked())
+        self.assertEqual(compiled.dead_states(), DFA(args).dead_states())
+        with self.assertRaises(Exception):
+            dfa.compile().add_transition("a", "0", "b")
+
+    def test_nfa(self):
+        args = AutomatonArgs({"a": {"0": {"a"}, "1": {"a", "b"}}, "b": {"0": {"c"}}}, "a", {"c"})
+        for seed in range(10):
+            nfa = NFA(args)
+            self.warm(nfa)
+            self.random_changes(nfa, random.Random(seed), ["0", "1", "2"])
+        nfa = NFA(args)
+        nfa.accept("10")
+        nfa.remove_transition("a", "1", "b")
+        self.assertFalse(nfa.accept("10"))
+        self.assertEqual(nfa._TRANSITIONS["a"]["1"], {"a"})
+        with self.assertRaises(KeyError):
+            nfa.remove_transition("a", "1", "b")
+
+    def test_e_nfa(self):
+        args = AutomatonArgs({"a": {"0": {"a"}, epsilon: {"b"}}, "b": {"1": {"c"}}, "c": {epsilon: {"a"}}}, "a", {"c"})
+        for seed in range(10):
+            e_nfa = E_NFA(args)
+            self.warm(e_nfa)
+            self.random_changes(e_nfa, random.Random(seed), ["0", "1", "2", epsilon])
+
+    def test_removed_target(self):
+        # a target which leaves the automaton must not stay in the tables
+        e_nfa = E_NFA({0: {"a": {0}}}, 0, {0})
+        e_nfa.accept("a")
+        e_nfa.add_transition(0, "a", 4)
+        e_nfa.remove_transition(0, "a", 4)
+        self.assertSameAsRebuild(e_nfa)
+        self.assertEqual(e_nfa.accept_many(["a"]), bytearray([1]))
+        self.assertEqual(e_nfa.makeDFAargs()[0], E_NFA({0: {"a": {0}}}, 0, {0}).makeDFAargs()[0])
+
+    def test_core(self):
+        dfa = DFA(DFA({"a": {"0": "a", "1": "b"}, "b": {"0": "b", "1": "a"}}, "a", {"a"}).core())
+        self.warm(dfa)
+        dfa.set_final("b")
+        dfa.add_transition("b", "2", "c")
+        dfa.set_final("a", False)
+        self.assertSameAsRebuild(dfa)
+        self.assertEqual(dfa.get_states(), {"a", "b"})
+        self.assertTrue(dfa.accept("1"))
+        self.random_changes(dfa, random.Random(0), ["0", "1", "2"])
+
+    def test_edit(self):
+        dfa = DFA({"a": {"0": "a", "1": "b"}, "b": {"0": "b", "1": "a"}}, "a", {"a"})
+        self.warm(dfa)
+        with dfa.edit():
+            dfa.add_state("c")
+            dfa.add_transition("a", "2", "c")
+            dfa.add_transition("c", "2", "a")
+            # nothing is updated in the block
+            self.assertEqual(dfa.get_states(), {"a", "b"})
+        self.assertSameAsRebuild(dfa)
+        self.assertTrue(dfa.accept("22"))
+        with dfa.edit():
+            for i in range(300):
+                dfa.add_transition(i, "0", i + 1)
+        self.assertSameAsRebuild(dfa)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -100,4 +100,186 @@ class TestNFA(unittest.TestCase):
         actual_result_mod2or3 = self.nfa_mod2or3.trans(testcase)
 
         for i in zip(expected_result_mod2or3, actual_result_mod2or3):
-            self.assertEqual(i[0], i[1])
\ No newline at end of file
+            self.assertEqual(i[0], i[1])
+
+    def test_makeDFAargs(self):
+        from automata import DFA
+        from automata.general import StateExplosionError
+        args, subsets = self.nfa_1_in_last5chars.makeDFAargs()
+        dfa = DFA(args)
+        # the subsets of {q1, ..., q5} which can follow q0 are all reachable, and nothing else
+        self.assertEqual(len(args.transitions), 1 << 5)
+        self.assertEqual(subsets[args.start], frozenset({"q0"}))
+        self.assertTrue(all("q0" in subset for subset in subsets.values()))
+        self.assertEqual(args.finals, {state for state, subset in subsets.items() if subset & {"q1", "q2", "q3", "q4", "q5"}})
+        targets = [""]
+        for _ in range(8):
+            targets = [target + alphabet for target in targets for alphabet in "01"]
+            for target in targets:
+                self.assertEqual(dfa.accept(target), "1" in target[-5:])
+
+        args, subsets = self.nfa_mod2or3.makeDFAargs()
+        dfa = DFA(args)
+        for target in targets:
+            expected = int(target, 2) % 2 == 0 or int(target, 2) % 3 == 0
+            self.assertEqual(dfa.accept(target), expected)
+            self.assertEqual(dfa.accept("0b" + target), expected)
+        for target in ["0b", "b0", "0b0b0", "1b0"]:
+            self.assertFalse(dfa.accept(target))
+
+        with self.assertRaises(StateExplosionError):
+            self.nfa_1_in_last5chars.makeDFAargs(max_states=10)
+
+    def test_bitset(self):
+        bitset_1_in_last5chars = self.nfa_1_in_last5chars.bitset()
+        bitset_mod2or3 = self.nfa_mod2or3.bitset()
+        self.assertEqual(list(bitset_1_in_last5chars.trans("101001")),
+                         ["q0", {"q0", "q1"}, {"q0", "q2"}, {"q0", "q1", "q3"}, {"q0", "q2", "q4"}, {"q0", "q3", "q5"}, {"q0", "q1", "q4"}])
+        self.assertEqual(list(bitset_mod2or3.trans("0b01001"))[1:],
+                         [{"0", "binary%2=0", "binary%3=0"}, {"b"}, {"binary%2=0", "binary%3=0"}, {"binary%2=1", "binary%3=1"},
+                          {"binary%2=0", "binary%3=2"}, {"binary%2=0", "binary%3=1"}, {"binary%2=1", "binary%3=0"}])
+        self.assertFalse(bitset_1_in_last5chars.accept(""))
+        self.assertFalse(bitset_mod2or3.accept(""))
+        targets = [""]
+        for _ in range(8):
+            targets = [target + alphabet for target in targets for alphabet in "01"]
+            for target in targets:
+                self.assertEqual(bitset_1_in_last5chars.accept(target), "1" in target[-5:])
+                expected = int(target, 2) % 2 == 0 or int(target, 2) % 3 == 0
+                self.assertEqual(bitset_mod2or3.accept(target), expected)
+                self.assertEqual(bitset_mod2or3.accept("0b" + target), expected)
+        self.assertFalse(bitset_mod2or3.accept("b0110001"))
+        self.assertFalse(bitset_mod2or3.accept("2"))
+
+    def test_accept_many(self):
+        targets = [""]
+        for _ in range(7):
+            targets = [target + alphabet for target in targets for alphabet in "01"]
+        expected = bytearray("1" in target[-5:] for target in targets)
+        self.assertEqual(self.nfa_1_in_last5chars.accept_many(targets), expected)
+        self.assertEqual(self.nfa_1_in_last5chars.accept_many(iter(targets), workers=2, chunksize=10), expected)
+        shuffled = targets[::-3] + targets[1::3] + targets[2::3]
+        expected = bytearray("1" in target[-5:] for target in shuffled)
+        self.assertEqual(self.nfa_1_in_last5chars.accept_many(shuffled, share_prefixes=True), expected)
+        self.assertEqual(self.nfa_1_in_last5chars.accept_many(shuffled, workers=2, chunksize=10, share_prefixes=True), expected)
+
+    def test_step_cache(self):
+        nfa = NFA(self.nfa_1_in_last5chars._TRANSITIONS, "q0", {"q1", "q2", "q3", "q4", "q5"}, step_cache_size=8)
+        # the same string can be judged again
+        for _ in range(3):
+            self.assertTrue(nfa.accept("100"))
+            self.assertFalse(nfa.accept("1000000"))
+            self.assertEqual(list(nfa.trans("10")), ["q0", {"q0", "q1"}, {"q0", "q2"}])
+        info = nfa.step_cache.info()
+        self.assertEqual(info.maxsize, 8)
+        self.assertLessEqual(info.currsize, 8)
+        self.assertGreater(info.hits, 0)
+        self.assertGreater(info.misses, 0)
+
+        nfa.step_cache.clear()
+        nfa.accept("11")
+        nfa.accept("11")
+        self.assertEqual(nfa.step_cache.info(), (2, 2, 8, 2))
+        nfa.step_cache.resize(1)
+        self.assertEqual(len(nfa.step_cache), 1)
+
+        unbounded = NFA(AutomatonArgs({"p": {"a": {"p", "q"}}, "q": {"b": {"p"}}}, "p", {"q"}), step_cache_size=None)
+        self.assertTrue(unbounded.accept("aba"))
+        unbounded._TRANSITIONS = AutomatonArgs({"p": {"a": {"p", "q"}}, "q": {"b": {"q"}}}, "p", {"q"}).transitions
+        unbounded._invalidate()
+        self.assertEqual(len(unbounded.step_cache), 0)
+        self.assertFalse(unbounded.accept("aba"))
+
+    def test_dead_and_sink_states(self):
+        # accepts strings starting with "1" and having another "1", and strings starting with "0" are never accepted
+        nfa = NFA({"s": {"0": {"never"}, "1": {"p"}}, "p": {"0": {"p"}, "1": {"p", "q"}}, "q": {"0": {"q"}, "1": {"q"}},
+                   "never": {"0": {"never"}, "1": {"never"}}}, "s", {"q"})
+        self.assertEqual(nfa.dead_states(), {"never"})
+        self.assertEqual(nfa.sink_states(), {"q"})
+        # trans yields every active state, dead states are dropped only in accept
+        self.assertEqual(list(nfa.trans("01")), ["s", {"never"}, {"never"}])
+        self.assertEqual(list(nfa.bitset().trans("01"))[1:], list(nfa.trans("01"))[1:])
+        looping = NFA({"p": {"a": {"p", "x"}}, "x": {"a": {"x"}}}, "p", {"p"})
+        self.assertEqual(list(looping.trans("aa")), list(looping.bitset().trans("aa")))
+        self.assertEqual(list(looping.trans("aa"))[-1], {"p", "x"})
+        self.assertTrue(looping.accept("aa"))
+        from automata import E_NFA
+        looping = E_NFA({"p": {"": {"x"}, "a": {"p"}}, "x": {"a": {"x"}}}, "p", {"p"})
+        self.assertEqual(list(looping.trans("aa")), [{"p", "x"}] * 3)
+        self.assertEqual(list(looping.trans("aa")), list(looping.bitset().trans("aa")))
+        rest = iter("0111")
+        self.assertFalse(nfa.accept(rest))
+        self.assertEqual("".join(rest), "111")
+        rest = iter("1011" + "0" * 100)
+        self.assertTrue(nfa.accept(rest))
+        self.assertFalse(nfa.accept("1011002"))
+        self.assertFalse(nfa.accept("1000"))
+        self.assertEqual(self.nfa_1_in_last5chars.dead_states(), set())
+        self.assertEqual(self.nfa_1_in_last5chars.sink_states(), set())
+
+    def test_tracing(self):
+        nfa = NFA(self.nfa_1_in_last5chars._TRANSITIONS, "q0", {"q1", "q2", "q3", "q4", "q5"})
+        with nfa.tracing() as tracer:
+            self.assertTrue(nfa.accept("10"))
+        self.assertEqual(tracer.active_sizes, {1: 1, 2: 2})
+        self.assertEqual(tracer.state_visits, {"q0": 3, "q1": 1, "q2": 1})
+        self.assertEqual(tracer.transition_hits, {("q0", "1"): 1, ("q0", "0"): 1, ("q1", "0"): 1})
+        bitset = nfa.bitset()
+        with bitset.tracing(tracer):
+            self.assertEqual(list(bitset.trans("1")), list(nfa.trans("1")))
+        self.assertEqual(tracer.active_sizes, {1: 2, 2: 3})
+
+    def test_finditer(self):
+        self.assertEqual(list(self.nfa_1_in_last5chars.finditer("0010000001b")), [(0, 10)])
+        self.assertEqual(list(self.nfa_1_in_last5chars.finditer("00100000000b")), [(0, 7)])
+        self.assertEqual(self.nfa_1_in_last5chars.search("000"), None)
+        self.assertEqual(list(self.nfa_1_in_last5chars.finditer("1", all_ends=True)), [(0, 1)])
+
+    def test_finditer_without_dfa(self):
+        # the DFA of last_k_nfa(40) has 2 ** 40 states, the search steps only the visited sets
+        from automata import bench
+        nfa = NFA(bench.last_k_nfa(40))
+        text = "0" * 50 + "1" + "0" * 100
+        self.assertEqual(nfa.search(text), (0, 90))
+        self.assertEqual(list(nfa.finditer(text, all_ends=True)), [(0, end) for end in range(51, 91)])
+        self.assertEqual(nfa.search("0" * 100), None)
+
+    def test_bitset_like_nfa(self):
+        from automata import E_NFA
+        nfa = NFA({"p": {"a": {"p", "q"}, "b": {"p"}}, "q": {"a": {"q"}, "b": {"q"}}, "d": {"a": {"d"}}}, "p", {"q"})
+        enfa = E_NFA({"p": {"": {"q"}, "a": {"p"}}, "q": {"b": {"q"}}, "r": {"a": {"r"}}}, "p", {"q"})
+        for automaton in [nfa, enfa, self.nfa_1_in_last5chars]:
+            bitset = automaton.bitset()
+            self.assertEqual(bitset.dead_states(), automaton.dead_states())
+            self.assertEqual(bitset.sink_states(), automaton.sink_states())
+            for text in ["", "bbab", "abba", "aab0"]:
+                self.assertEqual(bitset.search(text), automaton.search(text))
+                self.assertEqual(list(bitset.finditer(text, all_ends=True)), list(automaton.finditer(text, all_ends=True)))
+        self.assertEqual(nfa.bitset().sink_states(), {"q"})
+        bitset = nfa.bitset()
+        with self.assertRaisesRegex(Exception, "can't be changed"):
+            bitset.add_transition("p", "b", "q")
+        with self.assertRaisesRegex(Exception, "can't be changed"):
+            bitset.remove_transition("p", "a", "q")
+        with self.assertRaisesRegex(Exception, "can't be changed"):
+            bitset.set_final("p")
+        self.assertEqual(bitset.accept("b"), False)
+
+    def test_finditer_like_dfa(self):
+        from automata import DFA, E_NFA, bench
+        from automata.general.search import Searcher
+        enfa = E_NFA({"p": {"": {"q"}, "0": {"p"}}, "q": {"1": {"r"}}, "r": {"": {"p"}, "0": {"r"}}}, "p", {"r"})
+        for automaton in [self.nfa_1_in_last5chars, NFA(bench.last_k_nfa(3)), enfa]:
+            searcher = Searcher(DFA(automaton.makeDFAargs()[0]).compile())
+            for seed in range(5):
+                text = bench.random_text(60, "01b", seed)
+                self.assertEqual(list(automaton.finditer(text)), list(searcher.finditer(text)))
+                self.assertEqual(list(automaton.finditer(text, all_ends=True)), list(searcher.finditer(text, all_ends=True)))
+
+    def test_symbol_classes(self):
+        self.assertEqual(set(self.nfa_1_in_last5chars.bitset().classes), {("0",), ("1",)})
+        nfa = NFA({"p": {"a": {"p", "q"}, "b": {"p", "q"}, "c": {"p"}}, "q": {"a": {"q"}, "b": {"q"}}}, "p", {"q"})
+        bitset = nfa.bitset()
+        self.assertEqual(sorted(map(sorted, bitset.classes)), [["a", "b"], ["c"]])
+        for target in ["", "a", "ab", "abc", "cb", "ccc"]:
+            self.assertEqual(bitset.accept(target), target[-1:] in ("a", "b"))
@@ -0,0 +1,38 @@
+import sys
+sys.path.append("../automata")
+
+import subprocess
+import unittest
+import automata
+from automata import general
+
+
+class TestPackage(unittest.TestCase):
+    def test_lazy_import(self):
+        # import automata loads no module of automata.general until a name of it is used
+        script = ("import sys, automata\n"
+                  "print(sorted(name for name in sys.modules if name.startswith('automata.')))\n"
+                  "automata.DFA\n"
+                  "print('automata.general.main' in sys.modules, 'automata.general.stream' in sys.modules)")
+        output = subprocess.run([sys.executable, "-c", script], check=True, capture_output=True, text=True).stdout.split("\n")
+        self.assertEqual(output[0], "['automata._helper', 'automata._helper.lazy']")
+        self.assertEqual(output[1], "True False")
+
+    def test_names(self):
+        self.assertIs(automata.DFA, general.main.DFA)
+        self.assertIs(automata.Tracer, general.trace.Tracer)
+        self.assertIs(general.Core, general.core.Core)
+        self.assertIs(automata.regex.to_e_nfa, automata.regex.main.to_e_nfa)
+        self.assertIn("DFA", dir(automata))
+        self.assertIn("equivalent", dir(general))
+        with self.assertRaises(AttributeError):
+            automata.nothing
+        with self.assertRaises(ImportError):
+            from automata.general import nothing
+        namespace = dict()
+        exec("from automata.general import *", namespace)
+        self.assertIs(namespace["MultiDFA"], general.multi.MultiDFA)
+
+
+if __name__ == "__main__":
+    unittest.main()
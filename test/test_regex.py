@@ -0,0 +1,66 @@
+import sys
+sys.path.append("../automata")
+
+import itertools
+import re
+import unittest
+from automata import regex, DFA, E_NFA
+
+
+class TestRegex(unittest.TestCase):
+    patterns = ["", "a", "ab", "a|b", "a*", "(ab)*", "a+b?", "(a|b)*abb", "[a-c]+", "(a|)b", "()", "a(b|c)*d?",
+                "\\*a", "[]a]", "[a-]+", "((a|b)c)+|d*"]
+
+    def targets(self, alphabets: str, length: int):
+        for i in range(length + 1):
+            yield from map("".join, itertools.product(alphabets, repeat=i))
+
+    def test_compile(self):
+        for pattern in self.patterns:
+            dfa = regex.compile(pattern)
+            self.assertIsInstance(dfa, DFA)
+            for target in self.targets("abcd*]-", 4):
+                self.assertEqual(dfa.accept(target), re.fullmatch(pattern, target) is not None, (pattern, target))
+
+    def test_alphabets(self):
+        for pattern in [".*a.", "[^a]b", "[^ab]*"]:
+            dfa = regex.compile(pattern, alphabets="abc")
+            for target in self.targets("abc", 4):
+                self.assertEqual(dfa.accept(target), re.fullmatch(pattern, target) is not None, (pattern, target))
+        with self.assertRaises(regex.RegexError):
+            regex.compile(".")
+
+    def test_to_e_nfa(self):
+        e_nfa = regex.to_e_nfa("(a|b)*abb")
+        self.assertIsInstance(e_nfa, E_NFA)
+        for target in self.targets("ab", 6):
+            self.assertEqual(e_nfa.accept(target), target.endswith("abb"))
+
+    def test_minimal(self):
+        self.assertEqual(len(regex.compile("(a|b)*abb").get_states()), 4)
+        self.assertEqual(len(regex.compile("(a*|b*)*").get_states()), 1)
+
+    def test_finditer_linear(self):
+        # every "a" is a match of "a", and "a*b" keeps each run alive to the end of the text
+        class Counted(str):
+            reads = 0
+
+            def __getitem__(self, index):
+                Counted.reads += 1
+                return str.__getitem__(self, index)
+        for automaton in [regex.to_e_nfa("a|a*b"), regex.compile("a|a*b")]:
+            for n in [1000, 4000]:
+                Counted.reads = 0
+                self.assertEqual(list(automaton.finditer(Counted("a" * n))), [(i, i + 1) for i in range(n)])
+                self.assertLess(Counted.reads, 5 * n)
+
+    def test_errors(self):
+        for pattern in ["(a", "a)", "*a", "a|+", "[ab", "[b-a]", "a\\"]:
+            with self.assertRaises(regex.RegexError):
+                regex.compile(pattern)
+
+    def test_cache(self):
+        regex.purge()
+        self.assertIs(regex.compile("(ab|c)*"), regex.compile("(ab|c)*"))
+        self.assertIs(regex.compile(".b", "ab"), regex.compile(".b", ["b", "a"]))
+        self.assertIsNot(regex.compile(".b", "ab"), regex.compile(".b", "abc"))